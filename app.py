@@ -4,7 +4,7 @@ from core.db import Session, init_db
 
 
 def main():
-    # Run DB initialization on startup
+    # Create or migrate the DB (checked once per process)
     init_db()
 
     st.set_page_config(
@@ -13,17 +13,14 @@ def main():
         layout="wide",
     )
 
-    # DB Connection wrapper
-    session_obj = Session()
-    conn = session_obj.conn
-
     st.title("Home Finance MVP")
     st.caption("SQLite 기반 가정용 자산/기장 관리 MVP (Pure SQL Core)")
 
     # Sidebar: Display Currency Settings
     from core.services.settings_service import get_base_currency
 
-    base_cur = get_base_currency(conn)
+    with Session() as conn:
+        base_cur = get_base_currency(conn)
 
     st.sidebar.header("표시 통화 설정")
     display_currency = st.sidebar.selectbox(
@@ -52,7 +49,9 @@ def main():
         """
     )
 
-    st.info("첫 실행 시 data/app.db 가 자동 생성되고 core/schema.sql 이 적용된다.")
+    st.info(
+        "첫 실행 시 data/app.db 가 자동 생성되고 core/schema.sql 과 migrations/*.sql 이 적용된다."
+    )
 
 
 if __name__ == "__main__":
@@ -1,37 +1,166 @@
+import re
 import sqlite3
+import threading
+import weakref
 from pathlib import Path
 
+from core.money import sync_currency_units
+
 # DB Path Configuration
 BASE_DIR = Path(__file__).parent.parent
 DB_PATH = BASE_DIR / "data" / "app.db"
 SCHEMA_PATH = BASE_DIR / "core" / "schema.sql"
+MIGRATIONS_DIR = BASE_DIR / "migrations"
 
+# PRAGMAs applied once to every connection the app opens.
+# cache_size is negative (KiB), mmap_size in bytes.
+DEFAULT_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -20000,
+    "mmap_size": 268435456,
+    "temp_store": "MEMORY",
+    "foreign_keys": "ON",
+}
 
-def get_connection():
-    """Return a raw sqlite3 connection with dict factory."""
-    conn = sqlite3.connect(DB_PATH)
+
+def _apply_pragmas(conn: sqlite3.Connection, pragmas: dict) -> None:
+    for name, value in pragmas.items():
+        conn.execute(f"PRAGMA {name} = {value}")
+
+
+def _open_connection(
+    db_path: Path | str, pragmas: dict, check_same_thread: bool = True
+) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path, check_same_thread=check_same_thread)
     conn.row_factory = sqlite3.Row
-    # Enable foreign keys
-    conn.execute("PRAGMA foreign_keys = ON")
+    _apply_pragmas(conn, pragmas)
     return conn
 
 
+class ConnectionManager:
+    """Hands out one tuned connection per thread and reuses it.
+
+    The PRAGMA profile is applied when a thread's connection is first opened.
+    Nested ``Session`` blocks on the same thread share the connection; only the
+    outermost block commits or rolls back. Streamlit runs every rerun on a new
+    thread, so whenever a connection is opened those of finished threads are
+    closed; the pool never holds more connections than live threads.
+    """
+
+    def __init__(self, db_path: Path | str = DB_PATH, pragmas: dict | None = None):
+        self.db_path = db_path
+        self.pragmas = dict(DEFAULT_PRAGMAS if pragmas is None else pragmas)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # thread ident -> (weak reference to the owning thread, connection)
+        self._connections: dict[
+            int, tuple[weakref.ref[threading.Thread], sqlite3.Connection]
+        ] = {}
+        self.opened = 0
+        self.reused = 0
+
+    def _close_finished(self) -> None:
+        """Close connections whose thread has ended. Caller holds the lock."""
+        for ident, (thread_ref, conn) in list(self._connections.items()):
+            thread = thread_ref()
+            if thread is None or not thread.is_alive():
+                conn.close()
+                del self._connections[ident]
+
+    def acquire(self) -> sqlite3.Connection:
+        thread = threading.current_thread()
+        with self._lock:
+            pooled = self._connections.get(thread.ident)
+            if pooled is not None and pooled[0]() is thread:
+                self.reused += 1
+                return pooled[1]
+            self._close_finished()
+            # Opened without the same-thread check so a later acquire on
+            # another thread can close it once this thread is gone.
+            conn = _open_connection(self.db_path, self.pragmas, check_same_thread=False)
+            self._connections[thread.ident] = (weakref.ref(thread), conn)
+            self._local.depth = 0
+            self.opened += 1
+        return conn
+
+    def enter(self) -> int:
+        self._local.depth = getattr(self._local, "depth", 0) + 1
+        return self._local.depth
+
+    def exit(self) -> int:
+        self._local.depth -= 1
+        return self._local.depth
+
+    def close_all(self) -> None:
+        with self._lock:
+            for _, conn in self._connections.values():
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            self._close_finished()
+            open_connections = len(self._connections)
+        return {
+            "opened": self.opened,
+            "reused": self.reused,
+            "open_connections": open_connections,
+        }
+
+
+_manager = ConnectionManager()
+
+
+def configure_connections(
+    db_path: Path | str | None = None, pragmas: dict | None = None
+) -> None:
+    """Point the shared connection manager at a database and/or PRAGMA profile.
+
+    Existing pooled connections are closed so the new settings take effect.
+    """
+    global _manager
+    _manager.close_all()
+    _manager = ConnectionManager(
+        db_path=db_path if db_path is not None else _manager.db_path,
+        pragmas=pragmas if pragmas is not None else _manager.pragmas,
+    )
+
+
+def connection_stats() -> dict[str, int]:
+    """Return how many pooled connections were opened vs. reused."""
+    return _manager.stats()
+
+
+def get_connection():
+    """Return a new (unpooled) sqlite3 connection with dict factory."""
+    return _open_connection(_manager.db_path, _manager.pragmas)
+
+
 class Session:
     """A minimal wrapper to maintain 'with Session(engine) as session' usage,
-    but adapting it to raw connection for less refactoring in business logic."""
+    but adapting it to raw connection for less refactoring in business logic.
+
+    The connection is reused per thread and acquired on entering the block;
+    the outermost block commits on success and rolls back on error."""
 
     def __init__(self, engine=None):
-        self.conn = get_connection()
+        self._manager = _manager
+        self.conn: sqlite3.Connection | None = None
 
     def __enter__(self):
+        self.conn = self._manager.acquire()
+        self._manager.enter()
         return self.conn
 
     def __exit__(self, exc_type, exc_val, exc_tb):
+        if self._manager.exit() > 0:
+            return
         if exc_type is None:
             self.conn.commit()
         else:
             self.conn.rollback()
-        self.conn.close()
 
     @staticmethod
     def exec(conn, statement):
@@ -43,12 +172,97 @@ class Session:
 engine = None
 
 
-def init_db():
-    """Initialize the database using the schema.sql file."""
-    if not DB_PATH.parent.exists():
-        DB_PATH.parent.mkdir(parents=True)
+def _split_statements(sql: str) -> list[str]:
+    statements = []
+    buffer = ""
+    for line in sql.splitlines(keepends=True):
+        buffer += line
+        if sqlite3.complete_statement(buffer):
+            statements.append(buffer.strip())
+            buffer = ""
+    # Whatever is left over is trailing comments or whitespace.
+    return statements
+
+
+_ADD_COLUMN_RE = re.compile(
+    r"^\s*ALTER\s+TABLE\s+(\w+)\s+ADD\s+COLUMN\s+(\w+)", re.IGNORECASE
+)
+
+
+def _column_exists(conn: sqlite3.Connection, table: str, column: str) -> bool:
+    rows = conn.execute(f"PRAGMA table_info({table})").fetchall()
+    return any(row[1] == column for row in rows)
+
+
+def _apply_sql(conn: sqlite3.Connection, sql: str, version: int) -> None:
+    """Run a script atomically and stamp ``user_version`` with it."""
+    conn.execute("SAVEPOINT migration")
+    try:
+        for statement in _split_statements(sql):
+            # Pre-versioning databases may already carry columns that a
+            # migration adds; treat those ADD COLUMN steps as applied.
+            match = _ADD_COLUMN_RE.match(statement)
+            if match and _column_exists(conn, match.group(1), match.group(2)):
+                continue
+            conn.execute(statement)
+        conn.execute(f"PRAGMA user_version = {int(version)}")
+    except Exception:
+        conn.execute("ROLLBACK TO migration")
+        conn.execute("RELEASE migration")
+        raise
+    conn.execute("RELEASE migration")
+
+
+def list_migrations() -> list[tuple[int, Path]]:
+    """Return ``(version, path)`` for every numbered file in migrations/."""
+    migrations = []
+    for path in MIGRATIONS_DIR.glob("*.sql"):
+        match = re.match(r"^(\d+)_", path.name)
+        if match:
+            migrations.append((int(match.group(1)), path))
+    return sorted(migrations)
+
+
+def apply_migrations(conn: sqlite3.Connection) -> int:
+    """Bring a database up to the latest schema version.
+
+    ``schema.sql`` is the version-0 baseline and is only applied when
+    ``PRAGMA user_version`` is 0 (a fresh or pre-versioning database). Numbered
+    files in ``migrations/`` above the current version are then applied in
+    order, and ``currency_units`` is brought in line with ``CURRENCY_CONFIG``.
+    Returns the resulting version.
+    """
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version == 0:
+        _apply_sql(conn, SCHEMA_PATH.read_text(encoding="utf-8"), 0)
+
+    for number, path in list_migrations():
+        if number > version:
+            _apply_sql(conn, path.read_text(encoding="utf-8"), number)
+            version = number
+    sync_currency_units(conn)
+    return version
+
+
+# Databases whose schema was already verified by this process.
+_verified_databases: set[str] = set()
+
+
+def init_db(db_path: Path | str | None = None) -> None:
+    """Create or migrate the database and fill the calendar, once per process."""
+    path = Path(db_path if db_path is not None else _manager.db_path)
+    key = str(path.resolve())
+    if key in _verified_databases:
+        return
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    from core.services.calendar_service import populate_calendar
 
-    with get_connection() as conn:
-        with open(SCHEMA_PATH, encoding="utf-8") as f:
-            schema_sql = f.read()
-        conn.executescript(schema_sql)
+    conn = _open_connection(path, _manager.pragmas)
+    try:
+        apply_migrations(conn)
+        populate_calendar(conn)
+        conn.commit()
+    finally:
+        conn.close()
+    _verified_databases.add(key)
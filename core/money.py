@@ -0,0 +1,112 @@
+"""Currency settings and conversion between amounts and integer minor units.
+
+Minor units follow ``CURRENCY_CONFIG`` precision (KRW/JPY 0 decimals,
+USD/EUR 2); unknown currencies use the default currency's precision.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from decimal import ROUND_HALF_UP, Decimal
+
+CURRENCY_CONFIG = {
+    "KRW": {"symbol": "₩", "format": "%d", "step": 1, "precision": 0},
+    "USD": {"symbol": "$", "format": "%.2f", "step": 0.01, "precision": 2},
+    "JPY": {"symbol": "¥", "format": "%d", "step": 1, "precision": 0},
+    "EUR": {"symbol": "€", "format": "%.2f", "step": 0.01, "precision": 2},
+}
+
+DEFAULT_CURRENCY = "KRW"
+
+
+def get_currency_config(currency: str | None) -> dict:
+    """Get formatting config for a given currency code."""
+    currency = currency.upper() if currency else DEFAULT_CURRENCY
+    return CURRENCY_CONFIG.get(currency, CURRENCY_CONFIG[DEFAULT_CURRENCY])
+
+
+def minor_factor(currency: str | None) -> int:
+    """Number of minor units in one unit of ``currency`` (1 or 100)."""
+    return 10 ** int(get_currency_config(currency)["precision"])
+
+
+def minor_factor_sql(currency_expr: str) -> str:
+    """SQL CASE giving ``minor_factor`` of the currency in ``currency_expr``."""
+    whens = " ".join(
+        f"WHEN '{code}' THEN {minor_factor(code)}" for code in CURRENCY_CONFIG
+    )
+    return f"(CASE {currency_expr} {whens} ELSE {minor_factor(None)} END)"
+
+
+def to_scaled(amount: float | int | Decimal, precision: int) -> int:
+    """Round ``amount`` half-up to an integer count of 10**-precision units."""
+    scaled = Decimal(str(amount)).scaleb(precision)
+    return int(scaled.to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def to_minor(amount: float | int | Decimal, currency: str | None) -> int:
+    """Round ``amount`` half-up to whole minor units of ``currency``."""
+    return to_scaled(amount, int(get_currency_config(currency)["precision"]))
+
+
+def from_minor(value: int | None, currency: str | None) -> float:
+    """Convert integer minor units back to a float amount."""
+    if not value:
+        return 0.0
+    factor = minor_factor(currency)
+    return float(value) if factor == 1 else value / factor
+
+
+# Minor-unit factor of a currency code read from currency_units, falling back
+# to the default currency's factor for codes that are not configured.
+_BASE_CURRENCY_SQL = "(SELECT base_currency FROM app_settings ORDER BY id DESC LIMIT 1)"
+_UNIT_FACTOR_SQL = """
+    COALESCE(
+        (SELECT minor_factor FROM currency_units WHERE currency = {currency}),
+        (SELECT minor_factor FROM currency_units WHERE is_default = 1)
+    )
+"""
+
+
+def sync_currency_units(conn: sqlite3.Connection) -> bool:
+    """Mirror ``minor_factor`` of every configured currency into currency_units.
+
+    The minor-unit update trigger reads its factors from that table. When a
+    factor was added or changed, every line's minor-unit columns are
+    recomputed. Returns whether anything changed.
+    """
+    wanted = {
+        code: (minor_factor(code), int(code == DEFAULT_CURRENCY))
+        for code in CURRENCY_CONFIG
+    }
+    stored = {
+        r[0]: (r[1], r[2])
+        for r in conn.execute(
+            "SELECT currency, minor_factor, is_default FROM currency_units"
+        ).fetchall()
+    }
+    if stored == wanted:
+        return False
+
+    conn.execute("DELETE FROM currency_units")
+    conn.executemany(
+        "INSERT INTO currency_units (currency, minor_factor, is_default)"
+        " VALUES (?, ?, ?)",
+        [(code, factor, is_default) for code, (factor, is_default) in wanted.items()],
+    )
+    base_factor = _UNIT_FACTOR_SQL.format(currency=_BASE_CURRENCY_SQL)
+    native_factor = _UNIT_FACTOR_SQL.format(
+        currency=f"COALESCE(native_currency, {_BASE_CURRENCY_SQL})"
+    )
+    conn.execute(
+        f"""
+        UPDATE journal_lines SET
+            debit_minor = CAST(ROUND(debit * {base_factor}) AS INTEGER),
+            credit_minor = CAST(ROUND(credit * {base_factor}) AS INTEGER),
+            native_minor = CASE
+                WHEN native_amount IS NULL THEN NULL
+                ELSE CAST(ROUND(native_amount * {native_factor}) AS INTEGER)
+            END
+        """
+    )
+    return True
@@ -75,18 +75,6 @@ HOUSEHOLD_GROUP_PARENTS = {
 }
 
 
-def _resolve_l1_account_name(
-    account: dict, account_lookup: dict[int, dict]
-) -> str | None:
-    current = account
-    while current.get("parent_id"):
-        parent = account_lookup.get(int(current["parent_id"]))
-        if parent is None:
-            break
-        current = parent
-    return current["name"] if current else None
-
-
 def _household_group_for(account_type: str, l1_name: str | None) -> str:
     if l1_name and l1_name in HOUSEHOLD_L1_GROUP_MAP:
         return HOUSEHOLD_L1_GROUP_MAP[l1_name]
@@ -104,29 +92,35 @@ def list_household_accounts(
     active_only: bool = True,
     include_system: bool = False,
 ) -> list[dict]:
-    # Fetch all accounts for lookup
-    all_accounts_rows = conn.execute("SELECT * FROM accounts").fetchall()
-    account_lookup = {row["id"]: dict(row) for row in all_accounts_rows}
-
-    query = "SELECT * FROM accounts WHERE allow_posting = 1"
+    # The L1 account is the deepest ancestor in the closure table.
+    query = """
+        SELECT a.*, l1.name AS l1_name
+        FROM accounts a
+        LEFT JOIN accounts l1 ON l1.id = (
+            SELECT c.ancestor_id
+            FROM account_closure c
+            WHERE c.descendant_id = a.id
+            ORDER BY c.depth DESC
+            LIMIT 1
+        )
+        WHERE a.allow_posting = 1
+    """
     params = []
     if active_only:
-        query += " AND is_active = 1"
+        query += " AND a.is_active = 1"
     if not include_system:
-        query += " AND is_system = 0"
+        query += " AND a.is_system = 0"
 
-    query += " ORDER BY type, name"
+    query += " ORDER BY a.type, a.name"
 
     rows = conn.execute(query, params).fetchall()
 
     results = []
     for row in rows:
         account = dict(row)
-        l1_name = _resolve_l1_account_name(account, account_lookup)
-        group_key = _household_group_for(account["type"], l1_name)
+        group_key = _household_group_for(account["type"], account["l1_name"])
 
         # Add derived fields
-        account["l1_name"] = l1_name
         account["household_group"] = group_key
         account["household_group_label"] = HOUSEHOLD_GROUP_LABELS[group_key]
         results.append(account)
@@ -183,12 +177,73 @@ def get_account(conn: sqlite3.Connection, account_id: int) -> dict | None:
     return dict(row) if row else None
 
 
+def list_account_subtree(
+    conn: sqlite3.Connection, account_id: int, include_self: bool = False
+) -> list[dict]:
+    """Return the descendants of an account in depth-first order.
+
+    Each row carries ``depth`` relative to ``account_id``. Members come from
+    one indexed closure lookup; ordering them is a single pass over a
+    parent -> children map.
+    """
+    rows = conn.execute(
+        """
+        SELECT a.*, c.depth
+        FROM account_closure c
+        JOIN accounts a ON a.id = c.descendant_id
+        WHERE c.ancestor_id = ?
+        ORDER BY a.name
+        """,
+        (account_id,),
+    ).fetchall()
+
+    children: dict[int | None, list[dict]] = {}
+    root = None
+    for row in rows:
+        account = dict(row)
+        if account["id"] == account_id:
+            root = account
+        else:
+            children.setdefault(account["parent_id"], []).append(account)
+    if root is None:
+        return []
+
+    results = []
+    stack = [root] if include_self else children.get(account_id, [])[::-1]
+    while stack:
+        account = stack.pop()
+        results.append(account)
+        stack.extend(children.get(account["id"], [])[::-1])
+    return results
+
+
+def rebuild_account_closure(conn: sqlite3.Connection) -> int:
+    """Recompute the account closure table from parent_id. Returns the row count."""
+    conn.execute("DELETE FROM account_closure")
+    cursor = conn.execute(
+        """
+        INSERT INTO account_closure (ancestor_id, descendant_id, depth)
+        WITH RECURSIVE tree (ancestor_id, descendant_id, depth) AS (
+            SELECT id, id, 0 FROM accounts
+            UNION ALL
+            SELECT p.id, t.descendant_id, t.depth + 1
+            FROM tree t
+            JOIN accounts a ON a.id = t.ancestor_id
+            JOIN accounts p ON p.id = a.parent_id
+        )
+        SELECT ancestor_id, descendant_id, depth FROM tree
+        """
+    )
+    return cursor.rowcount
+
+
 def create_root_account(
     conn: sqlite3.Connection,
     name: str,
     type_: str,
     is_active: bool = True,
     currency: str | None = None,
+    is_cash_equivalent: bool = False,
 ) -> int:
     """Create a Level 1 (root) account."""
     # Find next L1 ID (e.g., 1011 if max is 1010)
@@ -209,8 +264,8 @@ def create_root_account(
     new_id = max_id + 1
 
     conn.execute(
-        """INSERT INTO accounts (id, name, type, parent_id, is_active, is_system, level, allow_posting, currency)
-           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        """INSERT INTO accounts (id, name, type, parent_id, is_active, is_system, level, allow_posting, currency, is_cash_equivalent)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
         (
             new_id,
             name.strip(),
@@ -221,6 +276,7 @@ def create_root_account(
             1,
             1,
             currency.upper() if currency else "KRW",
+            1 if is_cash_equivalent and type_ == "ASSET" else 0,
         ),
     )
     return new_id
@@ -233,9 +289,17 @@ def create_user_account(
     parent_id: int | None = None,
     is_active: bool = True,
     currency: str | None = None,
+    is_cash_equivalent: bool | None = None,
 ) -> int:
+    """Create an account under ``parent_id`` (or a root account).
+
+    ``is_cash_equivalent`` defaults to the parent's flag, so a new bank
+    account under 보통예금 counts as cash without extra input.
+    """
     if parent_id is None:
-        return create_root_account(conn, name, type_, is_active, currency)
+        return create_root_account(
+            conn, name, type_, is_active, currency, bool(is_cash_equivalent)
+        )
 
     parent = get_account(conn, parent_id)
 
@@ -251,6 +315,8 @@ def create_user_account(
         )
 
     level = parent["level"] + 1
+    if is_cash_equivalent is None:
+        is_cash_equivalent = bool(parent["is_cash_equivalent"])
 
     # Calculate next 6-digit ID (parent_id * 100 + sequence)
     parent_id_int = parent["id"]
@@ -271,8 +337,8 @@ def create_user_account(
         )
 
     conn.execute(
-        """INSERT INTO accounts (id, name, type, parent_id, is_active, is_system, level, allow_posting, currency)
-           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        """INSERT INTO accounts (id, name, type, parent_id, is_active, is_system, level, allow_posting, currency, is_cash_equivalent)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
         (
             new_id,
             name.strip(),
@@ -283,6 +349,7 @@ def create_user_account(
             level,
             1,
             currency.upper() if currency else "KRW",
+            1 if is_cash_equivalent and type_ == "ASSET" else 0,
         ),
     )
 
@@ -295,17 +362,25 @@ def update_user_account(
     name: str,
     is_active: bool,
     currency: str | None = None,
+    is_cash_equivalent: bool | None = None,
 ) -> None:
     account = get_account(conn, account_id)
     if account is None:
         raise ValueError("계정을 찾을 수 없습니다.")
+    if is_cash_equivalent and account["type"] != "ASSET":
+        raise ValueError("현금성 계정은 자산 계정만 지정할 수 있습니다.")
 
     conn.execute(
-        "UPDATE accounts SET name = ?, is_active = ?, currency = ? WHERE id = ?",
+        "UPDATE accounts SET name = ?, is_active = ?, currency = ?, is_cash_equivalent = ? WHERE id = ?",
         (
             name.strip(),
             1 if is_active else 0,
             currency.upper() if currency else account["currency"],
+            (
+                account["is_cash_equivalent"]
+                if is_cash_equivalent is None
+                else int(is_cash_equivalent)
+            ),
             account_id,
         ),
     )
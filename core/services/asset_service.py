@@ -3,6 +3,8 @@ from __future__ import annotations
 import sqlite3
 from datetime import date
 
+from core.services.fx_service import FxRateBook
+
 
 def create_asset(
     conn: sqlite3.Connection,
@@ -395,9 +397,10 @@ def calculate_asset_depreciation(conn: sqlite3.Connection, as_of: date | None =
 
 
 def reconcile_asset_valuations_with_ledger(
-    conn: sqlite3.Connection, as_of: date | None = None
+    conn: sqlite3.Connection,
+    as_of: date | None = None,
+    fx_book: FxRateBook | None = None,
 ) -> dict:
-    from core.services.fx_service import get_latest_rate
     from core.services.ledger_service import account_balances
     from core.services.settings_service import get_base_currency
 
@@ -453,6 +456,10 @@ def reconcile_asset_valuations_with_ledger(
     """
 
     rows = conn.execute(sql, params).fetchall()
+    if fx_book is None:
+        fx_book = FxRateBook(
+            conn, pairs=[(base_currency, str(row["currency"])) for row in rows]
+        )
 
     valuation_totals: dict[int, float] = {}
     valued_assets_by_account: dict[int, set[int]] = {}
@@ -464,7 +471,7 @@ def reconcile_asset_valuations_with_ledger(
         if asset is None:
             continue
         currency = str(row["currency"])
-        rate = get_latest_rate(conn, base_currency, currency)
+        rate = fx_book.rate(base_currency, currency, as_of, backfill=True)
         if rate is None:
             missing_rates.add((base_currency, currency))
             continue
@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import sqlite3
+from datetime import date, timedelta
+
+# Fixed-date public holidays (month, day, name).
+_SOLAR_HOLIDAYS = (
+    (1, 1, "신정"),
+    (3, 1, "삼일절"),
+    (5, 5, "어린이날"),
+    (6, 6, "현충일"),
+    (8, 15, "광복절"),
+    (10, 3, "개천절"),
+    (10, 9, "한글날"),
+    (12, 25, "기독탄신일"),
+)
+
+# Lunar-calendar holidays as solar dates: (설날, 부처님오신날, 추석). Years not
+# listed only get the fixed-date holidays.
+_LUNAR_HOLIDAYS = {
+    2020: (date(2020, 1, 25), date(2020, 4, 30), date(2020, 10, 1)),
+    2021: (date(2021, 2, 12), date(2021, 5, 19), date(2021, 9, 21)),
+    2022: (date(2022, 2, 1), date(2022, 5, 8), date(2022, 9, 10)),
+    2023: (date(2023, 1, 22), date(2023, 5, 27), date(2023, 9, 29)),
+    2024: (date(2024, 2, 10), date(2024, 5, 15), date(2024, 9, 17)),
+    2025: (date(2025, 1, 29), date(2025, 5, 5), date(2025, 10, 6)),
+    2026: (date(2026, 2, 17), date(2026, 5, 24), date(2026, 9, 25)),
+    2027: (date(2027, 2, 7), date(2027, 5, 13), date(2027, 9, 15)),
+    2028: (date(2028, 1, 27), date(2028, 5, 2), date(2028, 10, 3)),
+    2029: (date(2029, 2, 13), date(2029, 5, 20), date(2029, 9, 22)),
+    2030: (date(2030, 2, 3), date(2030, 5, 9), date(2030, 9, 12)),
+}
+
+# Years populate_calendar covers at startup besides those of the journal.
+CALENDAR_FIRST_YEAR = 2000
+CALENDAR_YEARS_AHEAD = 10
+
+# First year a holiday earns a substitute day (대체공휴일) when it falls on a
+# weekend or another holiday. 설날/추석 only count Sundays.
+_SUBSTITUTE_SINCE = {
+    "설날": 2014,
+    "추석": 2014,
+    "어린이날": 2014,
+    "삼일절": 2021,
+    "광복절": 2021,
+    "개천절": 2021,
+    "한글날": 2021,
+    "부처님오신날": 2023,
+    "기독탄신일": 2023,
+}
+
+
+def korean_holidays(year: int) -> dict[date, str]:
+    """Public holidays of ``year`` including substitute days.
+
+    Covers the statutory holidays; one-off days such as election days are
+    not included.
+    """
+    # Each block is (name, days) so 설날/추석 are judged as three-day spans.
+    blocks = [(name, [date(year, m, d)]) for m, d, name in _SOLAR_HOLIDAYS]
+    if year in _LUNAR_HOLIDAYS:
+        seollal, buddha, chuseok = _LUNAR_HOLIDAYS[year]
+        blocks.append(("설날", [seollal + timedelta(days=i) for i in (-1, 0, 1)]))
+        blocks.append(("부처님오신날", [buddha]))
+        blocks.append(("추석", [chuseok + timedelta(days=i) for i in (-1, 0, 1)]))
+
+    holidays: dict[date, str] = {}
+    claims: dict[date, int] = {}
+    for name, days in blocks:
+        for day in days:
+            holidays.setdefault(day, name)
+            claims[day] = claims.get(day, 0) + 1
+
+    # A day shared by two holidays earns a single substitute.
+    compensated: set[date] = set()
+    for name, days in sorted(blocks, key=lambda b: b[1][0]):
+        if year < _SUBSTITUTE_SINCE.get(name, year + 1):
+            continue
+        weekend = (6,) if name in ("설날", "추석") else (5, 6)
+        owed_days = {
+            d
+            for d in days
+            if (d.weekday() in weekend or claims[d] > 1) and d not in compensated
+        }
+        compensated |= owed_days
+        owed = len(owed_days)
+        candidate = days[-1]
+        while owed:
+            candidate += timedelta(days=1)
+            if candidate.weekday() < 5 and candidate not in holidays:
+                holidays[candidate] = f"대체공휴일({name})"
+                owed -= 1
+    return dict(sorted(holidays.items()))
+
+
+def fiscal_position(year: int, month: int, start_month: int) -> tuple[int, int]:
+    """(fiscal_year, fiscal_period) of a month; the fiscal year is named by
+    the calendar year it starts in."""
+    fiscal_year = year if month >= start_month else year - 1
+    return fiscal_year, (month - start_month) % 12 + 1
+
+
+def _calendar_rows(year: int, start_month: int) -> list[tuple]:
+    holidays = korean_holidays(year)
+    rows = []
+    day = date(year, 1, 1)
+    while day.year == year:
+        iso_year, iso_week, _ = day.isocalendar()
+        fiscal_year, fiscal_period = fiscal_position(year, day.month, start_month)
+        holiday = holidays.get(day)
+        rows.append(
+            (
+                day.isoformat(),
+                year * 100 + day.month,
+                year,
+                (day.month + 2) // 3,
+                day.month,
+                day.day,
+                day.weekday(),
+                iso_year,
+                iso_week,
+                iso_year * 100 + iso_week,
+                fiscal_year,
+                fiscal_period,
+                (fiscal_period + 2) // 3,
+                int(holiday is not None),
+                holiday,
+                int(day.weekday() < 5 and holiday is None),
+            )
+        )
+        day += timedelta(days=1)
+    return rows
+
+
+def _refresh_months(conn: sqlite3.Connection) -> None:
+    conn.execute("DELETE FROM calendar_months")
+    conn.execute(
+        """
+        INSERT INTO calendar_months (
+            period_id, year, quarter, month, start_date, end_date,
+            fiscal_year, fiscal_period, fiscal_quarter, business_days
+        )
+        SELECT period_id, year, quarter, month, MIN(date), MAX(date),
+               fiscal_year, fiscal_period, fiscal_quarter, SUM(is_business_day)
+        FROM calendar
+        GROUP BY period_id
+        """
+    )
+
+
+def ensure_calendar(
+    conn: sqlite3.Connection, start: date | int, end: date | int
+) -> int:
+    """Make sure the calendar covers the years of ``start``..``end``.
+
+    Whole years are added as needed; returns how many days were added.
+    """
+    from core.services.settings_service import get_fiscal_year_start_month
+
+    first = start if isinstance(start, int) else start.year
+    last = end if isinstance(end, int) else end.year
+    covered = {
+        int(r[0])
+        for r in conn.execute(
+            "SELECT DISTINCT year FROM calendar WHERE year BETWEEN ? AND ?",
+            (first, last),
+        ).fetchall()
+    }
+    missing = [y for y in range(first, last + 1) if y not in covered]
+    if not missing:
+        return 0
+
+    start_month = get_fiscal_year_start_month(conn)
+    rows = [row for year in missing for row in _calendar_rows(year, start_month)]
+    conn.executemany(
+        f"INSERT OR REPLACE INTO calendar VALUES ({', '.join('?' * 16)})", rows
+    )
+    _refresh_months(conn)
+    return len(rows)
+
+
+def populate_calendar(conn: sqlite3.Connection, today: date | None = None) -> int:
+    """Cover CALENDAR_FIRST_YEAR through CALENDAR_YEARS_AHEAD years from now.
+
+    The range is widened to every year that has journal entries. Run at
+    startup so the report queries only ever read the calendar; returns how
+    many days were added.
+    """
+    today = today or date.today()
+    first, last = conn.execute(
+        "SELECT MIN(period_id) / 100, MAX(period_id) / 100 FROM journal_entries"
+    ).fetchone()
+    return ensure_calendar(
+        conn,
+        min(CALENDAR_FIRST_YEAR, first or CALENDAR_FIRST_YEAR),
+        max(today.year + CALENDAR_YEARS_AHEAD, last or 0),
+    )
+
+
+def calendar_range(conn: sqlite3.Connection) -> tuple[date, date] | None:
+    """First and last date in the calendar, or None when it is empty."""
+    first, last = conn.execute("SELECT MIN(date), MAX(date) FROM calendar").fetchone()
+    if first is None:
+        return None
+    return date.fromisoformat(first), date.fromisoformat(last)
+
+
+def check_calendar_covers(conn: sqlite3.Connection, start: date, end: date) -> None:
+    """Raise ValueError unless every day of ``start``..``end`` is in the calendar."""
+    days = conn.execute(
+        "SELECT COUNT(*) FROM calendar WHERE date BETWEEN ? AND ?",
+        (start.isoformat(), end.isoformat()),
+    ).fetchone()[0]
+    if days < (end - start).days + 1:
+        raise ValueError(f"Calendar does not cover {start} to {end}.")
+
+
+def refresh_fiscal_periods(conn: sqlite3.Connection, start_month: int) -> None:
+    """Recompute the fiscal columns after the fiscal start month changed."""
+    for table in ("calendar", "calendar_months"):
+        conn.execute(
+            f"""
+            UPDATE {table} SET
+                fiscal_year = year - (month < :start),
+                fiscal_period = (month - :start + 12) % 12 + 1,
+                fiscal_quarter = ((month - :start + 12) % 12) / 3 + 1
+            """,
+            {"start": start_month},
+        )
+
+
+def business_days(conn: sqlite3.Connection, start: date, end: date) -> list[date]:
+    """Business days (weekdays that are not public holidays) in a range."""
+    check_calendar_covers(conn, start, end)
+    rows = conn.execute(
+        """
+        SELECT date FROM calendar
+        WHERE date BETWEEN ? AND ? AND is_business_day = 1
+        ORDER BY date
+        """,
+        (start.isoformat(), end.isoformat()),
+    ).fetchall()
+    return [date.fromisoformat(r[0]) for r in rows]
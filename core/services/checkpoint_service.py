@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import sqlite3
+from datetime import date
+
+# Checkpoints are maintained by the journal_lines triggers of migrations 019
+# and 025; this module reads, rebuilds and verifies them.
+
+# Signed native amount of a journal line: the native amount carries the side of
+# the line, lines without a native amount fall back to the base amount. Stored
+# as journal_lines.signed_native; the expression recomputes it from the raw
+# columns for rebuilds and verification.
+NATIVE_SIGNED_SQL = """
+    CASE
+        WHEN jl.native_amount IS NOT NULL THEN (
+            CASE WHEN jl.debit > 0 THEN jl.native_amount ELSE -jl.native_amount END
+        )
+        ELSE (jl.debit - jl.credit)
+    END
+"""
+
+# Checkpoint currency bucket of a journal line: its native currency when it has
+# a native amount, '' (the base currency) otherwise.
+CURRENCY_BUCKET_SQL = """
+    CASE
+        WHEN jl.native_amount IS NOT NULL THEN COALESCE(jl.native_currency, '')
+        ELSE ''
+    END
+"""
+
+_MONTHLY_BALANCES_SQL = f"""
+    SELECT
+        m.account_id,
+        m.currency,
+        m.period,
+        SUM(m.base_change) OVER (
+            PARTITION BY m.account_id, m.currency ORDER BY m.period
+        ) AS base_balance,
+        SUM(m.native_change) OVER (
+            PARTITION BY m.account_id, m.currency ORDER BY m.period
+        ) AS native_balance
+    FROM (
+        SELECT
+            jl.account_id,
+            {CURRENCY_BUCKET_SQL} AS currency,
+            substr(je.entry_date, 1, 7) AS period,
+            SUM(jl.debit - jl.credit) AS base_change,
+            SUM({NATIVE_SIGNED_SQL}) AS native_change
+        FROM journal_lines jl
+        JOIN journal_entries je ON je.id = jl.entry_id
+        GROUP BY jl.account_id, 2, substr(je.entry_date, 1, 7)
+    ) m
+"""
+
+
+def _date_str(value: date | str) -> str:
+    return value.isoformat() if isinstance(value, date) else str(value)
+
+
+def checkpoint_balances(
+    conn: sqlite3.Connection,
+    base_currency: str,
+    as_of: date | str | None = None,
+) -> dict[int, dict[str, dict[str, float]]]:
+    """Return ``{account: {currency: {base, native}}}`` from the checkpoints.
+
+    Without ``as_of`` the latest checkpoint of each currency bucket already
+    holds the full balance. With ``as_of`` the last checkpoint before the
+    as-of month is combined with a scan of that month's lines up to the as-of
+    date. The base-currency bucket is labelled ``base_currency``.
+    """
+    if as_of is None:
+        rows = conn.execute(
+            """
+            SELECT account_id, currency, MAX(period) AS period,
+                   base_balance, native_balance
+            FROM account_balance_checkpoints
+            GROUP BY account_id, currency
+            """
+        ).fetchall()
+    else:
+        as_of_str = _date_str(as_of)
+        sql = f"""
+            SELECT account_id, currency,
+                   SUM(base_balance) AS base_balance,
+                   SUM(native_balance) AS native_balance
+            FROM (
+                SELECT account_id, currency, base_balance, native_balance
+                FROM (
+                    SELECT account_id, currency, MAX(period) AS period,
+                           base_balance, native_balance
+                    FROM account_balance_checkpoints
+                    WHERE period < ?
+                    GROUP BY account_id, currency
+                )
+                UNION ALL
+                SELECT jl.account_id, {CURRENCY_BUCKET_SQL},
+                       SUM(jl.signed_base), SUM(jl.signed_native)
+                FROM journal_entries je
+                JOIN journal_lines jl ON jl.entry_id = je.id
+                WHERE je.entry_date >= ? AND je.entry_date <= ?
+                GROUP BY jl.account_id, 2
+            )
+            GROUP BY account_id, currency
+        """
+        rows = conn.execute(
+            sql, (as_of_str[:7], f"{as_of_str[:7]}-01", as_of_str)
+        ).fetchall()
+
+    balances: dict[int, dict[str, dict[str, float]]] = {}
+    for r in rows:
+        # Native amounts given in the base currency join the '' bucket.
+        currency = r["currency"] or base_currency
+        bucket = balances.setdefault(int(r["account_id"]), {}).setdefault(
+            currency, {"base": 0.0, "native": 0.0}
+        )
+        bucket["base"] += float(r["base_balance"] or 0.0)
+        bucket["native"] += float(r["native_balance"] or 0.0)
+    return balances
+
+
+def rebuild_checkpoints(conn: sqlite3.Connection) -> int:
+    """Recompute every checkpoint from the journal. Returns the row count."""
+    conn.execute("DELETE FROM account_balance_checkpoints")
+    cursor = conn.execute(
+        f"""
+        INSERT INTO account_balance_checkpoints
+            (account_id, currency, period, base_balance, native_balance)
+        {_MONTHLY_BALANCES_SQL}
+        """
+    )
+    return cursor.rowcount
+
+
+def verify_checkpoints(conn: sqlite3.Connection, tolerance: float = 1e-6) -> list[dict]:
+    """Compare stored checkpoints against raw journal sums.
+
+    Returns one item per (account, currency, period) that is missing, extra or
+    off by more than ``tolerance``. An empty list means the checkpoints are
+    consistent.
+    """
+    expected = {
+        (r["account_id"], r["currency"], r["period"]): (
+            float(r["base_balance"] or 0.0),
+            float(r["native_balance"] or 0.0),
+        )
+        for r in conn.execute(_MONTHLY_BALANCES_SQL).fetchall()
+    }
+    stored = {
+        (r["account_id"], r["currency"], r["period"]): (
+            float(r["base_balance"] or 0.0),
+            float(r["native_balance"] or 0.0),
+        )
+        for r in conn.execute(
+            """
+            SELECT account_id, currency, period, base_balance, native_balance
+            FROM account_balance_checkpoints
+            """
+        ).fetchall()
+    }
+
+    mismatches = []
+    for key in sorted(expected.keys() | stored.keys()):
+        exp = expected.get(key)
+        got = stored.get(key)
+        if (
+            exp is not None
+            and got is not None
+            and abs(exp[0] - got[0]) <= tolerance
+            and abs(exp[1] - got[1]) <= tolerance
+        ):
+            continue
+        mismatches.append(
+            {
+                "account_id": key[0],
+                "currency": key[1],
+                "period": key[2],
+                "expected_base": exp[0] if exp else None,
+                "stored_base": got[0] if got else None,
+                "expected_native": exp[1] if exp else None,
+                "stored_native": got[1] if got else None,
+            }
+        )
+    return mismatches
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from core.db import get_connection
+
+    parser = argparse.ArgumentParser(description="Monthly balance checkpoints")
+    parser.add_argument("command", choices=["rebuild", "verify"])
+    args = parser.parse_args()
+
+    with get_connection() as conn:
+        if args.command == "rebuild":
+            count = rebuild_checkpoints(conn)
+            print(f"Rebuilt {count} checkpoints.")
+        else:
+            problems = verify_checkpoints(conn)
+            for item in problems:
+                print(item)
+            print(f"{len(problems)} mismatched checkpoints.")
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import csv
+import sqlite3
+from collections.abc import Iterator
+from datetime import date
+from pathlib import Path
+from typing import TextIO
+
+DEFAULT_CHUNK_SIZE = 2000
+
+JOURNAL_EXPORT_COLUMNS = [
+    "entry_date",
+    "entry_id",
+    "description",
+    "source",
+    "account_id",
+    "account",
+    "account_type",
+    "debit",
+    "credit",
+    "native_amount",
+    "native_currency",
+    "fx_rate",
+    "memo",
+]
+
+_JOURNAL_EXPORT_SQL = """
+    SELECT je.entry_date, je.id AS entry_id, je.description, je.source,
+           a.id AS account_id, a.name AS account, a.type AS account_type,
+           jl.debit, jl.credit, jl.native_amount, jl.native_currency,
+           jl.fx_rate, jl.memo
+    FROM journal_entries je
+    JOIN journal_lines jl ON jl.entry_id = je.id
+    JOIN accounts a ON a.id = jl.account_id
+    WHERE je.entry_date >= ? AND je.entry_date <= ?
+    ORDER BY je.entry_date, je.id, jl.id
+"""
+
+
+def _date_str(value: date | str) -> str:
+    return value.isoformat() if isinstance(value, date) else value
+
+
+def iter_journal_rows(
+    conn: sqlite3.Connection,
+    start: date | str,
+    end: date | str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[list[tuple]]:
+    """Yield journal lines in the date range as chunks of plain tuples.
+
+    Rows are pulled with ``fetchmany`` so at most ``chunk_size`` rows are held
+    at once, regardless of how large the range is.
+    """
+    cursor = conn.cursor()
+    # Plain tuples keep each chunk small; column order is JOURNAL_EXPORT_COLUMNS.
+    cursor.row_factory = None
+    cursor.execute(_JOURNAL_EXPORT_SQL, (_date_str(start), _date_str(end)))
+    try:
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield rows
+    finally:
+        cursor.close()
+
+
+def write_journal_csv(
+    conn: sqlite3.Connection,
+    out: TextIO,
+    start: date | str,
+    end: date | str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """Stream journal lines to a text file object as CSV. Returns the row count."""
+    writer = csv.writer(out)
+    writer.writerow(JOURNAL_EXPORT_COLUMNS)
+    count = 0
+    for rows in iter_journal_rows(conn, start, end, chunk_size):
+        writer.writerows(rows)
+        count += len(rows)
+    return count
+
+
+def write_journal_xlsx(
+    conn: sqlite3.Connection,
+    path: Path | str,
+    start: date | str,
+    end: date | str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """Stream journal lines to an XLSX file. Returns the row count.
+
+    xlsxwriter's ``constant_memory`` mode flushes each row to disk as soon as the
+    next one starts, so the workbook is written to a file path rather than an
+    in-memory buffer (which would disable that mode).
+    """
+    import xlsxwriter
+
+    workbook = xlsxwriter.Workbook(str(path), {"constant_memory": True})
+    try:
+        sheet = workbook.add_worksheet("journal")
+        sheet.write_row(0, 0, JOURNAL_EXPORT_COLUMNS)
+        row_idx = 1
+        for rows in iter_journal_rows(conn, start, end, chunk_size):
+            for row in rows:
+                sheet.write_row(row_idx, 0, row)
+                row_idx += 1
+    finally:
+        workbook.close()
+    return row_idx - 1
@@ -1,7 +1,174 @@
 from __future__ import annotations
 
 import sqlite3
-from datetime import datetime
+from bisect import bisect_right
+from collections.abc import Iterable
+from datetime import date, datetime, timedelta
+
+# Bumped by save_rate so loaded FxRateBooks know to reload.
+_rate_generation = 0
+
+
+def _as_of_key(as_of: date | datetime | str) -> str:
+    """Upper bound for stored ``as_of`` strings on or before ``as_of``.
+
+    A plain date covers every timestamp of that day ('~' sorts after the
+    'T'/space separators and digits).
+    """
+    if isinstance(as_of, datetime):
+        return as_of.isoformat()
+    if isinstance(as_of, date):
+        return as_of.isoformat() + "~"
+    return as_of if len(as_of) > 10 else as_of + "~"
+
+
+class FxRateBook:
+    """In-memory FX rates for repeated (base, quote, as-of) lookups.
+
+    All rates for the requested pairs (or every pair when ``pairs`` is None) are
+    loaded with one query into per-pair arrays sorted by ``as_of``; lookups are a
+    binary search. The book reloads itself after ``save_rate`` writes, so one
+    book can be shared by every report rendered for a request.
+
+    ``daily_series`` expands a pair into a forward-filled rate per calendar day
+    which is cached on the book, so converting many report dates costs one
+    list index per date.
+    """
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        pairs: Iterable[tuple[str, str]] | None = None,
+    ):
+        self.conn = conn
+        self.pairs = {(b, q) for b, q in pairs if b != q} if pairs else None
+        self._series: dict[tuple[str, str], tuple[list[str], list[float]]] = {}
+        self._daily: dict[tuple[str, str], tuple[int, list[float | None]]] = {}
+        self._generation = -1
+        self._load()
+
+    def _load(self) -> None:
+        query = "SELECT base_currency, quote_currency, rate, as_of FROM fx_rates"
+        params: list[str] = []
+        if self.pairs is not None:
+            if not self.pairs:
+                self._series = {}
+                self._daily = {}
+                self._generation = _rate_generation
+                return
+            bases = sorted({b for b, _ in self.pairs})
+            quotes = sorted({q for _, q in self.pairs})
+            query += (
+                f" WHERE base_currency IN ({','.join('?' for _ in bases)})"
+                f" AND quote_currency IN ({','.join('?' for _ in quotes)})"
+            )
+            params = bases + quotes
+        query += " ORDER BY base_currency, quote_currency, as_of, id"
+
+        series: dict[tuple[str, str], tuple[list[str], list[float]]] = {}
+        for row in self.conn.execute(query, params).fetchall():
+            dates, rates = series.setdefault(
+                (row["base_currency"], row["quote_currency"]), ([], [])
+            )
+            dates.append(str(row["as_of"]))
+            rates.append(float(row["rate"]))
+        self._series = series
+        self._daily = {}
+        self._generation = _rate_generation
+
+    def _pair_series(self, base: str, quote: str):
+        if self._generation != _rate_generation:
+            self._load()
+        if self.pairs is not None and (base, quote) not in self.pairs:
+            self.pairs.add((base, quote))
+            self._load()
+        return self._series.get((base, quote))
+
+    def rate(
+        self,
+        base: str,
+        quote: str,
+        as_of: date | datetime | str | None = None,
+        backfill: bool = False,
+    ) -> float | None:
+        """Return the rate in effect at ``as_of`` (latest when None).
+
+        With ``backfill`` a date before the first recorded rate gets the
+        earliest rate instead of None.
+        """
+        if base == quote:
+            return 1.0
+        series = self._pair_series(base, quote)
+        if not series:
+            return None
+        dates, rates = series
+        if as_of is None:
+            return rates[-1]
+
+        if type(as_of) is date:
+            cached = self._daily.get((base, quote))
+            if cached:
+                offset = as_of.toordinal() - cached[0]
+                if 0 <= offset < len(cached[1]):
+                    value = cached[1][offset]
+                    return rates[0] if value is None and backfill else value
+
+        idx = bisect_right(dates, _as_of_key(as_of))
+        if idx:
+            return rates[idx - 1]
+        return rates[0] if backfill else None
+
+    def daily_series(
+        self,
+        base: str,
+        quote: str,
+        start: date,
+        end: date,
+        backfill: bool = False,
+    ) -> list[float | None]:
+        """Return the forward-filled rate for each day from start to end."""
+        days = (end - start).days + 1
+        if days <= 0:
+            return []
+        if base == quote:
+            return [1.0] * days
+
+        series = self._pair_series(base, quote)
+        if not series:
+            return [None] * days
+        dates, rates = series
+
+        cached = self._daily.get((base, quote))
+        if cached is None or not (
+            cached[0] <= start.toordinal()
+            and end.toordinal() < cached[0] + len(cached[1])
+        ):
+            # Widen to any previously cached range so the cache only grows.
+            if cached is not None:
+                first = min(start, date.fromordinal(cached[0]))
+                last = max(end, date.fromordinal(cached[0] + len(cached[1]) - 1))
+            else:
+                first, last = start, end
+
+            values: list[float | None] = []
+            idx = bisect_right(dates, _as_of_key(first))
+            current = rates[idx - 1] if idx else None
+            day = first
+            while day <= last:
+                key = _as_of_key(day)
+                while idx < len(dates) and dates[idx] <= key:
+                    current = rates[idx]
+                    idx += 1
+                values.append(current)
+                day += timedelta(days=1)
+            cached = (first.toordinal(), values)
+            self._daily[(base, quote)] = cached
+
+        offset = start.toordinal() - cached[0]
+        result = cached[1][offset : offset + days]
+        if backfill:
+            result = [rates[0] if value is None else value for value in result]
+        return result
 
 
 def get_latest_rate(
@@ -24,6 +191,8 @@ def save_rate(
     rate: float,
     as_of: datetime | None = None,
 ) -> None:
+    global _rate_generation
+
     timestamp = as_of or datetime.now()
     timestamp_str = (
         timestamp.isoformat() if isinstance(timestamp, datetime) else timestamp
@@ -49,3 +218,4 @@ def save_rate(
             "INSERT INTO fx_rates (base_currency, quote_currency, rate, as_of) VALUES (?, ?, ?, ?)",
             (base, quote, rate, timestamp_str),
         )
+    _rate_generation += 1
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import sqlite3
+
+CHECK_NAMES = ("UNBALANCED", "NON_POSTING_ACCOUNT", "MISSING_FX", "ORPHAN_LINK")
+
+# Entries whose debits and credits differ by at least half a hundredth.
+_BALANCE_TOLERANCE = 0.005
+
+_ENTRY_CHECKS_SQL = (
+    f"""
+    INSERT INTO integrity_issues (check_name, entry_id, detail)
+    SELECT 'UNBALANCED', t.entry_id, printf('debit - credit = %.2f', SUM(jl.signed_base))
+    FROM temp.integrity_targets t
+    JOIN journal_lines jl ON jl.entry_id = t.entry_id
+    GROUP BY t.entry_id
+    HAVING ABS(SUM(jl.signed_base)) >= {_BALANCE_TOLERANCE}
+    """,
+    """
+    INSERT INTO integrity_issues (check_name, entry_id, line_id, detail)
+    SELECT 'NON_POSTING_ACCOUNT', jl.entry_id, jl.id, a.name
+    FROM temp.integrity_targets t
+    JOIN journal_lines jl ON jl.entry_id = t.entry_id
+    JOIN accounts a ON a.id = jl.account_id
+    WHERE a.allow_posting = 0
+    """,
+    """
+    INSERT INTO integrity_issues (check_name, entry_id, line_id, detail)
+    SELECT 'MISSING_FX', jl.entry_id, jl.id,
+           a.name || ' (' || COALESCE(jl.native_currency, a.currency) || ')'
+    FROM temp.integrity_targets t
+    JOIN journal_lines jl ON jl.entry_id = t.entry_id
+    JOIN accounts a ON a.id = jl.account_id
+    WHERE (COALESCE(jl.native_currency, a.currency, :base) != :base)
+      AND (jl.native_currency IS NULL OR jl.native_amount IS NULL OR jl.fx_rate IS NULL)
+    """,
+)
+
+_ORPHAN_LINKS_SQL = """
+    INSERT INTO integrity_issues (check_name, entry_id, ref_table, ref_id, detail)
+    SELECT 'ORPHAN_LINK', x.journal_entry_id, x.ref_table, x.id, ''
+    FROM (
+        SELECT 'investment_events' AS ref_table, id, journal_entry_id
+        FROM investment_events WHERE journal_entry_id IS NOT NULL
+        UNION ALL
+        SELECT 'loan_schedules', id, journal_entry_id
+        FROM loan_schedules WHERE journal_entry_id IS NOT NULL
+    ) x
+    WHERE NOT EXISTS (SELECT 1 FROM journal_entries je WHERE je.id = x.journal_entry_id)
+"""
+
+
+def integrity_status(conn: sqlite3.Connection) -> dict:
+    """High-water mark, last run and how much a routine scan would read."""
+    state = conn.execute(
+        "SELECT last_entry_id, last_run_at FROM integrity_scan_state WHERE id = 1"
+    ).fetchone()
+    last_entry_id = int(state["last_entry_id"]) if state else 0
+    new_entries = conn.execute(
+        "SELECT COUNT(*) FROM journal_entries WHERE id > ?", (last_entry_id,)
+    ).fetchone()[0]
+    dirty_entries = conn.execute(
+        "SELECT COUNT(*) FROM integrity_dirty_entries"
+    ).fetchone()[0]
+    issues = conn.execute("SELECT COUNT(*) FROM integrity_issues").fetchone()[0]
+    return {
+        "last_entry_id": last_entry_id,
+        "last_run_at": state["last_run_at"] if state else None,
+        "new_entries": int(new_entries),
+        "dirty_entries": int(dirty_entries),
+        "issues": int(issues),
+    }
+
+
+def scan_integrity(conn: sqlite3.Connection, full: bool = False) -> dict:
+    """Check the journal and record problems in ``integrity_issues``.
+
+    A routine scan covers entries above the high-water mark plus entries
+    queued by the change triggers; ``full`` rescans the whole journal. Each
+    scanned entry's previous issues are replaced. Orphan links are checked
+    over the (small) investment_events and loan_schedules tables every run.
+    Returns the number of entries scanned, issues found and the new mark.
+    """
+    from core.services.settings_service import get_base_currency
+
+    base_cur = get_base_currency(conn)
+    last_entry_id = 0 if full else integrity_status(conn)["last_entry_id"]
+    max_entry_id = conn.execute(
+        "SELECT COALESCE(MAX(id), 0) FROM journal_entries"
+    ).fetchone()[0]
+
+    conn.execute(
+        "CREATE TEMP TABLE IF NOT EXISTS integrity_targets (entry_id INTEGER PRIMARY KEY)"
+    )
+    conn.execute("DELETE FROM temp.integrity_targets")
+    conn.execute(
+        """
+        INSERT INTO temp.integrity_targets (entry_id)
+        SELECT id FROM journal_entries WHERE id > ? AND id <= ?
+        UNION
+        SELECT entry_id FROM integrity_dirty_entries
+        """,
+        (last_entry_id, max_entry_id),
+    )
+    scanned = conn.execute("SELECT COUNT(*) FROM temp.integrity_targets").fetchone()[0]
+
+    if full:
+        conn.execute("DELETE FROM integrity_issues")
+    else:
+        conn.execute(
+            """
+            DELETE FROM integrity_issues
+            WHERE check_name = 'ORPHAN_LINK'
+               OR entry_id IN (SELECT entry_id FROM temp.integrity_targets)
+            """
+        )
+    for sql in _ENTRY_CHECKS_SQL:
+        conn.execute(sql, {"base": base_cur})
+    conn.execute(_ORPHAN_LINKS_SQL)
+
+    conn.execute(
+        """
+        DELETE FROM integrity_dirty_entries
+        WHERE entry_id IN (SELECT entry_id FROM temp.integrity_targets)
+        """
+    )
+    conn.execute("DELETE FROM temp.integrity_targets")
+    conn.execute(
+        """
+        UPDATE integrity_scan_state
+        SET last_entry_id = ?, last_run_at = CURRENT_TIMESTAMP
+        WHERE id = 1
+        """,
+        (max_entry_id,),
+    )
+    issues = conn.execute("SELECT COUNT(*) FROM integrity_issues").fetchone()[0]
+    return {
+        "scanned_entries": int(scanned),
+        "issues": int(issues),
+        "last_entry_id": int(max_entry_id),
+    }
+
+
+def list_integrity_issues(
+    conn: sqlite3.Connection, check_name: str | None = None, limit: int = 500
+) -> list[dict]:
+    """Recorded issues, newest entries first, with the entry date and text."""
+    where, params = "", []
+    if check_name is not None:
+        where = "WHERE i.check_name = ?"
+        params.append(check_name)
+    rows = conn.execute(
+        f"""
+        SELECT i.id, i.check_name, i.entry_id, je.entry_date, je.description,
+               i.line_id, i.ref_table, i.ref_id, i.detail, i.detected_at
+        FROM integrity_issues i
+        LEFT JOIN journal_entries je ON je.id = i.entry_id
+        {where}
+        ORDER BY i.entry_id DESC, i.id
+        LIMIT ?
+        """,
+        [*params, limit],
+    ).fetchall()
+    return [dict(r) for r in rows]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from core.db import get_connection
+
+    parser = argparse.ArgumentParser(description="Ledger integrity scanner")
+    parser.add_argument("command", choices=["scan", "list"])
+    parser.add_argument("--full", action="store_true", help="rescan every entry")
+    args = parser.parse_args()
+
+    with get_connection() as conn:
+        if args.command == "scan":
+            result = scan_integrity(conn, full=args.full)
+            print(
+                f"Scanned {result['scanned_entries']} entries up to "
+                f"#{result['last_entry_id']}: {result['issues']} open issues."
+            )
+        else:
+            issues = list_integrity_issues(conn)
+            for item in issues:
+                print(item)
+            print(f"{len(issues)} issues.")
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import sqlite3
+from datetime import date
+
+import numpy as np
+
+from core.services.settings_service import get_base_currency
+
+# julianday('0001-01-01') is 1721425.5 and date(1, 1, 1).toordinal() is 1.
+_ORDINAL_SQL = "CAST(julianday(je.entry_date) - 1721424.5 AS INTEGER)"
+
+# Native amounts count only in the account's own currency, as in
+# ``account_balances_multi``; lines in other currencies add to base alone.
+_LINES_SQL = f"""
+    SELECT jl.id, jl.account_id, {_ORDINAL_SQL} AS day,
+           jl.signed_base AS base,
+           CASE
+               WHEN (CASE WHEN jl.native_amount IS NOT NULL
+                          THEN COALESCE(jl.native_currency, :base_cur)
+                          ELSE :base_cur END) = COALESCE(a.currency, :base_cur)
+               THEN jl.signed_native
+               ELSE 0.0
+           END AS native
+    FROM journal_lines jl
+    JOIN journal_entries je ON je.id = jl.entry_id
+    JOIN accounts a ON a.id = jl.account_id
+    WHERE jl.id > :last_id
+    ORDER BY jl.id
+"""
+
+_LOAD_CHUNK_SIZE = 10000
+
+
+def _ordinal(value: date | str) -> int:
+    if isinstance(value, str):
+        value = date.fromisoformat(value[:10])
+    return value.toordinal()
+
+
+class LedgerEngine:
+    """Journal lines held in NumPy arrays for many-date balance queries.
+
+    Lines are loaded once (in ``id`` order) into parallel arrays of account,
+    entry-date ordinal and signed base/native amounts, the native amount kept
+    only for lines in the account's own currency. A sorted view keyed by
+    (account, date) with cumulative sums answers "balances of every account
+    at dates D1..Dn" with one ``searchsorted`` over all (account, date) pairs.
+
+    ``refresh`` only reads lines above the last loaded id. Edits to posted
+    data (amounts, currencies, accounts, entry dates, deletions) bump
+    ``ledger_state.edit_version`` through triggers; when it has moved since
+    the last load the arrays are reloaded from scratch.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self._clear()
+        self.refresh()
+
+    def _clear(self) -> None:
+        self.line_ids = np.empty(0, dtype=np.int64)
+        self.account_ids = np.empty(0, dtype=np.int64)
+        self.days = np.empty(0, dtype=np.int64)
+        self.base = np.empty(0, dtype=np.float64)
+        self.native = np.empty(0, dtype=np.float64)
+        self.last_line_id = 0
+        self.edit_version = None
+        self._index = None
+
+    def _fetch_new_lines(self) -> list[np.ndarray]:
+        params = {
+            "base_cur": get_base_currency(self.conn),
+            "last_id": self.last_line_id,
+        }
+        cursor = self.conn.cursor()
+        cursor.row_factory = None
+        cursor.execute(_LINES_SQL, params)
+        chunks = []
+        try:
+            while True:
+                rows = cursor.fetchmany(_LOAD_CHUNK_SIZE)
+                if not rows:
+                    break
+                chunks.append(np.array(rows, dtype=np.float64))
+        finally:
+            cursor.close()
+        return chunks
+
+    def _append(self, chunks: list[np.ndarray]) -> int:
+        if not chunks:
+            return 0
+        data = np.concatenate(chunks)
+        self.line_ids = np.concatenate([self.line_ids, data[:, 0].astype(np.int64)])
+        self.account_ids = np.concatenate(
+            [self.account_ids, data[:, 1].astype(np.int64)]
+        )
+        self.days = np.concatenate([self.days, data[:, 2].astype(np.int64)])
+        self.base = np.concatenate([self.base, data[:, 3]])
+        self.native = np.concatenate([self.native, data[:, 4]])
+        self.last_line_id = int(self.line_ids[-1])
+        self._index = None
+        return len(data)
+
+    def _edit_version(self) -> int:
+        return self.conn.execute(
+            "SELECT edit_version FROM ledger_state WHERE id = 1"
+        ).fetchone()[0]
+
+    def reload(self) -> int:
+        """Drop everything and load the full journal. Returns the line count."""
+        self._clear()
+        self.edit_version = self._edit_version()
+        return self._append(self._fetch_new_lines())
+
+    def refresh(self) -> int:
+        """Load lines added since the last load. Returns the new line count.
+
+        If posted data was edited since, everything is reloaded instead.
+        """
+        if self._edit_version() != self.edit_version:
+            return self.reload()
+        return self._append(self._fetch_new_lines())
+
+    def _build_index(self):
+        if self._index is None:
+            accounts, account_idx = np.unique(self.account_ids, return_inverse=True)
+            order = np.lexsort((self.days, account_idx))
+            keys = account_idx[order] * (1 << 24) + self.days[order]
+            base_cum = np.concatenate([[0.0], np.cumsum(self.base[order])])
+            native_cum = np.concatenate([[0.0], np.cumsum(self.native[order])])
+            starts = np.searchsorted(keys, np.arange(len(accounts)) * (1 << 24))
+            self._index = (accounts, keys, base_cum, native_cum, starts)
+        return self._index
+
+    def balance_matrix(
+        self, dates: list[date | str]
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Return ``(account_ids, base, native, counts)`` for the given dates.
+
+        ``base``/``native`` are (accounts x dates) arrays of balances at the end
+        of each date; ``counts`` is the number of lines included per cell.
+        """
+        accounts, keys, base_cum, native_cum, starts = self._build_index()
+        day_ords = np.array([_ordinal(d) for d in dates], dtype=np.int64)
+        query = np.arange(len(accounts))[:, None] * (1 << 24) + day_ords[None, :]
+        ends = np.searchsorted(keys, query, side="right")
+        first = starts[:, None]
+        base = base_cum[ends] - base_cum[first]
+        native = native_cum[ends] - native_cum[first]
+        return accounts, base, native, ends - first
+
+    def balances_at(
+        self, dates: list[date | str]
+    ) -> dict[date | str, dict[int, dict[str, float]]]:
+        """Balances per date, each shaped like ``account_balances_multi``."""
+        accounts, base, native, counts = self.balance_matrix(dates)
+        results = {}
+        for col, as_of in enumerate(dates):
+            results[as_of] = {
+                int(accounts[row]): {
+                    "base": float(base[row, col]),
+                    "native": float(native[row, col]),
+                }
+                for row in np.flatnonzero(counts[:, col])
+            }
+        return results
+
+    def balances(self, as_of: date | str | None = None) -> dict[int, dict[str, float]]:
+        """Same result as ``account_balances_multi(conn, as_of)``."""
+        if as_of is None:
+            as_of = date.max
+        return self.balances_at([as_of])[as_of]
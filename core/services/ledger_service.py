@@ -4,19 +4,31 @@ import sqlite3
 from datetime import date
 
 from core.models import JournalEntryInput, JournalLine
+from core.money import from_minor, to_minor, to_scaled
+from core.services.checkpoint_service import checkpoint_balances
+from core.services.fx_service import FxRateBook
+from core.services.totals_service import currency_totals, current_balances
 
 
-def _validate_entry(lines: list[JournalLine]) -> None:
+def _validate_entry(lines: list[JournalLine], currency: str | None = None) -> None:
+    """Check an entry's lines; debits and credits are compared as integers.
+
+    With ``currency`` (minor-unit storage) amounts are compared in that
+    currency's minor units, otherwise in hundredths.
+    """
     if not lines or len(lines) < 2:
         raise ValueError("A journal entry must have at least 2 lines.")
 
-    total_debit = sum(max(0.0, float(line.debit)) for line in lines)
-    total_credit = sum(max(0.0, float(line.credit)) for line in lines)
+    def total(side: str) -> int:
+        amounts = [max(0.0, float(getattr(line, side))) for line in lines]
+        if currency is None:
+            return sum(to_scaled(amount, 2) for amount in amounts)
+        return sum(to_minor(amount, currency) for amount in amounts)
 
-    if round(total_debit, 2) != round(total_credit, 2):
-        raise ValueError(
-            f"Unbalanced entry: debit={total_debit:.2f}, credit={total_credit:.2f}"
-        )
+    if total("debit") != total("credit"):
+        debit = sum(max(0.0, float(line.debit)) for line in lines)
+        credit = sum(max(0.0, float(line.credit)) for line in lines)
+        raise ValueError(f"Unbalanced entry: debit={debit:.2f}, credit={credit:.2f}")
 
     for line in lines:
         if line.debit < 0 or line.credit < 0:
@@ -27,19 +39,25 @@ def _validate_entry(lines: list[JournalLine]) -> None:
             raise ValueError("A line must have a debit or credit amount.")
 
 
-def _validate_posting_accounts(
-    conn: sqlite3.Connection, lines: list[JournalLine]
-) -> None:
-    account_ids = list({int(line.account_id) for line in lines})
+def _fetch_posting_flags(
+    conn: sqlite3.Connection, account_ids: list[int]
+) -> dict[int, int]:
     if not account_ids:
-        raise ValueError("At least one journal line is required.")
-
+        return {}
     placeholders = ",".join("?" for _ in account_ids)
     rows = conn.execute(
         f"SELECT id, allow_posting FROM accounts WHERE id IN ({placeholders})",
         account_ids,
     ).fetchall()
-    allow_map = {r["id"]: r["allow_posting"] for r in rows}
+    return {r["id"]: r["allow_posting"] for r in rows}
+
+
+def _check_posting_accounts(
+    lines: list[JournalLine], allow_map: dict[int, int]
+) -> None:
+    account_ids = list({int(line.account_id) for line in lines})
+    if not account_ids:
+        raise ValueError("At least one journal line is required.")
 
     for account_id in account_ids:
         if account_id not in allow_map:
@@ -50,44 +68,232 @@ def _validate_posting_accounts(
             )
 
 
+def _validate_posting_accounts(
+    conn: sqlite3.Connection, lines: list[JournalLine]
+) -> None:
+    account_ids = list({int(line.account_id) for line in lines})
+    _check_posting_accounts(lines, _fetch_posting_flags(conn, account_ids))
+
+
+def _entry_date_str(entry_date: date | str) -> str:
+    return entry_date.isoformat() if isinstance(entry_date, date) else entry_date
+
+
+def _fetch_closed_periods(conn: sqlite3.Connection) -> list[tuple[str, str, str]]:
+    rows = conn.execute(
+        """
+        SELECT period, start_date, end_date FROM closed_periods
+        WHERE reopened_at IS NULL
+        """
+    ).fetchall()
+    return [(r["period"], r["start_date"], r["end_date"]) for r in rows]
+
+
+def _check_open_period(
+    entry_date: date | str, closed: list[tuple[str, str, str]]
+) -> None:
+    day = _entry_date_str(entry_date)
+    for period, start, end in closed:
+        if start <= day <= end:
+            raise ValueError(
+                f"마감된 기간({period})에는 전표를 입력할 수 없습니다. 먼저 마감을 취소하세요."
+            )
+
+
+def _amount_storage(conn: sqlite3.Connection) -> tuple[str, bool]:
+    """Return the base currency and whether minor-unit storage is on."""
+    from core.services.settings_service import get_amount_storage, get_base_currency
+
+    return get_base_currency(conn), get_amount_storage(conn) == "MINOR"
+
+
+def _round_lines_to_minor(lines: list[JournalLine], base_cur: str) -> list[JournalLine]:
+    """Copies of ``lines`` with amounts rounded to whole minor units."""
+    rounded = []
+    for line in lines:
+        native_cur = line.native_currency or base_cur
+        rounded.append(
+            JournalLine(
+                account_id=line.account_id,
+                debit=from_minor(to_minor(line.debit, base_cur), base_cur),
+                credit=from_minor(to_minor(line.credit, base_cur), base_cur),
+                memo=line.memo,
+                native_amount=(
+                    None
+                    if line.native_amount is None
+                    else from_minor(
+                        to_minor(line.native_amount, native_cur), native_cur
+                    )
+                ),
+                native_currency=line.native_currency,
+                fx_rate=line.fx_rate,
+            )
+        )
+    return rounded
+
+
+# Signed amounts and the entry date are written with the line, so the fill
+# trigger of migration 023 has nothing left to do.
+_INSERT_LINE_SQL = """
+    INSERT INTO journal_lines (
+        entry_id, account_id, debit, credit, memo, native_amount, native_currency,
+        fx_rate, debit_minor, credit_minor, native_minor, signed_base,
+        signed_native, entry_date
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _line_row(
+    entry_id: int, entry_date: str, line: JournalLine, base_cur: str
+) -> tuple:
+    debit = float(line.debit)
+    credit = float(line.credit)
+    if line.native_amount is None:
+        signed_native = debit - credit
+    else:
+        native = float(line.native_amount)
+        signed_native = native if debit > 0 else -native
+    return (
+        entry_id,
+        line.account_id,
+        debit,
+        credit,
+        line.memo,
+        line.native_amount,
+        line.native_currency,
+        line.fx_rate,
+        to_minor(line.debit, base_cur),
+        to_minor(line.credit, base_cur),
+        (
+            None
+            if line.native_amount is None
+            else to_minor(line.native_amount, line.native_currency or base_cur)
+        ),
+        debit - credit,
+        signed_native,
+        entry_date,
+    )
+
+
 def create_journal_entry(conn: sqlite3.Connection, entry_in: JournalEntryInput) -> int:
-    _validate_entry(entry_in.lines)
-    _validate_posting_accounts(conn, entry_in.lines)
+    base_cur, minor_mode = _amount_storage(conn)
+    lines = entry_in.lines
+    if minor_mode:
+        lines = _round_lines_to_minor(lines, base_cur)
+    _validate_entry(lines, base_cur if minor_mode else None)
+    _validate_posting_accounts(conn, lines)
+    _check_open_period(entry_in.entry_date, _fetch_closed_periods(conn))
 
     # Create Entry
+    entry_date = _entry_date_str(entry_in.entry_date)
     cursor = conn.execute(
         "INSERT INTO journal_entries (entry_date, description, source) VALUES (?, ?, ?)",
-        (
-            (
-                entry_in.entry_date.isoformat()
-                if isinstance(entry_in.entry_date, date)
-                else entry_in.entry_date
-            ),
-            entry_in.description,
-            entry_in.source,
-        ),
+        (entry_date, entry_in.description, entry_in.source),
     )
     entry_id = cursor.lastrowid
 
-    for line in entry_in.lines:
-        conn.execute(
-            """INSERT INTO journal_lines (entry_id, account_id, debit, credit, memo, native_amount, native_currency, fx_rate)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
-            (
-                entry_id,
-                line.account_id,
-                float(line.debit),
-                float(line.credit),
-                line.memo,
-                line.native_amount,
-                line.native_currency,
-                line.fx_rate,
-            ),
-        )
+    for line in lines:
+        conn.execute(_INSERT_LINE_SQL, _line_row(entry_id, entry_date, line, base_cur))
 
     return entry_id
 
 
+def create_journal_entries_bulk(
+    conn: sqlite3.Connection,
+    entries: list[JournalEntryInput],
+    stop_on_error: bool = False,
+    defer_foreign_keys: bool = False,
+) -> dict:
+    """Post many journal entries with one validation pass and batched inserts.
+
+    Every entry is validated like ``create_journal_entry``; posting accounts are
+    resolved with a single query. Valid entries are inserted with
+    ``executemany`` inside one savepoint. Invalid entries are reported in
+    ``errors`` and skipped, unless ``stop_on_error`` is set, in which case the
+    first error is raised and nothing is written.
+
+    Returns ``{"entry_ids": [...], "errors": [...]}`` where ``entry_ids`` follows
+    the input order and holds ``None`` for rejected entries.
+    """
+    base_cur, minor_mode = _amount_storage(conn)
+    if minor_mode:
+        entries = [
+            JournalEntryInput(
+                entry_date=entry.entry_date,
+                description=entry.description,
+                lines=_round_lines_to_minor(entry.lines, base_cur),
+                source=entry.source,
+            )
+            for entry in entries
+        ]
+
+    account_ids = list(
+        {int(line.account_id) for entry in entries for line in entry.lines}
+    )
+    allow_map = _fetch_posting_flags(conn, account_ids)
+    closed = _fetch_closed_periods(conn)
+
+    errors: list[dict] = []
+    valid_indexes: list[int] = []
+    for index, entry in enumerate(entries):
+        try:
+            _validate_entry(entry.lines, base_cur if minor_mode else None)
+            _check_posting_accounts(entry.lines, allow_map)
+            _check_open_period(entry.entry_date, closed)
+        except ValueError as exc:
+            if stop_on_error:
+                raise ValueError(f"Entry #{index}: {exc}") from exc
+            errors.append({"index": index, "error": str(exc)})
+        else:
+            valid_indexes.append(index)
+
+    entry_ids: list[int | None] = [None] * len(entries)
+    if not valid_indexes:
+        return {"entry_ids": entry_ids, "errors": errors}
+
+    conn.execute("SAVEPOINT journal_bulk")
+    try:
+        if defer_foreign_keys:
+            conn.execute("PRAGMA defer_foreign_keys = ON")
+
+        # Ids are assigned up front so headers and lines can both be batched.
+        row = conn.execute(
+            """
+            SELECT MAX(
+                COALESCE((SELECT MAX(id) FROM journal_entries), 0),
+                COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'journal_entries'), 0)
+            )
+            """
+        ).fetchone()
+        next_id = int(row[0]) + 1
+
+        header_rows = []
+        line_rows = []
+        for offset, index in enumerate(valid_indexes):
+            entry = entries[index]
+            entry_id = next_id + offset
+            entry_ids[index] = entry_id
+            entry_date = _entry_date_str(entry.entry_date)
+            header_rows.append((entry_id, entry_date, entry.description, entry.source))
+            line_rows.extend(
+                _line_row(entry_id, entry_date, line, base_cur) for line in entry.lines
+            )
+
+        conn.executemany(
+            "INSERT INTO journal_entries (id, entry_date, description, source) VALUES (?, ?, ?, ?)",
+            header_rows,
+        )
+        conn.executemany(_INSERT_LINE_SQL, line_rows)
+    except Exception:
+        conn.execute("ROLLBACK TO journal_bulk")
+        conn.execute("RELEASE journal_bulk")
+        raise
+    conn.execute("RELEASE journal_bulk")
+
+    return {"entry_ids": entry_ids, "errors": errors}
+
+
 def list_accounts(conn: sqlite3.Connection, active_only: bool = True) -> list[dict]:
     query = "SELECT * FROM accounts"
     if active_only:
@@ -115,80 +321,514 @@ def get_account(conn: sqlite3.Connection, account_id: int) -> dict | None:
     return dict(row) if row else None
 
 
+def _keyset_page(
+    conn: sqlite3.Connection,
+    select_sql: str,
+    key_columns: list[tuple[str, str]],
+    filters: list[str],
+    params: list,
+    cursor: tuple | None,
+    limit: int,
+    direction: str,
+) -> dict:
+    """Run one keyset-paginated query ordered newest first.
+
+    ``cursor`` is the key of the row the page starts after (``direction`` =
+    "next", older rows) or before ("prev", newer rows), so each page seeks
+    straight to its position in the index instead of skipping rows.
+    ``key_columns`` pairs each SQL key expression with its result column name.
+    """
+    if direction not in ("next", "prev"):
+        raise ValueError("direction must be 'next' or 'prev'.")
+
+    where = list(filters)
+    params = list(params)
+    key_exprs = [expr for expr, _ in key_columns]
+    if cursor is not None:
+        op = "<" if direction == "next" else ">"
+        placeholders = ", ".join("?" for _ in key_exprs)
+        where.append(f"({', '.join(key_exprs)}) {op} ({placeholders})")
+        params.extend(cursor)
+
+    order = "DESC" if direction == "next" else "ASC"
+    sql = select_sql
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY " + ", ".join(f"{expr} {order}" for expr in key_exprs)
+    sql += " LIMIT ?"
+    params.append(limit + 1)
+
+    rows = [dict(r) for r in conn.execute(sql, params).fetchall()]
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if direction == "prev":
+        rows.reverse()
+
+    key_names = [name for _, name in key_columns]
+
+    def _key(row: dict) -> tuple:
+        return tuple(row[name] for name in key_names)
+
+    if direction == "next":
+        has_next, has_prev = has_more, cursor is not None
+    else:
+        has_next, has_prev = cursor is not None, has_more
+
+    return {
+        "items": rows,
+        "next_cursor": _key(rows[-1]) if rows and has_next else None,
+        "prev_cursor": _key(rows[0]) if rows and has_prev else None,
+    }
+
+
+def _date_range_filters(
+    start: date | str | None, end: date | str | None
+) -> tuple[list[str], list[str]]:
+    filters, params = [], []
+    if start is not None:
+        filters.append("je.entry_date >= ?")
+        params.append(_entry_date_str(start))
+    if end is not None:
+        filters.append("je.entry_date <= ?")
+        params.append(_entry_date_str(end))
+    return filters, params
+
+
+def list_journal_entries_page(
+    conn: sqlite3.Connection,
+    start: date | None = None,
+    end: date | None = None,
+    cursor: tuple[str, int] | None = None,
+    limit: int = 50,
+    direction: str = "next",
+) -> dict:
+    """Return one page of journal entries, newest first.
+
+    Pages are keyed by ``(entry_date, id)``; pass ``next_cursor`` with
+    direction "next" or ``prev_cursor`` with direction "prev" from the previous
+    result to move between pages.
+    """
+    filters, params = _date_range_filters(start, end)
+    return _keyset_page(
+        conn,
+        "SELECT je.id, je.entry_date, je.description, je.source FROM journal_entries je",
+        [("je.entry_date", "entry_date"), ("je.id", "id")],
+        filters,
+        params,
+        cursor,
+        limit,
+        direction,
+    )
+
+
+def list_journal_lines_page(
+    conn: sqlite3.Connection,
+    start: date | None = None,
+    end: date | None = None,
+    cursor: tuple[str, int, int] | None = None,
+    limit: int = 100,
+    direction: str = "next",
+) -> dict:
+    """Return one page of journal lines, newest entry first.
+
+    Pages are keyed by ``(entry_date, entry_id, line_id)``.
+    """
+    filters, params = _date_range_filters(start, end)
+    return _keyset_page(
+        conn,
+        """
+        SELECT je.entry_date, je.id AS entry_id, jl.id AS line_id, je.description,
+               a.name AS account, a.type, jl.debit, jl.credit, jl.memo
+        FROM journal_entries je
+        JOIN journal_lines jl ON jl.entry_id = je.id
+        JOIN accounts a ON a.id = jl.account_id
+        """,
+        [
+            ("je.entry_date", "entry_date"),
+            ("je.id", "entry_id"),
+            ("jl.id", "line_id"),
+        ],
+        filters,
+        params,
+        cursor,
+        limit,
+        direction,
+    )
+
+
+# True for lines counted in the native balance of an account in currency ``?``:
+# its native currency when it has a native amount, the base currency (first
+# two ``?``) otherwise.
+_IN_ACCOUNT_CURRENCY_SQL = """
+    (CASE WHEN jl.native_amount IS NOT NULL THEN COALESCE(jl.native_currency, ?)
+          ELSE ? END) = ?
+"""
+
+
+def _account_currency(conn: sqlite3.Connection, account_id: int, base_cur: str) -> str:
+    row = conn.execute(
+        "SELECT currency FROM accounts WHERE id = ?", (account_id,)
+    ).fetchone()
+    return (row["currency"] if row else None) or base_cur
+
+
+def _opening_balance(
+    conn: sqlite3.Connection,
+    account_id: int,
+    start: date | str,
+    base_cur: str,
+    currency: str,
+) -> dict[str, float]:
+    """Balance of one account before ``start``: the last checkpoint of an
+    earlier month in each currency plus that month's lines dated before
+    ``start``. ``native`` covers the ``currency`` bucket only."""
+    start_str = _entry_date_str(start)
+    row = conn.execute(
+        """
+        SELECT COALESCE(cp.base, 0) + COALESCE(m.base, 0) AS base,
+               COALESCE(cp.native, 0) + COALESCE(m.native, 0) AS native
+        FROM (SELECT 1) AS seed
+        LEFT JOIN (
+            SELECT SUM(base_balance) AS base,
+                   SUM(CASE WHEN COALESCE(NULLIF(currency, ''), :base_cur) = :currency
+                            THEN native_balance ELSE 0 END) AS native
+            FROM (
+                SELECT currency, MAX(period), base_balance, native_balance
+                FROM account_balance_checkpoints
+                WHERE account_id = :account_id AND period < :period
+                GROUP BY currency
+            )
+        ) AS cp ON 1 = 1
+        LEFT JOIN (
+            SELECT SUM(signed_base) AS base,
+                   SUM(CASE WHEN (CASE WHEN native_amount IS NOT NULL
+                                       THEN COALESCE(native_currency, :base_cur)
+                                       ELSE :base_cur END) = :currency
+                            THEN signed_native ELSE 0 END) AS native
+            FROM journal_lines
+            WHERE account_id = :account_id
+              AND entry_date >= :month_start AND entry_date < :start
+        ) AS m ON 1 = 1
+        """,
+        {
+            "account_id": account_id,
+            "period": start_str[:7],
+            "month_start": f"{start_str[:7]}-01",
+            "start": start_str,
+            "base_cur": base_cur,
+            "currency": currency,
+        },
+    ).fetchone()
+    return {"base": float(row["base"]), "native": float(row["native"])}
+
+
+def account_ledger(
+    conn: sqlite3.Connection,
+    account_id: int,
+    start: date | None = None,
+    end: date | None = None,
+    cursor: tuple[str, int, float, float] | None = None,
+    limit: int = 100,
+) -> dict:
+    """Lines of one account in date order with running balances.
+
+    The first page computes the balance before ``start`` once; each page
+    returns ``next_cursor`` = (entry_date, line_id, base balance, native
+    balance) of its last line, so the next page seeks past it on
+    ``(account_id, entry_date, id)`` and continues the running sum from the
+    carried balance instead of re-reading earlier lines. The native balance
+    counts only lines in the account's own currency.
+    """
+    from core.services.settings_service import get_base_currency
+
+    base_cur = get_base_currency(conn)
+    currency = _account_currency(conn, account_id, base_cur)
+    if cursor is None:
+        opening = (
+            _opening_balance(conn, account_id, start, base_cur, currency)
+            if start is not None
+            else {"base": 0.0, "native": 0.0}
+        )
+    else:
+        opening = {"base": float(cursor[2]), "native": float(cursor[3])}
+
+    where = ["jl.account_id = ?"]
+    params: list = [account_id]
+    if start is not None:
+        where.append("jl.entry_date >= ?")
+        params.append(_entry_date_str(start))
+    if end is not None:
+        where.append("jl.entry_date <= ?")
+        params.append(_entry_date_str(end))
+    if cursor is not None:
+        where.append("(jl.entry_date, jl.id) > (?, ?)")
+        params.extend([cursor[0], int(cursor[1])])
+
+    rows = conn.execute(
+        f"""
+        SELECT jl.id AS line_id, jl.entry_date, jl.entry_id, je.description,
+               jl.memo, jl.debit, jl.credit, jl.native_amount, jl.native_currency,
+               ? + SUM(jl.signed_base) OVER running AS balance_base,
+               ? + SUM(CASE WHEN {_IN_ACCOUNT_CURRENCY_SQL}
+                            THEN jl.signed_native ELSE 0 END) OVER running
+                   AS balance_native
+        FROM journal_lines jl
+        JOIN journal_entries je ON je.id = jl.entry_id
+        WHERE {" AND ".join(where)}
+        WINDOW running AS (ORDER BY jl.entry_date, jl.id ROWS UNBOUNDED PRECEDING)
+        ORDER BY jl.entry_date, jl.id
+        LIMIT ?
+        """,
+        [
+            opening["base"],
+            opening["native"],
+            base_cur,
+            base_cur,
+            currency,
+            *params,
+            limit + 1,
+        ],
+    ).fetchall()
+
+    items = [dict(r) for r in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = (
+            last["entry_date"],
+            last["line_id"],
+            last["balance_base"],
+            last["balance_native"],
+        )
+    return {"opening_balance": opening, "items": items, "next_cursor": next_cursor}
+
+
+def _search_match_query(text: str) -> str:
+    """FTS5 query matching every whitespace-separated term as a prefix."""
+    terms = ['"' + term.replace('"', '""') + '"*' for term in text.split()]
+    return " ".join(terms)
+
+
+def search_journal(
+    conn: sqlite3.Connection,
+    query: str,
+    limit: int = 50,
+    cursor: tuple[float, int] | None = None,
+    direction: str = "next",
+) -> dict:
+    """Search entry descriptions and line memos, best matches first.
+
+    Every term must match the start of a word in the description or memo.
+    Items are journal lines with their entry, account and amounts, ranked by
+    bm25 ``score`` (higher is better) and keyed by ``(score, line_id)`` for
+    paging like ``list_journal_lines_page``.
+    """
+    match = _search_match_query(query)
+    if not match:
+        return {"items": [], "next_cursor": None, "prev_cursor": None}
+    return _keyset_page(
+        conn,
+        """
+        SELECT -journal_search.rank AS score, jl.id AS line_id,
+               je.entry_date, je.id AS entry_id, je.description,
+               a.id AS account_id, a.name AS account, a.type,
+               jl.debit, jl.credit, jl.memo, jl.native_amount, jl.native_currency
+        FROM journal_search
+        JOIN journal_lines jl ON jl.id = journal_search.rowid
+        JOIN journal_entries je ON je.id = jl.entry_id
+        JOIN accounts a ON a.id = jl.account_id
+        """,
+        [("-journal_search.rank", "score"), ("jl.id", "line_id")],
+        ["journal_search MATCH ?"],
+        [match],
+        cursor,
+        limit,
+        direction,
+    )
+
+
 def account_balances(
     conn: sqlite3.Connection, as_of: date | None = None
 ) -> dict[int, float]:
-    query = """
-        SELECT jl.account_id, SUM(jl.debit - jl.credit) AS balance
-        FROM journal_lines jl
-        JOIN journal_entries je ON je.id = jl.entry_id
+    balances = account_balances_multi(conn, as_of=as_of)
+    return {account_id: b["base"] for account_id, b in balances.items()}
+
+
+def currency_balances(
+    conn: sqlite3.Connection, as_of: date | None = None
+) -> dict[int, dict[str, dict[str, float]]]:
+    """Balances per account and native currency: ``{account: {cur: {base, native}}}``.
+
+    A line counts in its ``native_currency`` when it has a native amount and
+    in the base currency otherwise, so an account holding several currencies
+    gets one bucket each. Current balances are read from ``account_totals``,
+    balances as of a date from the per-currency checkpoints. In minor-unit
+    mode the integer columns are summed instead, in one grouped query over
+    (account_id, native_currency) in the order of
+    ``ix_journal_lines_account_currency``.
     """
-    params = []
-    if as_of:
-        query += " WHERE je.entry_date <= ?"
-        params.append(as_of.isoformat() if isinstance(as_of, date) else as_of)
+    base_cur, minor_mode = _amount_storage(conn)
+    if not minor_mode:
+        if as_of is None:
+            return currency_totals(conn, base_cur)
+        return checkpoint_balances(conn, base_cur, as_of=as_of)
+    base_amt = "jl.debit_minor - jl.credit_minor"
+    native_amt = (
+        "CASE WHEN jl.debit_minor > 0 THEN jl.native_minor ELSE -jl.native_minor END"
+    )
+    has_native = "jl.native_minor IS NOT NULL"
+    where = ""
+    params: tuple = ()
+    if as_of is not None:
+        where = "WHERE jl.entry_date <= ?"
+        params = (_entry_date_str(as_of),)
+    rows = conn.execute(
+        f"""
+        SELECT jl.account_id, jl.native_currency,
+               SUM(CASE WHEN {has_native} THEN 0 ELSE {base_amt} END) AS plain_base,
+               SUM(CASE WHEN {has_native} THEN {base_amt} ELSE 0 END) AS fx_base,
+               SUM(CASE WHEN {has_native} THEN {native_amt} ELSE 0 END) AS fx_native
+        FROM journal_lines jl
+        {where}
+        GROUP BY jl.account_id, jl.native_currency
+        """,
+        params,
+    ).fetchall()
 
-    query += " GROUP BY jl.account_id"
+    balances: dict[int, dict[str, dict[str, float]]] = {}
 
-    rows = conn.execute(query, params).fetchall()
-    return {r["account_id"]: (r["balance"] or 0.0) for r in rows}
+    def add(account_id: int, currency: str, base, native) -> None:
+        base, native = from_minor(base, base_cur), from_minor(native, currency)
+        bucket = balances.setdefault(account_id, {}).setdefault(
+            currency, {"base": 0.0, "native": 0.0}
+        )
+        bucket["base"] += float(base)
+        bucket["native"] += float(native)
+
+    for r in rows:
+        account_id = int(r["account_id"])
+        # Lines without a native amount are plain base-currency amounts.
+        if r["plain_base"]:
+            add(account_id, base_cur, r["plain_base"], r["plain_base"])
+        if r["fx_base"] or r["fx_native"]:
+            currency = r["native_currency"] or base_cur
+            add(account_id, currency, r["fx_base"], r["fx_native"])
+    return balances
 
 
 def account_balances_multi(
     conn: sqlite3.Connection, as_of: date | None = None
 ) -> dict[int, dict[str, float]]:
-    where_clause = ""
-    params = []
-    if as_of:
-        where_clause = "WHERE je.entry_date <= ?"
-        params.append(as_of.isoformat() if isinstance(as_of, date) else as_of)
-
-    sql = f"""
-        SELECT 
-            jl.account_id,
-            SUM(jl.debit - jl.credit) AS base_balance,
-            SUM(
-                CASE 
-                    WHEN jl.native_amount IS NOT NULL THEN (
-                        CASE WHEN jl.debit > 0 THEN jl.native_amount ELSE -jl.native_amount END
-                    )
-                    ELSE (jl.debit - jl.credit)
-                END
-            ) AS native_balance
-        FROM journal_lines jl
-        JOIN journal_entries je ON je.id = jl.entry_id
-        {where_clause}
-        GROUP BY jl.account_id
-    """
-
-    rows = conn.execute(sql, params).fetchall()
+    """Base and native balance per account.
 
+    ``base`` covers every currency bucket; ``native`` is the bucket in the
+    account's own currency. Use ``currency_balances`` for the other buckets
+    of accounts that hold several currencies.
+    """
+    if as_of is None and not _amount_storage(conn)[1]:
+        return current_balances(conn)
+    buckets = currency_balances(conn, as_of=as_of)
+    currencies = _account_currencies(conn)
     return {
-        r["account_id"]: {
-            "base": float(r["base_balance"] or 0.0),
-            "native": float(r["native_balance"] or 0.0),
+        account_id: {
+            "base": sum(b["base"] for b in by_cur.values()),
+            "native": by_cur.get(currencies.get(account_id), {}).get("native", 0.0),
         }
-        for r in rows
+        for account_id, by_cur in buckets.items()
     }
 
 
-def trial_balance(conn: sqlite3.Connection, as_of: date | None = None):
-    bal = account_balances(conn, as_of=as_of)
+def _account_currencies(conn: sqlite3.Connection) -> dict[int, str]:
+    """Currency of every account, the base currency where none is set."""
+    from core.services.settings_service import get_base_currency
+
+    base_cur = get_base_currency(conn)
+    rows = conn.execute("SELECT id, currency FROM accounts").fetchall()
+    return {int(r["id"]): r["currency"] or base_cur for r in rows}
+
+
+def account_ancestors(conn: sqlite3.Connection) -> list[tuple[int, int]]:
+    """Return ``(ancestor_id, descendant_id)`` pairs for the account tree.
+
+    Every account is paired with itself and with each of its parents, so a
+    subtree total is a single pass summing descendants into ancestors.
+    """
+    rows = conn.execute(
+        "SELECT ancestor_id, descendant_id FROM account_closure"
+    ).fetchall()
+    return [(int(r[0]), int(r[1])) for r in rows]
+
+
+def rollup_values(
+    pairs: list[tuple[int, int]], values: dict[int, dict]
+) -> dict[int, dict]:
+    """Sum per-account amounts into every ancestor.
+
+    ``values`` maps account id to named amounts (e.g. base, display). Native
+    amounts are not additive across currencies, so they are passed as a
+    ``native_by_currency`` mapping and summed per currency.
+    """
+    totals: dict[int, dict] = {}
+    for ancestor_id, descendant_id in pairs:
+        data = values.get(descendant_id)
+        if not data:
+            continue
+        node = totals.setdefault(ancestor_id, {"native_by_currency": {}})
+        for name, amount in data.items():
+            if name == "native_by_currency":
+                by_cur = node["native_by_currency"]
+                for cur, native in amount.items():
+                    by_cur[cur] = by_cur.get(cur, 0.0) + native
+            else:
+                node[name] = node.get(name, 0.0) + amount
+    return totals
+
+
+def trial_balance(
+    conn: sqlite3.Connection, as_of: date | None = None, rollups: bool = False
+):
+    """Return one row per account with its debit/credit balance.
+
+    With ``rollups`` each row also carries ``parent_id``, ``level`` and the
+    subtree totals ``rollup_balance`` (base) and ``rollup_native`` (per
+    currency), so aggregate accounts show the sum of their children.
+    """
+    buckets = currency_balances(conn, as_of=as_of)
+    bal = {
+        account_id: {
+            "base": sum(b["base"] for b in by_cur.values()),
+            "native_by_currency": {cur: b["native"] for cur, b in by_cur.items()},
+        }
+        for account_id, by_cur in buckets.items()
+    }
     accounts = list_accounts(conn, active_only=False)  # list of dicts
 
+    totals: dict[int, dict] = {}
+    if rollups:
+        totals = rollup_values(account_ancestors(conn), bal)
+
     results = []
     for a in accounts:
-        b = float(bal.get(int(a["id"]), 0.0))
-        results.append(
-            {
-                "account_id": int(a["id"]),
-                "account": a["name"],
-                "type": a["type"],
-                "debit": b if b > 0 else 0.0,
-                "credit": -b if b < 0 else 0.0,
-                "raw_balance": b,
-            }
-        )
+        b = float(bal.get(int(a["id"]), {}).get("base", 0.0))
+        row = {
+            "account_id": int(a["id"]),
+            "account": a["name"],
+            "type": a["type"],
+            "debit": b if b > 0 else 0.0,
+            "credit": -b if b < 0 else 0.0,
+            "raw_balance": b,
+        }
+        if rollups:
+            node = totals.get(int(a["id"]), {})
+            row.update(
+                {
+                    "parent_id": a["parent_id"],
+                    "level": a["level"],
+                    "rollup_balance": node.get("base", 0.0),
+                    "rollup_native": node.get("native_by_currency", {}),
+                }
+            )
+        results.append(row)
     return results
 
 
@@ -196,49 +836,70 @@ def balance_sheet(
     conn: sqlite3.Connection,
     as_of: date | None = None,
     display_currency: str | None = None,
+    fx_book: FxRateBook | None = None,
+    rollups: bool = False,
 ):
-    from core.services.fx_service import get_latest_rate
+    """Balance sheet at ``as_of`` converted to ``display_currency``.
+
+    With ``rollups`` the result also has a ``tree`` list: every asset,
+    liability and equity account with a non-zero subtree, in depth-first
+    order, carrying subtotals of its descendants.
+    """
     from core.services.settings_service import get_base_currency
 
     base_cur = get_base_currency(conn)
     quote_cur = display_currency or base_cur
 
-    bal_multi = account_balances_multi(conn, as_of=as_of)
+    buckets = currency_balances(conn, as_of=as_of)
     accounts = list_accounts(conn, active_only=True)
 
     acc_currencies = {
         int(a["id"]): a.get("currency", base_cur) or base_cur for a in accounts
     }
 
+    if fx_book is None:
+        needed = set(acc_currencies.values()) | {quote_cur}
+        needed |= {cur for b in buckets.values() for cur in b}
+        fx_book = FxRateBook(conn, pairs=[(base_cur, cur) for cur in needed])
+
     assets = []
     liabilities = []
     equity = []
+    node_values: dict[int, dict] = {}
     missing_rates: set[tuple[str, str]] = set()
+    # Convert with the rates in effect at as_of; dates before the first
+    # recorded rate fall back to the earliest one.
+    krw_quote_rate = fx_book.rate(base_cur, quote_cur, as_of, backfill=True)
 
     for a in accounts:
         aid = int(a["id"])
         t = a["type"]
-        b_data = bal_multi.get(aid, {"base": 0.0, "native": 0.0})
-        base_val = b_data["base"]
-        native_val = b_data["native"]
         native_cur = acc_currencies.get(aid, base_cur)
+        account_buckets = buckets.get(aid, {})
+        base_val = sum(b["base"] for b in account_buckets.values())
+        native_val = account_buckets.get(native_cur, {"native": 0.0})["native"]
 
         book_val = base_val
 
-        if native_cur == base_cur:
-            current_val_base = base_val
-        else:
-            current_rate = get_latest_rate(conn, base_cur, native_cur)
+        # Each currency bucket is converted with its own rate.
+        current_val_base = 0.0
+        for cur, bucket in account_buckets.items():
+            if cur == base_cur:
+                current_val_base += bucket["base"]
+                continue
+            current_rate = fx_book.rate(base_cur, cur, as_of, backfill=True)
             if current_rate is None:
-                missing_rates.add((base_cur, native_cur))
-                current_val_base = base_val
+                missing_rates.add((base_cur, cur))
+                current_val_base += bucket["base"]
             else:
-                current_val_base = native_val * current_rate
+                current_val_base += bucket["native"] * current_rate
+        has_balance = abs(base_val) > 1e-9 or any(
+            abs(b["native"]) > 1e-9 for b in account_buckets.values()
+        )
 
         if quote_cur == base_cur:
             disp_val = current_val_base
         else:
-            krw_quote_rate = get_latest_rate(conn, base_cur, quote_cur)
             if krw_quote_rate is None or krw_quote_rate == 0:
                 missing_rates.add((base_cur, quote_cur))
                 disp_val = current_val_base
@@ -250,23 +911,38 @@ def balance_sheet(
             "name": a["name"],
             "currency": native_cur,
             "native_balance": native_val,
+            "currency_balances": {
+                cur: bucket["native"] for cur, bucket in account_buckets.items()
+            },
             "book_value_base": book_val,
             "current_value_base": current_val_base,
             "display_value": disp_val,
         }
 
+        if has_balance:
+            sign = -1.0 if t in ("LIABILITY", "EQUITY") else 1.0
+            node_values[aid] = {
+                "native_by_currency": {
+                    cur: sign * bucket["native"]
+                    for cur, bucket in account_buckets.items()
+                },
+                "book_value_base": sign * book_val,
+                "current_value_base": sign * current_val_base,
+                "display_value": sign * disp_val,
+            }
+
         if t == "ASSET":
-            if abs(base_val) > 1e-9 or abs(native_val) > 1e-9:
+            if has_balance:
                 assets.append(item)
         elif t == "LIABILITY":
             item.update(
                 {k: -v for k, v in item.items() if isinstance(v, float)}
             )  # Flip signs
-            if abs(base_val) > 1e-9 or abs(native_val) > 1e-9:
+            if has_balance:
                 liabilities.append(item)
         elif t == "EQUITY":
             item.update({k: -v for k, v in item.items() if isinstance(v, float)})
-            if abs(base_val) > 1e-9 or abs(native_val) > 1e-9:
+            if has_balance:
                 equity.append(item)
 
     total_assets_base = sum(i["current_value_base"] for i in assets)
@@ -277,7 +953,7 @@ def balance_sheet(
     total_liab_disp = sum(i["display_value"] for i in liabilities)
     total_eq_disp = sum(i["display_value"] for i in equity)
 
-    return {
+    result = {
         "assets": assets,
         "liabilities": liabilities,
         "equity": equity,
@@ -293,27 +969,106 @@ def balance_sheet(
         "base_currency": base_cur,
         "missing_rates": sorted(missing_rates),
     }
+    if rollups:
+        result["tree"] = _balance_sheet_tree(conn, accounts, node_values)
+    return result
+
+
+def _balance_sheet_tree(
+    conn: sqlite3.Connection,
+    accounts: list[dict],
+    node_values: dict[int, dict],
+) -> list[dict]:
+    totals = rollup_values(account_ancestors(conn), node_values)
+
+    by_id = {int(a["id"]): a for a in accounts}
+    children: dict[int | None, list[dict]] = {}
+    for a in accounts:
+        if a["type"] not in ("ASSET", "LIABILITY", "EQUITY"):
+            continue
+        parent_id = a["parent_id"] if a["parent_id"] in by_id else None
+        children.setdefault(parent_id, []).append(a)
+
+    tree = []
+    type_order = {"ASSET": 0, "LIABILITY": 1, "EQUITY": 2}
+    stack = sorted(
+        children.get(None, []), key=lambda a: (type_order[a["type"]], a["id"])
+    )[::-1]
+    while stack:
+        a = stack.pop()
+        aid = int(a["id"])
+        node = totals.get(aid)
+        if node is None:
+            # No descendant carries a balance.
+            continue
+        tree.append(
+            {
+                "id": aid,
+                "name": a["name"],
+                "type": a["type"],
+                "parent_id": a["parent_id"],
+                "level": a["level"],
+                "currency": a["currency"],
+                "is_leaf": aid not in children,
+                "native_by_currency": node["native_by_currency"],
+                "book_value_base": node["book_value_base"],
+                "current_value_base": node["current_value_base"],
+                "display_value": node["display_value"],
+            }
+        )
+        stack.extend(sorted(children.get(aid, []), key=lambda c: c["id"])[::-1])
+    return tree
 
 
 def income_statement(conn: sqlite3.Connection, start: date, end: date):
-    sql = """
-        SELECT a.type AS type, a.name AS account,
-               SUM(jl.debit - jl.credit) AS raw_balance
-        FROM journal_lines jl
-        JOIN journal_entries je ON je.id = jl.entry_id
-        JOIN accounts a ON a.id = jl.account_id
-        WHERE je.entry_date >= ? AND je.entry_date <= ?
-          AND a.type IN ('INCOME', 'EXPENSE')
-        GROUP BY a.type, a.name
-        ORDER BY a.type, a.name
+    """Income and expense per account between ``start`` and ``end``.
+
+    Closed years inside the range are read from their stored closing
+    results; only the remaining dates are scanned. Closing entries and their
+    reversals are never counted.
     """
-    rows = conn.execute(
-        sql,
-        (
-            start.isoformat() if isinstance(start, date) else start,
-            end.isoformat() if isinstance(end, date) else end,
-        ),
-    ).fetchall()
+    from core.services.period_service import CLOSING_SOURCES, split_closed_range
+
+    closed_ids, open_ranges = split_closed_range(conn, start, end)
+    parts: list[str] = []
+    params: list[object] = []
+    if closed_ids:
+        parts.append(
+            f"""
+            SELECT a.type, a.name AS account, cb.raw_balance AS amount
+            FROM closing_balances cb
+            JOIN accounts a ON a.id = cb.account_id
+            WHERE cb.closed_period_id IN ({", ".join("?" for _ in closed_ids)})
+            """
+        )
+        params.extend(closed_ids)
+    if open_ranges:
+        ranges = " OR ".join("je.entry_date BETWEEN ? AND ?" for _ in open_ranges)
+        parts.append(
+            f"""
+            SELECT a.type, a.name AS account, jl.signed_base AS amount
+            FROM journal_entries je
+            JOIN journal_lines jl ON jl.entry_id = je.id
+            JOIN accounts a ON a.id = jl.account_id
+            WHERE ({ranges})
+              AND je.source NOT IN ({", ".join("?" for _ in CLOSING_SOURCES)})
+              AND a.type IN ('INCOME', 'EXPENSE')
+            """
+        )
+        params.extend(day for r in open_ranges for day in r)
+        params.extend(CLOSING_SOURCES)
+
+    rows = []
+    if parts:
+        rows = conn.execute(
+            f"""
+            SELECT type, account, SUM(amount) AS raw_balance
+            FROM ({" UNION ALL ".join(parts)})
+            GROUP BY type, account
+            ORDER BY type, account
+            """,
+            params,
+        ).fetchall()
 
     income = []
     expense = []
@@ -337,67 +1092,83 @@ def income_statement(conn: sqlite3.Connection, start: date, end: date):
     }
 
 
-def monthly_cashflow(conn: sqlite3.Connection, year: int):
-    """Return monthly cashflow for cash-equivalent accounts."""
-    cash_name_patterns = [
-        "%현금%",
-        "%보통예금%",
-        "%정기예금%",
-        "%cash%",
-        "%checking%",
-        "%savings%",
-    ]
-    name_clauses = " OR ".join(
-        "LOWER(a.name) LIKE LOWER(?)" for _ in range(len(cash_name_patterns))
-    )
-
-    start_date = f"{year}-01-01"
-    end_date = f"{year}-12-31"
-
-    base_params = list(cash_name_patterns)
+def monthly_cash_balances(
+    conn: sqlite3.Connection, start_year: int, end_year: int | None = None
+) -> list[dict]:
+    """Monthly opening, change and ending balance per cash-equivalent account.
 
-    opening_sql = f"""
-        WITH cash_accounts AS (
-            SELECT a.id
-            FROM accounts a
-            WHERE a.is_active = 1
-              AND ({name_clauses})
-        )
-        SELECT COALESCE(SUM(jl.debit - jl.credit), 0) AS opening_balance
-        FROM journal_lines jl
-        JOIN journal_entries je ON je.id = jl.entry_id
-        WHERE jl.account_id IN (SELECT id FROM cash_accounts)
-          AND je.entry_date < ?
+    Covers every month from January of ``start_year`` to December of
+    ``end_year`` (default: the same year) in one query. Month-end balances are
+    read from the balance checkpoints, so no journal lines are scanned;
+    months without activity carry the previous balance.
     """
-
-    monthly_sql = f"""
-        WITH cash_accounts AS (
-            SELECT a.id
+    end_year = start_year if end_year is None else end_year
+    sql = """
+        WITH RECURSIVE months (period) AS (
+            SELECT ?
+            UNION ALL
+            SELECT strftime('%Y-%m', period || '-01', '+1 month')
+            FROM months
+            WHERE period < ?
+        ),
+        balances AS (
+            SELECT a.id AS account_id, a.name AS account, m.period,
+                   COALESCE((
+                       SELECT SUM(base_balance)
+                       FROM (
+                           SELECT cp.currency, MAX(cp.period), cp.base_balance
+                           FROM account_balance_checkpoints cp
+                           WHERE cp.account_id = a.id AND cp.period <= m.period
+                           GROUP BY cp.currency
+                       )
+                   ), 0.0) AS ending_balance
             FROM accounts a
-            WHERE a.is_active = 1
-              AND ({name_clauses})
+            CROSS JOIN months m
+            WHERE a.is_cash_equivalent = 1 AND a.is_active = 1
+              AND a.allow_posting = 1
         )
-        SELECT strftime('%m', je.entry_date) AS month,
-               SUM(jl.debit - jl.credit) AS net_change
-        FROM journal_lines jl
-        JOIN journal_entries je ON je.id = jl.entry_id
-        WHERE jl.account_id IN (SELECT id FROM cash_accounts)
-          AND je.entry_date >= ?
-          AND je.entry_date <= ?
-        GROUP BY strftime('%m', je.entry_date)
-        ORDER BY strftime('%m', je.entry_date)
+        SELECT account_id, account, period AS month, opening_balance,
+               ending_balance - opening_balance AS net_change, ending_balance
+        FROM (
+            SELECT b.*,
+                   LAG(ending_balance) OVER (
+                       PARTITION BY account_id ORDER BY period
+                   ) AS opening_balance
+            FROM balances b
+        )
+        WHERE period >= ?
+        ORDER BY account, account_id, period
     """
+    # Start one month early so the first month has an opening balance.
+    first = f"{start_year - 1}-12"
+    rows = conn.execute(sql, (first, f"{end_year}-12", f"{start_year}-01")).fetchall()
+    return [
+        {
+            "account_id": r["account_id"],
+            "account": r["account"],
+            "month": r["month"],
+            "opening_balance": float(r["opening_balance"]),
+            "net_change": float(r["net_change"]),
+            "ending_balance": float(r["ending_balance"]),
+        }
+        for r in rows
+    ]
 
-    opening_balance = float(
-        conn.execute(opening_sql, base_params + [start_date]).fetchone()[0] or 0.0
-    )
-    rows = conn.execute(monthly_sql, base_params + [start_date, end_date]).fetchall()
-    monthly_map = {int(r["month"]): float(r["net_change"] or 0.0) for r in rows}
+
+def monthly_cashflow(conn: sqlite3.Connection, year: int):
+    """Return monthly cashflow summed over cash-equivalent accounts."""
+    changes = dict.fromkeys(range(1, 13), 0.0)
+    opening_balance = 0.0
+    for row in monthly_cash_balances(conn, year):
+        month = int(row["month"][5:])
+        changes[month] += row["net_change"]
+        if month == 1:
+            opening_balance += row["opening_balance"]
 
     results = []
     running_balance = opening_balance
     for month in range(1, 13):
-        net_change = monthly_map.get(month, 0.0)
+        net_change = changes[month]
         running_balance += net_change
         results.append(
             {
@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import sqlite3
+from datetime import date
+
+from core.models import JournalEntryInput, JournalLine
+from core.services.ledger_service import create_journal_entry
+
+# Entries that only move results between periods; P&L reports skip them.
+CLOSING_SOURCES = ("closing", "closing_reversal")
+
+
+def _date_str(value: date | str) -> str:
+    return value.isoformat() if isinstance(value, date) else str(value)
+
+
+def list_closed_periods(
+    conn: sqlite3.Connection, include_reopened: bool = False
+) -> list[dict]:
+    query = """
+        SELECT cp.*, a.name AS equity_account
+        FROM closed_periods cp
+        JOIN accounts a ON a.id = cp.equity_account_id
+    """
+    if not include_reopened:
+        query += " WHERE cp.reopened_at IS NULL"
+    query += " ORDER BY cp.period DESC, cp.id DESC"
+    return [dict(r) for r in conn.execute(query).fetchall()]
+
+
+def split_closed_range(
+    conn: sqlite3.Connection, start: date | str, end: date | str
+) -> tuple[list[int], list[tuple[str, str]]]:
+    """Split ``start..end`` into closed periods and the date ranges left open.
+
+    Returns the ids of closed periods lying entirely inside the range (their
+    results are in ``closing_balances``) and the remaining (start, end) date
+    ranges that still have to be read from journal lines.
+    """
+    start_str, end_str = _date_str(start), _date_str(end)
+    rows = conn.execute(
+        """
+        SELECT id, start_date, end_date FROM closed_periods
+        WHERE reopened_at IS NULL AND start_date >= ? AND end_date <= ?
+        ORDER BY start_date
+        """,
+        (start_str, end_str),
+    ).fetchall()
+
+    closed_ids: list[int] = []
+    open_ranges: list[tuple[str, str]] = []
+    cursor = start_str
+    for r in rows:
+        if cursor < r["start_date"]:
+            day_before = date.fromordinal(
+                date.fromisoformat(r["start_date"]).toordinal() - 1
+            )
+            open_ranges.append((cursor, day_before.isoformat()))
+        closed_ids.append(int(r["id"]))
+        cursor = date.fromordinal(
+            date.fromisoformat(r["end_date"]).toordinal() + 1
+        ).isoformat()
+    if cursor <= end_str:
+        open_ranges.append((cursor, end_str))
+    return closed_ids, open_ranges
+
+
+def close_year(conn: sqlite3.Connection, year: int, equity_account_id: int) -> dict:
+    """Close a calendar year into ``equity_account_id``.
+
+    Posts a closing entry on 12/31 that zeroes every income and expense
+    account's balance for the year against the equity account, stores the
+    per-account results in ``closing_balances`` and marks the year closed, so
+    later postings dated inside it are rejected.
+    """
+    period = f"{year:04d}"
+    start, end = f"{period}-01-01", f"{period}-12-31"
+
+    if conn.execute(
+        "SELECT 1 FROM closed_periods WHERE period = ? AND reopened_at IS NULL",
+        (period,),
+    ).fetchone():
+        raise ValueError(f"{period}년은 이미 마감되었습니다.")
+    equity = conn.execute(
+        "SELECT type, allow_posting FROM accounts WHERE id = ?",
+        (equity_account_id,),
+    ).fetchone()
+    if equity is None or equity["type"] != "EQUITY" or not equity["allow_posting"]:
+        raise ValueError("마감 대상 계정은 전기 가능한 자본 계정이어야 합니다.")
+
+    from core.services.settings_service import get_base_currency
+
+    base_cur = get_base_currency(conn)
+    # One closing line per account and currency bucket, so native amounts of
+    # different currencies are never added together.
+    placeholders = ", ".join("?" for _ in CLOSING_SOURCES)
+    rows = conn.execute(
+        f"""
+        SELECT jl.account_id,
+               CASE WHEN jl.native_amount IS NOT NULL
+                    THEN COALESCE(jl.native_currency, ?) ELSE ? END AS currency,
+               SUM(jl.signed_base) AS raw_balance,
+               SUM(jl.signed_native) AS native_balance
+        FROM journal_entries je
+        JOIN journal_lines jl ON jl.entry_id = je.id
+        JOIN accounts a ON a.id = jl.account_id
+        WHERE je.entry_date >= ? AND je.entry_date <= ?
+          AND je.source NOT IN ({placeholders})
+          AND a.type IN ('INCOME', 'EXPENSE')
+        GROUP BY jl.account_id, 2
+        ORDER BY jl.account_id, 2
+        """,
+        (base_cur, base_cur, start, end, *CLOSING_SOURCES),
+    ).fetchall()
+
+    lines: list[JournalLine] = []
+    account_results: dict[int, float] = {}
+    for r in rows:
+        raw = round(float(r["raw_balance"] or 0.0), 6)
+        if raw == 0:
+            continue
+        account_id = int(r["account_id"])
+        account_results[account_id] = account_results.get(account_id, 0.0) + raw
+        native = {}
+        currency = r["currency"]
+        if currency != base_cur and r["native_balance"]:
+            native_amount = abs(float(r["native_balance"]))
+            native = {
+                "native_amount": native_amount,
+                "native_currency": currency,
+                "fx_rate": abs(raw) / native_amount,
+            }
+        lines.append(
+            JournalLine(
+                account_id=account_id,
+                debit=-raw if raw < 0 else 0.0,
+                credit=raw if raw > 0 else 0.0,
+                memo=f"{period}년 결산 마감",
+                **native,
+            )
+        )
+    results = [
+        (account_id, round(raw, 6)) for account_id, raw in account_results.items()
+    ]
+
+    # Expenses are debit balances, income credit balances: a profit leaves
+    # a negative total, which is credited to equity.
+    total = sum(raw for _, raw in results)
+    closing_entry_id = None
+    if lines:
+        if abs(total) >= 0.005:
+            lines.append(
+                JournalLine(
+                    account_id=equity_account_id,
+                    debit=total if total > 0 else 0.0,
+                    credit=-total if total < 0 else 0.0,
+                    memo=f"{period}년 당기순손익",
+                )
+            )
+        closing_entry_id = create_journal_entry(
+            conn,
+            JournalEntryInput(
+                entry_date=date(year, 12, 31),
+                description=f"{period}년 결산 마감",
+                lines=lines,
+                source="closing",
+            ),
+        )
+
+    cursor = conn.execute(
+        """
+        INSERT INTO closed_periods
+            (period, start_date, end_date, equity_account_id, closing_entry_id, net_income)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        (period, start, end, equity_account_id, closing_entry_id, -total),
+    )
+    closed_period_id = cursor.lastrowid
+    conn.executemany(
+        """
+        INSERT INTO closing_balances (closed_period_id, account_id, raw_balance)
+        VALUES (?, ?, ?)
+        """,
+        [(closed_period_id, account_id, raw) for account_id, raw in results],
+    )
+    return {
+        "id": closed_period_id,
+        "period": period,
+        "closing_entry_id": closing_entry_id,
+        "net_income": -total,
+    }
+
+
+def reopen_year(conn: sqlite3.Connection, year: int) -> int | None:
+    """Reopen a closed year by posting the reversal of its closing entry.
+
+    Returns the reversal entry id (None when the close had no entry).
+    """
+    period = f"{year:04d}"
+    closed = conn.execute(
+        """
+        SELECT id, closing_entry_id FROM closed_periods
+        WHERE period = ? AND reopened_at IS NULL
+        """,
+        (period,),
+    ).fetchone()
+    if closed is None:
+        raise ValueError(f"{period}년은 마감되지 않았습니다.")
+
+    # Reopen first so the reversal can be posted into the period.
+    conn.execute(
+        "UPDATE closed_periods SET reopened_at = CURRENT_TIMESTAMP WHERE id = ?",
+        (closed["id"],),
+    )
+    if closed["closing_entry_id"] is None:
+        return None
+
+    rows = conn.execute(
+        """
+        SELECT account_id, debit, credit, native_amount, native_currency, fx_rate
+        FROM journal_lines WHERE entry_id = ? ORDER BY id
+        """,
+        (closed["closing_entry_id"],),
+    ).fetchall()
+    reversal_id = create_journal_entry(
+        conn,
+        JournalEntryInput(
+            entry_date=date(year, 12, 31),
+            description=f"{period}년 결산 마감 취소",
+            lines=[
+                JournalLine(
+                    account_id=r["account_id"],
+                    debit=r["credit"],
+                    credit=r["debit"],
+                    memo=f"{period}년 결산 마감 취소",
+                    native_amount=r["native_amount"],
+                    native_currency=r["native_currency"],
+                    fx_rate=r["fx_rate"],
+                )
+                for r in rows
+            ],
+            source="closing_reversal",
+        ),
+    )
+    conn.execute(
+        "UPDATE closed_periods SET reversal_entry_id = ? WHERE id = ?",
+        (reversal_id, closed["id"]),
+    )
+    return reversal_id
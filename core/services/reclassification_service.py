@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+from datetime import date
+
+from core.services.ledger_service import _search_match_query
+
+_NOT_POSTABLE = "상위(집계) 계정에는 직접 분개할 수 없습니다. 하위 계정을 선택하세요."
+
+
+def _date_str(value: date | str) -> str:
+    return value.isoformat() if isinstance(value, date) else str(value)
+
+
+def _check_accounts(
+    conn: sqlite3.Connection, from_account_id: int, to_account_id: int
+) -> None:
+    from core.services.settings_service import get_base_currency
+
+    if from_account_id == to_account_id:
+        raise ValueError("원 계정과 대상 계정이 같습니다.")
+    rows = {
+        int(r["id"]): r
+        for r in conn.execute(
+            "SELECT id, allow_posting, currency FROM accounts WHERE id IN (?, ?)",
+            (from_account_id, to_account_id),
+        ).fetchall()
+    }
+    if from_account_id not in rows or to_account_id not in rows:
+        raise ValueError("계정을 찾을 수 없습니다.")
+    if not rows[to_account_id]["allow_posting"]:
+        raise ValueError(_NOT_POSTABLE)
+    base_cur = get_base_currency(conn)
+    if (rows[from_account_id]["currency"] or base_cur) != (
+        rows[to_account_id]["currency"] or base_cur
+    ):
+        raise ValueError("통화가 다른 계정으로는 재분류할 수 없습니다.")
+
+
+def _collect_lines(conn: sqlite3.Connection, filters: list[str], params: list) -> None:
+    """Fill temp.reclassify_lines with the ids of the matching lines."""
+    conn.execute(
+        "CREATE TEMP TABLE IF NOT EXISTS reclassify_lines (line_id INTEGER PRIMARY KEY)"
+    )
+    conn.execute("DELETE FROM temp.reclassify_lines")
+    conn.execute(
+        f"""
+        INSERT INTO temp.reclassify_lines (line_id)
+        SELECT jl.id
+        FROM journal_lines jl
+        JOIN journal_entries je ON je.id = jl.entry_id
+        WHERE {" AND ".join(filters)}
+        """,
+        params,
+    )
+
+
+def _summary(conn: sqlite3.Connection) -> dict:
+    row = conn.execute(
+        """
+        SELECT COUNT(*) AS line_count, COUNT(DISTINCT jl.entry_id) AS entry_count,
+               COALESCE(SUM(jl.signed_base), 0.0) AS base_amount,
+               COALESCE(SUM(EXISTS (
+                   SELECT 1 FROM closed_periods cp
+                   WHERE cp.reopened_at IS NULL
+                     AND jl.entry_date BETWEEN cp.start_date AND cp.end_date
+               )), 0) AS closed_count
+        FROM temp.reclassify_lines r
+        JOIN journal_lines jl ON jl.id = r.line_id
+        """
+    ).fetchone()
+    return {
+        "line_count": int(row["line_count"]),
+        "entry_count": int(row["entry_count"]),
+        "base_amount": float(row["base_amount"]),
+        "closed_count": int(row["closed_count"]),
+    }
+
+
+def _check_open_periods(summary: dict) -> None:
+    if summary["closed_count"]:
+        raise ValueError(
+            f"마감된 기간의 분개 {summary['closed_count']}건은 재분류할 수 없습니다."
+            " 먼저 마감을 취소하세요."
+        )
+
+
+def _move_lines(
+    conn: sqlite3.Connection, from_account_id: int, to_account_id: int
+) -> None:
+    """Move the lines in temp.reclassify_lines to ``to_account_id``.
+
+    ``account_totals``, the balance checkpoints, the integrity queue and the
+    search index follow from their journal_lines triggers; the LedgerEngine
+    sees the bumped edit version and reloads on its next refresh.
+    """
+    conn.execute(
+        """
+        UPDATE journal_lines SET account_id = ?
+        WHERE id IN (SELECT line_id FROM temp.reclassify_lines)
+        """,
+        (to_account_id,),
+    )
+
+
+def reclassify_lines(
+    conn: sqlite3.Connection,
+    from_account_id: int,
+    to_account_id: int,
+    start: date | str | None = None,
+    end: date | str | None = None,
+    description_like: str | None = None,
+    memo_like: str | None = None,
+    match: str | None = None,
+    dry_run: bool = False,
+) -> dict:
+    """Move every matching line of ``from_account_id`` to ``to_account_id``.
+
+    Lines are matched by date range, SQL LIKE patterns on the entry
+    description and line memo, and ``match`` (same syntax as the journal
+    search box); all given filters must hold. The move is a single UPDATE
+    inside one savepoint, recorded in ``reclassifications`` for
+    ``undo_reclassification``. With ``dry_run`` nothing is changed and only
+    the counts are returned. Lines in closed periods cannot be moved.
+    """
+    _check_accounts(conn, from_account_id, to_account_id)
+
+    criteria: dict = {}
+    filters, params = ["jl.account_id = ?"], [from_account_id]
+    if start is not None:
+        criteria["start"] = _date_str(start)
+        filters.append("jl.entry_date >= ?")
+        params.append(criteria["start"])
+    if end is not None:
+        criteria["end"] = _date_str(end)
+        filters.append("jl.entry_date <= ?")
+        params.append(criteria["end"])
+    if description_like:
+        criteria["description_like"] = description_like
+        filters.append("je.description LIKE ?")
+        params.append(description_like)
+    if memo_like:
+        criteria["memo_like"] = memo_like
+        filters.append("jl.memo LIKE ?")
+        params.append(memo_like)
+    if match and _search_match_query(match):
+        criteria["match"] = match
+        filters.append(
+            "jl.id IN (SELECT rowid FROM journal_search WHERE journal_search MATCH ?)"
+        )
+        params.append(_search_match_query(match))
+
+    conn.execute("SAVEPOINT reclassify")
+    try:
+        _collect_lines(conn, filters, params)
+        summary = _summary(conn)
+        result = {"reclassification_id": None, "dry_run": dry_run, **summary}
+        if not dry_run and summary["line_count"]:
+            _check_open_periods(summary)
+            cur = conn.execute(
+                """
+                INSERT INTO reclassifications
+                    (from_account_id, to_account_id, criteria, line_count, base_amount)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (
+                    from_account_id,
+                    to_account_id,
+                    json.dumps(criteria, ensure_ascii=False),
+                    summary["line_count"],
+                    summary["base_amount"],
+                ),
+            )
+            result["reclassification_id"] = int(cur.lastrowid)
+            conn.execute(
+                """
+                INSERT INTO reclassification_lines (reclassification_id, line_id)
+                SELECT ?, line_id FROM temp.reclassify_lines
+                """,
+                (result["reclassification_id"],),
+            )
+            _move_lines(conn, from_account_id, to_account_id)
+        conn.execute("DELETE FROM temp.reclassify_lines")
+    except Exception:
+        conn.execute("ROLLBACK TO reclassify")
+        conn.execute("RELEASE reclassify")
+        raise
+    conn.execute("RELEASE reclassify")
+    return result
+
+
+def undo_reclassification(conn: sqlite3.Connection, reclassification_id: int) -> int:
+    """Move the lines of a reclassification back. Returns how many moved.
+
+    Lines since deleted or moved elsewhere are left alone.
+    """
+    row = conn.execute(
+        "SELECT * FROM reclassifications WHERE id = ?", (reclassification_id,)
+    ).fetchone()
+    if row is None:
+        raise ValueError("재분류 내역을 찾을 수 없습니다.")
+    if row["undone_at"] is not None:
+        raise ValueError("이미 취소된 재분류입니다.")
+    _check_accounts(conn, int(row["to_account_id"]), int(row["from_account_id"]))
+
+    conn.execute("SAVEPOINT reclassify")
+    try:
+        _collect_lines(
+            conn,
+            [
+                "jl.account_id = ?",
+                "jl.id IN (SELECT line_id FROM reclassification_lines"
+                " WHERE reclassification_id = ?)",
+            ],
+            [row["to_account_id"], reclassification_id],
+        )
+        summary = _summary(conn)
+        _check_open_periods(summary)
+        _move_lines(conn, int(row["to_account_id"]), int(row["from_account_id"]))
+        conn.execute(
+            "UPDATE reclassifications SET undone_at = CURRENT_TIMESTAMP WHERE id = ?",
+            (reclassification_id,),
+        )
+        conn.execute("DELETE FROM temp.reclassify_lines")
+    except Exception:
+        conn.execute("ROLLBACK TO reclassify")
+        conn.execute("RELEASE reclassify")
+        raise
+    conn.execute("RELEASE reclassify")
+    return summary["line_count"]
+
+
+def list_reclassifications(conn: sqlite3.Connection, limit: int = 20) -> list[dict]:
+    rows = conn.execute(
+        """
+        SELECT r.*, fa.name AS from_account, ta.name AS to_account
+        FROM reclassifications r
+        JOIN accounts fa ON fa.id = r.from_account_id
+        JOIN accounts ta ON ta.id = r.to_account_id
+        ORDER BY r.id DESC
+        LIMIT ?
+        """,
+        (limit,),
+    ).fetchall()
+    return [dict(r) for r in rows]
@@ -0,0 +1,356 @@
+from __future__ import annotations
+
+import sqlite3
+from bisect import bisect_right
+from datetime import date, timedelta
+
+import numpy as np
+
+from core.services.fx_service import FxRateBook
+from core.services.ledger_engine import LedgerEngine
+
+FREQUENCIES = ("D", "W", "M", "Q", "Y")
+
+
+def _month_end(year: int, month: int) -> date:
+    if month == 12:
+        return date(year, 12, 31)
+    return date(year, month + 1, 1) - timedelta(days=1)
+
+
+def period_ends(start: date, end: date, freq: str = "M") -> list[date]:
+    """Return the last day of each period from start to end.
+
+    ``freq`` is one of D (daily), W (ISO weeks ending Sunday), M, Q or Y.
+    The final period is cut off at ``end``.
+    """
+    if freq not in FREQUENCIES:
+        raise ValueError(f"Unknown frequency: {freq}")
+    if end < start:
+        return []
+
+    if freq == "D":
+        return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    if freq == "W":
+        first = start + timedelta(days=6 - start.weekday())
+        dates = [first + timedelta(weeks=i) for i in range((end - first).days // 7 + 1)]
+    else:
+        step = {"M": 1, "Q": 3, "Y": 12}[freq]
+        # Align to the calendar period that contains start.
+        month = ((start.month - 1) // step) * step + step
+        year = start.year
+        dates = []
+        while True:
+            period_end = _month_end(year, month)
+            dates.append(period_end)
+            if period_end >= end:
+                break
+            month += step
+            if month > 12:
+                year, month = year + 1, month - 12
+
+    dates = [d for d in dates if d < end]
+    dates.append(end)
+    return dates
+
+
+def _load_valuations(conn: sqlite3.Connection) -> dict[int, dict]:
+    """Valuation history of every asset, grouped by linked account."""
+    rows = conn.execute(
+        """
+        SELECT a.id AS asset_id, a.linked_account_id, a.disposal_date,
+               v.as_of_date, v.value_native, v.currency
+        FROM asset_valuations v
+        JOIN assets a ON a.id = v.asset_id
+        ORDER BY a.id, v.as_of_date, v.id
+        """
+    ).fetchall()
+    by_account: dict[int, dict] = {}
+    for r in rows:
+        assets = by_account.setdefault(int(r["linked_account_id"]), {})
+        asset = assets.setdefault(
+            int(r["asset_id"]),
+            {"disposal_date": r["disposal_date"], "dates": [], "values": []},
+        )
+        asset["dates"].append(str(r["as_of_date"])[:10])
+        asset["values"].append((float(r["value_native"]), str(r["currency"])))
+    return by_account
+
+
+def net_worth_series(
+    conn: sqlite3.Connection,
+    start: date,
+    end: date,
+    freq: str = "M",
+    display_currency: str | None = None,
+    fx_book: FxRateBook | None = None,
+    engine: LedgerEngine | None = None,
+) -> dict:
+    """Assets, liabilities and net worth at the end of every period.
+
+    Balances for all period ends come from one pass over the journal (a
+    ``LedgerEngine`` balance matrix); foreign-currency accounts are converted
+    with the rate in effect at each period end. ``valued_*`` figures replace
+    an asset account's ledger value with the latest ``asset_valuations`` of
+    its linked, not yet disposed assets as of that date, when there are any.
+    """
+    from core.services.settings_service import get_base_currency
+
+    base_cur = get_base_currency(conn)
+    quote_cur = display_currency or base_cur
+    dates = period_ends(start, end, freq)
+    if not dates:
+        return {
+            "base_currency": base_cur,
+            "display_currency": quote_cur,
+            "points": [],
+            "missing_rates": [],
+        }
+
+    if engine is None:
+        engine = LedgerEngine(conn)
+    else:
+        engine.refresh()
+    if fx_book is None:
+        fx_book = FxRateBook(conn)
+
+    account_rows = conn.execute(
+        """
+        SELECT id, type, currency FROM accounts
+        WHERE is_active = 1 AND type IN ('ASSET', 'LIABILITY')
+        """
+    ).fetchall()
+    accounts = {int(r["id"]): r for r in account_rows}
+
+    missing_rates: set[tuple[str, str]] = set()
+    rate_cache: dict[str, np.ndarray] = {}
+
+    def rates(currency: str) -> np.ndarray:
+        if currency not in rate_cache:
+            daily = fx_book.daily_series(
+                base_cur, currency, dates[0], dates[-1], backfill=True
+            )
+            offsets = [(d - dates[0]).days for d in dates]
+            series = [daily[i] for i in offsets]
+            if any(r is None for r in series):
+                missing_rates.add((base_cur, currency))
+            rate_cache[currency] = np.array(
+                [np.nan if r is None else r for r in series], dtype=np.float64
+            )
+        return rate_cache[currency]
+
+    account_ids, base, native, _ = engine.balance_matrix(dates)
+    assets = np.zeros(len(dates))
+    liabilities = np.zeros(len(dates))
+    ledger_values: dict[int, np.ndarray] = {}
+    for row, account_id in enumerate(account_ids):
+        account = accounts.get(int(account_id))
+        if account is None:
+            continue
+        currency = account["currency"] or base_cur
+        if currency == base_cur:
+            value = base[row]
+        else:
+            # Fall back to the booked base amount where no rate exists.
+            value = np.where(
+                np.isnan(rates(currency)), base[row], native[row] * rates(currency)
+            )
+        if account["type"] == "ASSET":
+            assets += value
+            ledger_values[int(account_id)] = value
+        else:
+            liabilities -= value
+
+    valued_assets = assets.copy()
+    day_keys = [d.isoformat() for d in dates]
+    for account_id, linked_assets in _load_valuations(conn).items():
+        account = accounts.get(account_id)
+        if account is None or account["type"] != "ASSET":
+            continue
+        overlay = np.zeros(len(dates))
+        has_value = np.zeros(len(dates), dtype=bool)
+        for asset in linked_assets.values():
+            disposal = asset["disposal_date"]
+            for col, key in enumerate(day_keys):
+                if disposal and str(disposal)[:10] <= key:
+                    continue
+                idx = bisect_right(asset["dates"], key)
+                if not idx:
+                    continue
+                value_native, currency = asset["values"][idx - 1]
+                rate = 1.0 if currency == base_cur else rates(currency)[col]
+                if np.isnan(rate):
+                    continue
+                overlay[col] += value_native * rate
+                has_value[col] = True
+        ledger = ledger_values.get(account_id, np.zeros(len(dates)))
+        valued_assets += np.where(has_value, overlay - ledger, 0.0)
+
+    if quote_cur == base_cur:
+        to_display = np.ones(len(dates))
+    else:
+        quote_rates = rates(quote_cur)
+        to_display = np.where(
+            np.isnan(quote_rates) | (quote_rates == 0), 1.0, 1.0 / quote_rates
+        )
+
+    points = []
+    for col, as_of in enumerate(dates):
+        net_worth = assets[col] - liabilities[col]
+        valued_net_worth = valued_assets[col] - liabilities[col]
+        points.append(
+            {
+                "date": as_of,
+                "assets_base": float(assets[col]),
+                "liabilities_base": float(liabilities[col]),
+                "net_worth_base": float(net_worth),
+                "valued_assets_base": float(valued_assets[col]),
+                "valued_net_worth_base": float(valued_net_worth),
+                "assets_disp": float(assets[col] * to_display[col]),
+                "liabilities_disp": float(liabilities[col] * to_display[col]),
+                "net_worth_disp": float(net_worth * to_display[col]),
+                "valued_assets_disp": float(valued_assets[col] * to_display[col]),
+                "valued_net_worth_disp": float(valued_net_worth * to_display[col]),
+            }
+        )
+
+    return {
+        "base_currency": base_cur,
+        "display_currency": quote_cur,
+        "points": points,
+        "missing_rates": sorted(missing_rates),
+    }
+
+
+# Period labels from calendar (or calendar_months) columns. All but "W" are
+# month-aligned and aggregate on journal_entries.period_id.
+_PERIOD_LABEL_SQL = {
+    "W": "printf('%04d-W%02d', iso_year, iso_week)",
+    "M": "printf('%04d-%02d', year, month)",
+    "Q": "printf('%04d-Q%d', year, quarter)",
+    "Y": "printf('%04d', year)",
+    "FY": "printf('FY%04d', fiscal_year)",
+}
+
+
+def income_statement_matrix(
+    conn: sqlite3.Connection, start: date, end: date, freq: str = "M"
+):
+    """Income and expense per account and period as a DataFrame.
+
+    One grouped aggregation over the range feeds an accounts x periods
+    pivot (``freq`` W, M, Q, Y or FY for the fiscal year). Periods come from
+    the calendar table, which must cover the range (``populate_calendar``
+    fills it at startup); month-aligned ones group on
+    ``journal_entries.period_id``. Rows are income accounts (shown positive),
+    a total-income row, expense accounts, a total-expense row and a
+    net-profit row; ``kind`` tells them apart. A ``total`` column sums each
+    row across periods.
+    """
+    import pandas as pd
+
+    if freq not in _PERIOD_LABEL_SQL:
+        raise ValueError(f"Unknown frequency: {freq}")
+
+    from core.services.calendar_service import check_calendar_covers
+    from core.services.period_service import CLOSING_SOURCES, split_closed_range
+
+    label = _PERIOD_LABEL_SQL[freq]
+    check_calendar_covers(conn, start, end)
+    periods = [
+        r[0]
+        for r in conn.execute(
+            f"""
+            SELECT {label} AS period FROM calendar
+            WHERE date BETWEEN ? AND ?
+            GROUP BY period
+            ORDER BY MIN(date)
+            """,
+            (start.isoformat(), end.isoformat()),
+        ).fetchall()
+    ]
+    # Closed years keep yearly results, so only a yearly matrix can use them.
+    if freq == "Y":
+        closed_ids, open_ranges = split_closed_range(conn, start, end)
+    else:
+        closed_ids, open_ranges = [], [(start.isoformat(), end.isoformat())]
+
+    rows = []
+    if closed_ids:
+        rows += conn.execute(
+            f"""
+            SELECT a.id AS account_id, a.type, a.name AS account,
+                   cp.period, cb.raw_balance
+            FROM closing_balances cb
+            JOIN closed_periods cp ON cp.id = cb.closed_period_id
+            JOIN accounts a ON a.id = cb.account_id
+            WHERE cb.closed_period_id IN ({", ".join("?" for _ in closed_ids)})
+            """,
+            closed_ids,
+        ).fetchall()
+    if open_ranges:
+        ranges = " OR ".join("je.entry_date BETWEEN ? AND ?" for _ in open_ranges)
+        # Weeks cut across months, so they are the one bucket read from the
+        # daily calendar.
+        if freq == "W":
+            bucket = "c.week_id"
+            dimension = "JOIN calendar c ON c.date = je.entry_date"
+            lookup = "calendar WHERE week_id = t.bucket LIMIT 1"
+        else:
+            bucket = "je.period_id"
+            dimension = ""
+            lookup = "calendar_months WHERE period_id = t.bucket"
+        rows += conn.execute(
+            f"""
+            SELECT a.id AS account_id, a.type, a.name AS account,
+                   (SELECT {label} FROM {lookup}) AS period,
+                   SUM(t.raw_balance) AS raw_balance
+            FROM (
+                SELECT jl.account_id, {bucket} AS bucket,
+                       SUM(jl.signed_base) AS raw_balance
+                FROM journal_lines jl
+                JOIN journal_entries je ON je.id = jl.entry_id
+                {dimension}
+                WHERE ({ranges})
+                  AND je.source NOT IN ({", ".join("?" for _ in CLOSING_SOURCES)})
+                GROUP BY jl.account_id, bucket
+            ) t
+            JOIN accounts a ON a.id = t.account_id
+            WHERE a.type IN ('INCOME', 'EXPENSE')
+            GROUP BY a.id, period
+            """,
+            [*(day for r in open_ranges for day in r), *CLOSING_SOURCES],
+        ).fetchall()
+
+    columns = ["kind", "account_id", "account", *periods, "total"]
+    accounts: dict[int, dict] = {}
+    for r in rows:
+        account = accounts.setdefault(
+            int(r["account_id"]),
+            {
+                "kind": r["type"],
+                "account_id": int(r["account_id"]),
+                "account": r["account"],
+                **dict.fromkeys(periods, 0.0),
+            },
+        )
+        raw = float(r["raw_balance"] or 0.0)
+        account[r["period"]] += -raw if r["type"] == "INCOME" else raw
+
+    def section(kind: str, total_kind: str, label: str) -> list[dict]:
+        items = sorted(
+            (a for a in accounts.values() if a["kind"] == kind),
+            key=lambda a: a["account"],
+        )
+        total = {"kind": total_kind, "account_id": None, "account": label}
+        total.update({p: sum(a[p] for a in items) for p in periods})
+        return [*items, total]
+
+    income_rows = section("INCOME", "TOTAL_INCOME", "Total income")
+    expense_rows = section("EXPENSE", "TOTAL_EXPENSE", "Total expense")
+    net = {"kind": "NET_PROFIT", "account_id": None, "account": "Net profit"}
+    net.update({p: income_rows[-1][p] - expense_rows[-1][p] for p in periods})
+
+    df = pd.DataFrame([*income_rows, *expense_rows, net], columns=columns[:-1])
+    df["total"] = df[periods].sum(axis=1) if periods else 0.0
+    return df
@@ -40,3 +40,43 @@ def set_av_api_key(conn: sqlite3.Connection, api_key: str) -> None:
         "UPDATE app_settings SET alpha_vantage_api_key = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
         (api_key.strip(), settings["id"]),
     )
+
+
+AMOUNT_STORAGE_MODES = ("REAL", "MINOR")
+
+
+def get_amount_storage(conn: sqlite3.Connection) -> str:
+    """'REAL' (float amounts) or 'MINOR' (integer minor units are authoritative)."""
+    settings = get_settings(conn)
+    return settings.get("amount_storage") or "REAL"
+
+
+def set_amount_storage(conn: sqlite3.Connection, mode: str) -> None:
+    mode = mode.upper()
+    if mode not in AMOUNT_STORAGE_MODES:
+        raise ValueError(f"Unknown amount storage mode: {mode}")
+    settings = get_settings(conn)
+    conn.execute(
+        "UPDATE app_settings SET amount_storage = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+        (mode, settings["id"]),
+    )
+
+
+def get_fiscal_year_start_month(conn: sqlite3.Connection) -> int:
+    """Month (1-12) the household's fiscal year starts in."""
+    settings = get_settings(conn)
+    return int(settings.get("fiscal_year_start_month") or 1)
+
+
+def set_fiscal_year_start_month(conn: sqlite3.Connection, month: int) -> None:
+    from core.services.calendar_service import refresh_fiscal_periods
+
+    month = int(month)
+    if not 1 <= month <= 12:
+        raise ValueError(f"Invalid fiscal year start month: {month}")
+    settings = get_settings(conn)
+    conn.execute(
+        "UPDATE app_settings SET fiscal_year_start_month = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+        (month, settings["id"]),
+    )
+    refresh_fiscal_periods(conn, month)
@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import uuid
+from datetime import date
+
+from core.models import JournalEntryInput
+from core.money import minor_factor, minor_factor_sql
+
+# Raw loads insert into these with executemany; entry_key groups lines under
+# their header within a batch and is how errors are reported.
+STAGE_ENTRY_SQL = """
+    INSERT INTO journal_entries_staging
+        (batch_id, entry_key, entry_date, description, source)
+    VALUES (?, ?, ?, ?, ?)
+"""
+STAGE_LINE_SQL = """
+    INSERT INTO journal_lines_staging
+        (batch_id, entry_key, account_id, debit, credit, memo,
+         native_amount, native_currency, fx_rate)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_NOT_POSTABLE = "상위(집계) 계정에는 직접 분개할 수 없습니다. 하위 계정을 선택하세요."
+
+# Set-wise versions of the checks in ledger_service; each yields
+# (entry_key, error) for one batch (:batch) with amounts compared in
+# :factor units per currency unit.
+_CHECKS_SQL = (
+    """
+    SELECT l.entry_key, 'Missing entry header.'
+    FROM journal_lines_staging l
+    LEFT JOIN journal_entries_staging e
+      ON e.batch_id = l.batch_id AND e.entry_key = l.entry_key
+    WHERE l.batch_id = :batch AND e.entry_key IS NULL
+    """,
+    """
+    SELECT e.entry_key, 'A journal entry must have at least 2 lines.'
+    FROM journal_entries_staging e
+    LEFT JOIN journal_lines_staging l
+      ON l.batch_id = e.batch_id AND l.entry_key = e.entry_key
+    WHERE e.batch_id = :batch
+    GROUP BY e.entry_key
+    HAVING COUNT(l.id) < 2
+    """,
+    f"""
+    SELECT entry_key, error FROM (
+        SELECT l.entry_key,
+               CASE
+                   WHEN l.debit < 0 OR l.credit < 0
+                       THEN 'Debit/Credit cannot be negative.'
+                   WHEN l.debit > 0 AND l.credit > 0
+                       THEN 'A single line cannot have both debit and credit.'
+                   WHEN l.debit = 0 AND l.credit = 0
+                       THEN 'A line must have a debit or credit amount.'
+                   WHEN a.id IS NULL THEN 'Account not found.'
+                   WHEN a.allow_posting IS NOT 1 THEN '{_NOT_POSTABLE}'
+               END AS error
+        FROM journal_lines_staging l
+        LEFT JOIN accounts a ON a.id = l.account_id
+        WHERE l.batch_id = :batch
+        ORDER BY l.id
+    )
+    WHERE error IS NOT NULL
+    """,
+    """
+    SELECT entry_key,
+           printf('Unbalanced entry: debit=%.2f, credit=%.2f', SUM(debit), SUM(credit))
+    FROM journal_lines_staging
+    WHERE batch_id = :batch
+    GROUP BY entry_key
+    HAVING SUM(ROUND(MAX(debit, 0) * :factor)) != SUM(ROUND(MAX(credit, 0) * :factor))
+    """,
+    """
+    SELECT e.entry_key,
+           '마감된 기간(' || cp.period || ')에는 전표를 입력할 수 없습니다. 먼저 마감을 취소하세요.'
+    FROM journal_entries_staging e
+    JOIN closed_periods cp
+      ON cp.reopened_at IS NULL AND e.entry_date BETWEEN cp.start_date AND cp.end_date
+    WHERE e.batch_id = :batch
+    """,
+)
+
+
+def new_batch_id() -> str:
+    return uuid.uuid4().hex
+
+
+def stage_entries(
+    conn: sqlite3.Connection, batch_id: str, entries: list[JournalEntryInput]
+) -> None:
+    """Stage entries under their list index as ``entry_key``."""
+    conn.executemany(
+        STAGE_ENTRY_SQL,
+        [
+            (
+                batch_id,
+                key,
+                e.entry_date.isoformat()
+                if isinstance(e.entry_date, date)
+                else e.entry_date,
+                e.description,
+                e.source,
+            )
+            for key, e in enumerate(entries)
+        ],
+    )
+    conn.executemany(
+        STAGE_LINE_SQL,
+        [
+            (
+                batch_id,
+                key,
+                line.account_id,
+                float(line.debit),
+                float(line.credit),
+                line.memo,
+                line.native_amount,
+                line.native_currency,
+                line.fx_rate,
+            )
+            for key, e in enumerate(entries)
+            for line in e.lines
+        ],
+    )
+
+
+def _amount_settings(conn: sqlite3.Connection) -> tuple[str, bool]:
+    from core.services.settings_service import get_amount_storage, get_base_currency
+
+    return get_base_currency(conn), get_amount_storage(conn) == "MINOR"
+
+
+def validate_staged(conn: sqlite3.Connection, batch_id: str) -> list[dict]:
+    """Return ``[{"entry_key", "error"}]``, the first problem of each bad entry."""
+    base_cur, minor_mode = _amount_settings(conn)
+    params = {
+        "batch": batch_id,
+        "factor": minor_factor(base_cur) if minor_mode else 100,
+    }
+    errors: dict[int, str] = {}
+    for sql in _CHECKS_SQL:
+        for entry_key, error in conn.execute(sql, params).fetchall():
+            errors.setdefault(int(entry_key), error)
+    return [{"entry_key": key, "error": errors[key]} for key in sorted(errors)]
+
+
+def discard_batch(conn: sqlite3.Connection, batch_id: str) -> None:
+    conn.execute("DELETE FROM journal_lines_staging WHERE batch_id = ?", (batch_id,))
+    conn.execute("DELETE FROM journal_entries_staging WHERE batch_id = ?", (batch_id,))
+
+
+def load_staged(conn: sqlite3.Connection, batch_id: str, partial: bool = False) -> dict:
+    """Validate a staged batch set-wise and move it into the journal.
+
+    With any error the whole batch is rejected and left staged for
+    inspection, unless ``partial`` is set, in which case only the valid
+    entries are moved. Moved rows go in with two INSERT ... SELECT
+    statements. Returns ``{"entry_ids": {entry_key: entry_id}, "errors": [...]}``.
+    """
+    errors = validate_staged(conn, batch_id)
+    if errors and not partial:
+        return {"entry_ids": {}, "errors": errors}
+
+    base_cur, minor_mode = _amount_settings(conn)
+    native_factor = minor_factor_sql("COALESCE(l.native_currency, :base)")
+    # In minor-unit mode amounts are rounded to whole minor units on the way in.
+    if minor_mode:
+        debit = "ROUND(l.debit * :base_factor) / :base_factor"
+        credit = "ROUND(l.credit * :base_factor) / :base_factor"
+        native = f"ROUND(l.native_amount * {native_factor}) / {native_factor}"
+    else:
+        debit, credit, native = "l.debit", "l.credit", "l.native_amount"
+
+    conn.execute("SAVEPOINT journal_staging")
+    try:
+        conn.execute(
+            """
+            CREATE TEMP TABLE IF NOT EXISTS staging_entry_ids (
+                entry_key INTEGER PRIMARY KEY, entry_id INTEGER NOT NULL
+            )
+            """
+        )
+        conn.execute("DELETE FROM temp.staging_entry_ids")
+        row = conn.execute(
+            """
+            SELECT MAX(
+                COALESCE((SELECT MAX(id) FROM journal_entries), 0),
+                COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'journal_entries'), 0)
+            )
+            """
+        ).fetchone()
+        conn.execute(
+            """
+            INSERT INTO temp.staging_entry_ids (entry_key, entry_id)
+            SELECT entry_key, :last_id + ROW_NUMBER() OVER (ORDER BY entry_key)
+            FROM journal_entries_staging
+            WHERE batch_id = :batch
+              AND entry_key NOT IN (SELECT value FROM json_each(:rejected))
+            """,
+            {
+                "batch": batch_id,
+                "last_id": int(row[0]),
+                "rejected": json.dumps([e["entry_key"] for e in errors]),
+            },
+        )
+        conn.execute(
+            """
+            INSERT INTO journal_entries (id, entry_date, description, source)
+            SELECT m.entry_id, e.entry_date, e.description, e.source
+            FROM temp.staging_entry_ids m
+            JOIN journal_entries_staging e
+              ON e.batch_id = ? AND e.entry_key = m.entry_key
+            ORDER BY m.entry_id
+            """,
+            (batch_id,),
+        )
+        conn.execute(
+            f"""
+            INSERT INTO journal_lines (
+                entry_id, account_id, debit, credit, memo, native_amount,
+                native_currency, fx_rate, debit_minor, credit_minor, native_minor,
+                signed_base, signed_native, entry_date
+            )
+            SELECT entry_id, account_id, debit, credit, memo, native_amount,
+                   native_currency, fx_rate,
+                   CAST(ROUND(debit * :base_factor) AS INTEGER),
+                   CAST(ROUND(credit * :base_factor) AS INTEGER),
+                   CAST(ROUND(native_amount * native_factor) AS INTEGER),
+                   debit - credit,
+                   CASE
+                       WHEN native_amount IS NOT NULL THEN (
+                           CASE WHEN debit > 0 THEN native_amount ELSE -native_amount END
+                       )
+                       ELSE (debit - credit)
+                   END,
+                   entry_date
+            FROM (
+                SELECT m.entry_id, l.account_id, {debit} AS debit,
+                       {credit} AS credit, l.memo, {native} AS native_amount,
+                       l.native_currency, l.fx_rate, {native_factor} AS native_factor,
+                       e.entry_date
+                FROM temp.staging_entry_ids m
+                JOIN journal_entries_staging e
+                  ON e.batch_id = :batch AND e.entry_key = m.entry_key
+                JOIN journal_lines_staging l
+                  ON l.batch_id = :batch AND l.entry_key = m.entry_key
+                ORDER BY m.entry_id, l.id
+            )
+            """,
+            {
+                "batch": batch_id,
+                "base": base_cur,
+                "base_factor": minor_factor(base_cur),
+            },
+        )
+
+        entry_ids = {
+            int(r[0]): int(r[1])
+            for r in conn.execute(
+                "SELECT entry_key, entry_id FROM temp.staging_entry_ids"
+            ).fetchall()
+        }
+        conn.execute(
+            """
+            DELETE FROM journal_lines_staging
+            WHERE batch_id = ?
+              AND entry_key IN (SELECT entry_key FROM temp.staging_entry_ids)
+            """,
+            (batch_id,),
+        )
+        conn.execute(
+            """
+            DELETE FROM journal_entries_staging
+            WHERE batch_id = ?
+              AND entry_key IN (SELECT entry_key FROM temp.staging_entry_ids)
+            """,
+            (batch_id,),
+        )
+        conn.execute("DELETE FROM temp.staging_entry_ids")
+    except Exception:
+        conn.execute("ROLLBACK TO journal_staging")
+        conn.execute("RELEASE journal_staging")
+        raise
+    conn.execute("RELEASE journal_staging")
+
+    return {"entry_ids": entry_ids, "errors": errors}
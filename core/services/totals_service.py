@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import sqlite3
+
+from core.services.checkpoint_service import CURRENCY_BUCKET_SQL, NATIVE_SIGNED_SQL
+from core.services.settings_service import get_base_currency
+
+# Totals are kept per account and currency bucket ('' is the base currency),
+# like the balance checkpoints.
+_RAW_TOTALS_SQL = f"""
+    SELECT jl.account_id,
+           {CURRENCY_BUCKET_SQL} AS currency,
+           SUM(jl.debit) AS debit_total,
+           SUM(jl.credit) AS credit_total,
+           SUM({NATIVE_SIGNED_SQL}) AS native_total
+    FROM journal_lines jl
+    GROUP BY jl.account_id, 2
+"""
+
+
+def _account_filter(account_ids: list[int] | None) -> tuple[str, list[int]]:
+    if account_ids is None:
+        return "", []
+    placeholders = ",".join("?" for _ in account_ids)
+    return f" WHERE t.account_id IN ({placeholders})", [int(a) for a in account_ids]
+
+
+def current_balances(
+    conn: sqlite3.Connection, account_ids: list[int] | None = None
+) -> dict[int, dict[str, float]]:
+    """Return current base/native balances from the trigger-maintained totals.
+
+    ``base`` covers every currency; ``native`` is the total in the account's
+    own currency, as for ``account_balances_multi``.
+    """
+    if account_ids is not None and not account_ids:
+        return {}
+    where, params = _account_filter(account_ids)
+    base_cur = get_base_currency(conn)
+    rows = conn.execute(
+        f"""
+        SELECT t.account_id,
+               SUM(t.debit_total) - SUM(t.credit_total) AS base,
+               SUM(CASE WHEN COALESCE(NULLIF(t.currency, ''), ?)
+                             = COALESCE(a.currency, ?)
+                        THEN t.native_total ELSE 0 END) AS native
+        FROM account_totals t
+        JOIN accounts a ON a.id = t.account_id
+        {where}
+        GROUP BY t.account_id
+        """,
+        [base_cur, base_cur, *params],
+    ).fetchall()
+    return {
+        r["account_id"]: {"base": float(r["base"]), "native": float(r["native"])}
+        for r in rows
+    }
+
+
+def currency_totals(
+    conn: sqlite3.Connection,
+    base_currency: str,
+    account_ids: list[int] | None = None,
+) -> dict[int, dict[str, dict[str, float]]]:
+    """Return ``{account: {currency: {base, native}}}`` from the totals.
+
+    The base-currency bucket is labelled ``base_currency``.
+    """
+    if account_ids is not None and not account_ids:
+        return {}
+    where, params = _account_filter(account_ids)
+    rows = conn.execute(
+        f"""
+        SELECT t.account_id, t.currency, t.debit_total, t.credit_total,
+               t.native_total
+        FROM account_totals t
+        {where}
+        """,
+        params,
+    ).fetchall()
+
+    balances: dict[int, dict[str, dict[str, float]]] = {}
+    for r in rows:
+        # Native amounts given in the base currency join the '' bucket.
+        currency = r["currency"] or base_currency
+        bucket = balances.setdefault(int(r["account_id"]), {}).setdefault(
+            currency, {"base": 0.0, "native": 0.0}
+        )
+        bucket["base"] += float(r["debit_total"]) - float(r["credit_total"])
+        bucket["native"] += float(r["native_total"])
+    return balances
+
+
+def rebuild_account_totals(conn: sqlite3.Connection) -> int:
+    """Recompute every account total from the journal. Returns the row count.
+
+    Totals are rounded to 6 decimals like the triggers of migration 026 do.
+    """
+    conn.execute("DELETE FROM account_totals")
+    cursor = conn.execute(
+        f"""
+        INSERT INTO account_totals
+            (account_id, currency, debit_total, credit_total, native_total)
+        SELECT account_id, currency, ROUND(debit_total, 6), ROUND(credit_total, 6),
+               ROUND(native_total, 6)
+        FROM ({_RAW_TOTALS_SQL})
+        """
+    )
+    return cursor.rowcount
+
+
+def verify_account_totals(
+    conn: sqlite3.Connection, tolerance: float = 1e-6
+) -> list[dict]:
+    """Recompute totals from scratch and report buckets that drifted.
+
+    One item per (account, currency) that differs. A missing row on either
+    side counts as all-zero totals, so an account whose lines were all
+    deleted is not reported as drift.
+    """
+    fields = ("debit_total", "credit_total", "native_total")
+    expected = {
+        (r["account_id"], r["currency"]): tuple(float(r[f] or 0.0) for f in fields)
+        for r in conn.execute(_RAW_TOTALS_SQL).fetchall()
+    }
+    stored = {
+        (r["account_id"], r["currency"]): tuple(float(r[f] or 0.0) for f in fields)
+        for r in conn.execute(
+            """
+            SELECT account_id, currency, debit_total, credit_total, native_total
+            FROM account_totals
+            """
+        ).fetchall()
+    }
+
+    drift = []
+    zero = (0.0, 0.0, 0.0)
+    for key in sorted(expected.keys() | stored.keys()):
+        exp = expected.get(key, zero)
+        got = stored.get(key, zero)
+        if all(abs(e - g) <= tolerance for e, g in zip(exp, got, strict=True)):
+            continue
+        item = {"account_id": key[0], "currency": key[1]}
+        for field, e, g in zip(fields, exp, got, strict=True):
+            item[f"expected_{field}"] = e
+            item[f"stored_{field}"] = g
+        drift.append(item)
+    return drift
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from core.db import get_connection
+
+    parser = argparse.ArgumentParser(description="Trigger-maintained account totals")
+    parser.add_argument("command", choices=["rebuild", "verify"])
+    args = parser.parse_args()
+
+    with get_connection() as conn:
+        if args.command == "rebuild":
+            count = rebuild_account_totals(conn)
+            print(f"Rebuilt {count} account totals.")
+        else:
+            problems = verify_account_totals(conn)
+            for item in problems:
+                print(item)
+            print(f"{len(problems)} drifted account totals.")
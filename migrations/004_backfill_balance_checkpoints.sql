@@ -0,0 +1,37 @@
+-- Cumulative per-account balance at the end of each month (period = 'YYYY-MM').
+-- Rows exist only for months with activity.
+CREATE TABLE IF NOT EXISTS account_balance_checkpoints (
+    account_id INTEGER NOT NULL,
+    period TEXT NOT NULL,
+    base_balance REAL NOT NULL DEFAULT 0.0,
+    native_balance REAL NOT NULL DEFAULT 0.0,
+    PRIMARY KEY (account_id, period),
+    FOREIGN KEY (account_id) REFERENCES accounts (id)
+) WITHOUT ROWID;
+
+-- Build monthly balance checkpoints for databases that predate them.
+DELETE FROM account_balance_checkpoints;
+
+INSERT INTO account_balance_checkpoints (account_id, period, base_balance, native_balance)
+SELECT
+    m.account_id,
+    m.period,
+    SUM(m.base_change) OVER (PARTITION BY m.account_id ORDER BY m.period),
+    SUM(m.native_change) OVER (PARTITION BY m.account_id ORDER BY m.period)
+FROM (
+    SELECT
+        jl.account_id,
+        substr(je.entry_date, 1, 7) AS period,
+        SUM(jl.debit - jl.credit) AS base_change,
+        SUM(
+            CASE
+                WHEN jl.native_amount IS NOT NULL THEN (
+                    CASE WHEN jl.debit > 0 THEN jl.native_amount ELSE -jl.native_amount END
+                )
+                ELSE (jl.debit - jl.credit)
+            END
+        ) AS native_change
+    FROM journal_lines jl
+    JOIN journal_entries je ON je.id = jl.entry_id
+    GROUP BY jl.account_id, substr(je.entry_date, 1, 7)
+) m;
@@ -0,0 +1,4 @@
+-- Keyset pagination walks journal entries by (entry_date, id).
+-- The single-column date index is superseded by the composite one.
+DROP INDEX IF EXISTS ix_journal_entries_date;
+CREATE INDEX IF NOT EXISTS ix_journal_entries_date_id ON journal_entries (entry_date, id);
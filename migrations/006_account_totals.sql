@@ -0,0 +1,94 @@
+-- Running per-account totals kept exact by triggers on journal_lines, so
+-- current balances are a primary-key lookup instead of a journal scan.
+CREATE TABLE IF NOT EXISTS account_totals (
+    account_id INTEGER PRIMARY KEY,
+    debit_total REAL NOT NULL DEFAULT 0.0,
+    credit_total REAL NOT NULL DEFAULT 0.0,
+    native_total REAL NOT NULL DEFAULT 0.0,
+    FOREIGN KEY (account_id) REFERENCES accounts (id)
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_journal_lines_totals_insert
+AFTER INSERT ON journal_lines
+BEGIN
+    INSERT INTO account_totals (account_id, debit_total, credit_total, native_total)
+    VALUES (
+        NEW.account_id,
+        NEW.debit,
+        NEW.credit,
+        CASE
+            WHEN NEW.native_amount IS NOT NULL THEN (
+                CASE WHEN NEW.debit > 0 THEN NEW.native_amount ELSE -NEW.native_amount END
+            )
+            ELSE (NEW.debit - NEW.credit)
+        END
+    )
+    ON CONFLICT (account_id) DO UPDATE SET
+        debit_total = debit_total + excluded.debit_total,
+        credit_total = credit_total + excluded.credit_total,
+        native_total = native_total + excluded.native_total;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_journal_lines_totals_delete
+AFTER DELETE ON journal_lines
+BEGIN
+    UPDATE account_totals SET
+        debit_total = debit_total - OLD.debit,
+        credit_total = credit_total - OLD.credit,
+        native_total = native_total - CASE
+            WHEN OLD.native_amount IS NOT NULL THEN (
+                CASE WHEN OLD.debit > 0 THEN OLD.native_amount ELSE -OLD.native_amount END
+            )
+            ELSE (OLD.debit - OLD.credit)
+        END
+    WHERE account_id = OLD.account_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_journal_lines_totals_update
+AFTER UPDATE OF account_id, debit, credit, native_amount ON journal_lines
+BEGIN
+    UPDATE account_totals SET
+        debit_total = debit_total - OLD.debit,
+        credit_total = credit_total - OLD.credit,
+        native_total = native_total - CASE
+            WHEN OLD.native_amount IS NOT NULL THEN (
+                CASE WHEN OLD.debit > 0 THEN OLD.native_amount ELSE -OLD.native_amount END
+            )
+            ELSE (OLD.debit - OLD.credit)
+        END
+    WHERE account_id = OLD.account_id;
+
+    INSERT INTO account_totals (account_id, debit_total, credit_total, native_total)
+    VALUES (
+        NEW.account_id,
+        NEW.debit,
+        NEW.credit,
+        CASE
+            WHEN NEW.native_amount IS NOT NULL THEN (
+                CASE WHEN NEW.debit > 0 THEN NEW.native_amount ELSE -NEW.native_amount END
+            )
+            ELSE (NEW.debit - NEW.credit)
+        END
+    )
+    ON CONFLICT (account_id) DO UPDATE SET
+        debit_total = debit_total + excluded.debit_total,
+        credit_total = credit_total + excluded.credit_total,
+        native_total = native_total + excluded.native_total;
+END;
+
+DELETE FROM account_totals;
+INSERT INTO account_totals (account_id, debit_total, credit_total, native_total)
+SELECT
+    jl.account_id,
+    SUM(jl.debit),
+    SUM(jl.credit),
+    SUM(
+        CASE
+            WHEN jl.native_amount IS NOT NULL THEN (
+                CASE WHEN jl.debit > 0 THEN jl.native_amount ELSE -jl.native_amount END
+            )
+            ELSE (jl.debit - jl.credit)
+        END
+    )
+FROM journal_lines jl
+GROUP BY jl.account_id;
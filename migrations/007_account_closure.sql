@@ -0,0 +1,63 @@
+-- Transitive closure of the account tree: one row per (ancestor, descendant)
+-- pair including each account with itself at depth 0. Kept in step with
+-- accounts by triggers so subtree, L1 and rollup lookups are index probes.
+CREATE TABLE IF NOT EXISTS account_closure (
+    ancestor_id INTEGER NOT NULL,
+    descendant_id INTEGER NOT NULL,
+    depth INTEGER NOT NULL,
+    PRIMARY KEY (ancestor_id, descendant_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_account_closure_descendant
+ON account_closure (descendant_id, depth);
+
+CREATE TRIGGER IF NOT EXISTS trg_accounts_closure_insert
+AFTER INSERT ON accounts
+BEGIN
+    INSERT INTO account_closure (ancestor_id, descendant_id, depth)
+    VALUES (NEW.id, NEW.id, 0);
+
+    INSERT INTO account_closure (ancestor_id, descendant_id, depth)
+    SELECT c.ancestor_id, NEW.id, c.depth + 1
+    FROM account_closure c
+    WHERE c.descendant_id = NEW.parent_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_accounts_closure_delete
+AFTER DELETE ON accounts
+BEGIN
+    DELETE FROM account_closure
+    WHERE descendant_id = OLD.id OR ancestor_id = OLD.id;
+END;
+
+-- Moving an account moves its whole subtree: drop the links from the old
+-- ancestors, then link every new ancestor to every node of the subtree.
+CREATE TRIGGER IF NOT EXISTS trg_accounts_closure_reparent
+AFTER UPDATE OF parent_id ON accounts
+WHEN OLD.parent_id IS NOT NEW.parent_id
+BEGIN
+    DELETE FROM account_closure
+    WHERE descendant_id IN (
+        SELECT descendant_id FROM account_closure WHERE ancestor_id = NEW.id
+    )
+    AND ancestor_id NOT IN (
+        SELECT descendant_id FROM account_closure WHERE ancestor_id = NEW.id
+    );
+
+    INSERT INTO account_closure (ancestor_id, descendant_id, depth)
+    SELECT p.ancestor_id, s.descendant_id, p.depth + s.depth + 1
+    FROM account_closure p
+    JOIN account_closure s ON s.ancestor_id = NEW.id
+    WHERE p.descendant_id = NEW.parent_id;
+END;
+
+DELETE FROM account_closure;
+INSERT INTO account_closure (ancestor_id, descendant_id, depth)
+WITH RECURSIVE tree (ancestor_id, descendant_id, depth) AS (
+    SELECT id, id, 0 FROM accounts
+    UNION ALL
+    SELECT p.id, t.descendant_id, t.depth + 1
+    FROM tree t
+    JOIN accounts a ON a.id = t.ancestor_id
+    JOIN accounts p ON p.id = a.parent_id
+)
+SELECT ancestor_id, descendant_id, depth FROM tree;
@@ -0,0 +1,23 @@
+-- Persisted cash-equivalent flag used by the cashflow report instead of
+-- matching account names on every call.
+ALTER TABLE accounts ADD COLUMN is_cash_equivalent INTEGER NOT NULL DEFAULT 0;
+
+CREATE INDEX IF NOT EXISTS ix_accounts_cash_equivalent
+ON accounts (is_cash_equivalent, is_active);
+
+-- Seed from the name patterns the report used to apply; children of a
+-- matching account (e.g. banks under 보통예금) are cash equivalents too.
+UPDATE accounts
+SET is_cash_equivalent = 1
+WHERE type = 'ASSET'
+  AND id IN (
+      SELECT c.descendant_id
+      FROM account_closure c
+      JOIN accounts anc ON anc.id = c.ancestor_id
+      WHERE LOWER(anc.name) LIKE '%현금%'
+         OR LOWER(anc.name) LIKE '%보통예금%'
+         OR LOWER(anc.name) LIKE '%정기예금%'
+         OR LOWER(anc.name) LIKE '%cash%'
+         OR LOWER(anc.name) LIKE '%checking%'
+         OR LOWER(anc.name) LIKE '%savings%'
+  );
@@ -0,0 +1,10 @@
+-- Integer minor-unit copies of journal amounts (KRW/JPY 0 decimals, USD/EUR
+-- 2, as in core/money.py CURRENCY_CONFIG). Written by the posting services;
+-- with app_settings.amount_storage = 'MINOR' balances are summed from them
+-- exactly. Existing lines are filled by core.money.sync_currency_units once
+-- currency_units (migration 022) is first populated.
+ALTER TABLE app_settings ADD COLUMN amount_storage TEXT NOT NULL DEFAULT 'REAL';
+
+ALTER TABLE journal_lines ADD COLUMN debit_minor INTEGER;
+ALTER TABLE journal_lines ADD COLUMN credit_minor INTEGER;
+ALTER TABLE journal_lines ADD COLUMN native_minor INTEGER;
@@ -0,0 +1,55 @@
+-- Signed amounts stored on each journal line so balance aggregations sum
+-- plain columns instead of re-evaluating the native sign CASE per row.
+-- signed_base is debit - credit; signed_native carries the line's side on the
+-- native amount and falls back to signed_base when there is none. Triggers
+-- keep them in step with debit/credit/native_amount (generated columns added
+-- by ALTER TABLE can only be VIRTUAL, which an index cannot cover).
+ALTER TABLE journal_lines ADD COLUMN signed_base REAL NOT NULL DEFAULT 0.0;
+ALTER TABLE journal_lines ADD COLUMN signed_native REAL NOT NULL DEFAULT 0.0;
+
+CREATE TRIGGER IF NOT EXISTS trg_journal_lines_signed_insert
+AFTER INSERT ON journal_lines
+BEGIN
+    UPDATE journal_lines SET
+        signed_base = NEW.debit - NEW.credit,
+        signed_native = CASE
+            WHEN NEW.native_amount IS NOT NULL THEN (
+                CASE WHEN NEW.debit > 0 THEN NEW.native_amount ELSE -NEW.native_amount END
+            )
+            ELSE (NEW.debit - NEW.credit)
+        END
+    WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_journal_lines_signed_update
+AFTER UPDATE OF debit, credit, native_amount ON journal_lines
+BEGIN
+    UPDATE journal_lines SET
+        signed_base = NEW.debit - NEW.credit,
+        signed_native = CASE
+            WHEN NEW.native_amount IS NOT NULL THEN (
+                CASE WHEN NEW.debit > 0 THEN NEW.native_amount ELSE -NEW.native_amount END
+            )
+            ELSE (NEW.debit - NEW.credit)
+        END
+    WHERE id = NEW.id;
+END;
+
+UPDATE journal_lines SET
+    signed_base = debit - credit,
+    signed_native = CASE
+        WHEN native_amount IS NOT NULL THEN (
+            CASE WHEN debit > 0 THEN native_amount ELSE -native_amount END
+        )
+        ELSE (debit - credit)
+    END;
+
+-- Covering indexes: per-account sums read (account_id, ...) alone, date-bounded
+-- sums reach lines through entry_id without visiting the table. Both supersede
+-- the single-column indexes from the baseline schema.
+DROP INDEX IF EXISTS ix_journal_lines_account_id;
+DROP INDEX IF EXISTS ix_journal_lines_entry_id;
+CREATE INDEX IF NOT EXISTS ix_journal_lines_account_signed
+    ON journal_lines (account_id, entry_id, signed_base, signed_native);
+CREATE INDEX IF NOT EXISTS ix_journal_lines_entry_signed
+    ON journal_lines (entry_id, account_id, signed_base, signed_native);
@@ -0,0 +1,48 @@
+-- Full-text index over journal text, one row per journal line (rowid is
+-- journal_lines.id) holding its entry description and its memo. unicode61
+-- splits Hangul on whitespace/punctuation, and search_journal issues prefix
+-- queries, so "쿠팡" finds "쿠팡에서" without the 3-character minimum of the
+-- trigram tokenizer.
+CREATE VIRTUAL TABLE IF NOT EXISTS journal_search USING fts5(
+    description,
+    memo,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_journal_lines_search_insert
+AFTER INSERT ON journal_lines
+BEGIN
+    INSERT INTO journal_search (rowid, description, memo)
+    SELECT NEW.id, je.description, NEW.memo
+    FROM journal_entries je
+    WHERE je.id = NEW.entry_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_journal_lines_search_delete
+AFTER DELETE ON journal_lines
+BEGIN
+    DELETE FROM journal_search WHERE rowid = OLD.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_journal_lines_search_update
+AFTER UPDATE OF entry_id, memo ON journal_lines
+BEGIN
+    DELETE FROM journal_search WHERE rowid = OLD.id;
+    INSERT INTO journal_search (rowid, description, memo)
+    SELECT NEW.id, je.description, NEW.memo
+    FROM journal_entries je
+    WHERE je.id = NEW.entry_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_journal_entries_search_update
+AFTER UPDATE OF description ON journal_entries
+BEGIN
+    UPDATE journal_search SET description = NEW.description
+    WHERE rowid IN (SELECT id FROM journal_lines WHERE entry_id = NEW.id);
+END;
+
+DELETE FROM journal_search;
+INSERT INTO journal_search (rowid, description, memo)
+SELECT jl.id, je.description, jl.memo
+FROM journal_lines jl
+JOIN journal_entries je ON je.id = jl.entry_id;
@@ -0,0 +1,68 @@
+-- Incremental ledger integrity scanning. integrity_scan_state holds the
+-- high-water mark (last journal entry id already verified); entries at or
+-- below it that change afterwards are queued in integrity_dirty_entries by
+-- triggers, so a routine scan only reads new and queued entries. Findings are
+-- kept in integrity_issues until the entry is scanned again.
+CREATE TABLE IF NOT EXISTS integrity_scan_state (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    last_entry_id INTEGER NOT NULL DEFAULT 0,
+    last_run_at DATETIME
+);
+INSERT OR IGNORE INTO integrity_scan_state (id, last_entry_id) VALUES (1, 0);
+
+CREATE TABLE IF NOT EXISTS integrity_dirty_entries (
+    entry_id INTEGER PRIMARY KEY
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS integrity_issues (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    check_name TEXT NOT NULL, -- UNBALANCED, NON_POSTING_ACCOUNT, MISSING_FX, ORPHAN_LINK
+    entry_id INTEGER,
+    line_id INTEGER,
+    ref_table TEXT,
+    ref_id INTEGER,
+    detail TEXT NOT NULL DEFAULT '',
+    detected_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS ix_integrity_issues_entry ON integrity_issues (entry_id);
+
+CREATE TRIGGER IF NOT EXISTS trg_journal_lines_integrity_insert
+AFTER INSERT ON journal_lines
+WHEN NEW.entry_id <= (SELECT last_entry_id FROM integrity_scan_state WHERE id = 1)
+BEGIN
+    INSERT OR IGNORE INTO integrity_dirty_entries (entry_id) VALUES (NEW.entry_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_journal_lines_integrity_update
+AFTER UPDATE OF entry_id, account_id, debit, credit, native_amount, native_currency, fx_rate
+ON journal_lines
+BEGIN
+    INSERT OR IGNORE INTO integrity_dirty_entries (entry_id) VALUES (OLD.entry_id);
+    INSERT OR IGNORE INTO integrity_dirty_entries (entry_id) VALUES (NEW.entry_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_journal_lines_integrity_delete
+AFTER DELETE ON journal_lines
+BEGIN
+    INSERT OR IGNORE INTO integrity_dirty_entries (entry_id) VALUES (OLD.entry_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_journal_entries_integrity_delete
+AFTER DELETE ON journal_entries
+BEGIN
+    INSERT OR IGNORE INTO integrity_dirty_entries (entry_id) VALUES (OLD.id);
+END;
+
+-- Closing an account to postings makes its existing lines violations.
+CREATE TRIGGER IF NOT EXISTS trg_accounts_integrity_posting
+AFTER UPDATE OF allow_posting ON accounts
+WHEN NEW.allow_posting = 0 AND OLD.allow_posting != 0
+BEGIN
+    INSERT OR IGNORE INTO integrity_dirty_entries (entry_id)
+    SELECT DISTINCT entry_id FROM journal_lines WHERE account_id = NEW.id;
+END;
+
+CREATE INDEX IF NOT EXISTS ix_investment_events_journal_entry
+    ON investment_events (journal_entry_id);
+CREATE INDEX IF NOT EXISTS ix_loan_schedules_journal_entry
+    ON loan_schedules (journal_entry_id);
@@ -0,0 +1,44 @@
+-- Per-account ledgers walk one account's lines in date order. The entry date
+-- is copied onto each line so (account_id, entry_date, id) can be a single
+-- index; triggers keep it equal to journal_entries.entry_date. The signed
+-- amount insert trigger from migration 010 is recreated to fill both in one
+-- UPDATE.
+ALTER TABLE journal_lines ADD COLUMN entry_date DATE;
+
+DROP TRIGGER IF EXISTS trg_journal_lines_signed_insert;
+CREATE TRIGGER IF NOT EXISTS trg_journal_lines_signed_insert
+AFTER INSERT ON journal_lines
+BEGIN
+    UPDATE journal_lines SET
+        signed_base = NEW.debit - NEW.credit,
+        signed_native = CASE
+            WHEN NEW.native_amount IS NOT NULL THEN (
+                CASE WHEN NEW.debit > 0 THEN NEW.native_amount ELSE -NEW.native_amount END
+            )
+            ELSE (NEW.debit - NEW.credit)
+        END,
+        entry_date = (SELECT entry_date FROM journal_entries WHERE id = NEW.entry_id)
+    WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_journal_lines_entry_date_update
+AFTER UPDATE OF entry_id ON journal_lines
+BEGIN
+    UPDATE journal_lines
+    SET entry_date = (SELECT entry_date FROM journal_entries WHERE id = NEW.entry_id)
+    WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_journal_entries_date_update
+AFTER UPDATE OF entry_date ON journal_entries
+BEGIN
+    UPDATE journal_lines SET entry_date = NEW.entry_date WHERE entry_id = NEW.id;
+END;
+
+UPDATE journal_lines
+SET entry_date = je.entry_date
+FROM journal_entries je
+WHERE je.id = journal_lines.entry_id;
+
+CREATE INDEX IF NOT EXISTS ix_journal_lines_account_date
+    ON journal_lines (account_id, entry_date, id);
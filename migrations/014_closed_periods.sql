@@ -0,0 +1,86 @@
+-- Year-end close. A close posts an entry (source 'closing') that moves the
+-- year's income/expense balances into an equity account and records the
+-- period here with its per-account results, which reports read instead of
+-- rescanning the year. Reopening posts a reversal (source 'closing_reversal')
+-- and stamps reopened_at; only periods with reopened_at IS NULL are closed.
+CREATE TABLE IF NOT EXISTS closed_periods (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    period TEXT NOT NULL, -- 'YYYY'
+    start_date DATE NOT NULL,
+    end_date DATE NOT NULL,
+    equity_account_id INTEGER NOT NULL,
+    closing_entry_id INTEGER,
+    net_income REAL NOT NULL DEFAULT 0.0,
+    closed_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    reopened_at DATETIME,
+    reversal_entry_id INTEGER,
+    FOREIGN KEY (equity_account_id) REFERENCES accounts (id),
+    FOREIGN KEY (closing_entry_id) REFERENCES journal_entries (id),
+    FOREIGN KEY (reversal_entry_id) REFERENCES journal_entries (id)
+);
+CREATE UNIQUE INDEX IF NOT EXISTS ux_closed_periods_open
+    ON closed_periods (period) WHERE reopened_at IS NULL;
+
+-- Income/expense results of a closed period: SUM(debit - credit) per account.
+CREATE TABLE IF NOT EXISTS closing_balances (
+    closed_period_id INTEGER NOT NULL,
+    account_id INTEGER NOT NULL,
+    raw_balance REAL NOT NULL,
+    PRIMARY KEY (closed_period_id, account_id),
+    FOREIGN KEY (closed_period_id) REFERENCES closed_periods (id) ON DELETE CASCADE,
+    FOREIGN KEY (account_id) REFERENCES accounts (id)
+) WITHOUT ROWID;
+
+-- Backstop for writes that bypass the services.
+CREATE TRIGGER IF NOT EXISTS trg_journal_entries_closed_insert
+BEFORE INSERT ON journal_entries
+WHEN EXISTS (
+    SELECT 1 FROM closed_periods
+    WHERE reopened_at IS NULL AND NEW.entry_date BETWEEN start_date AND end_date
+)
+BEGIN
+    SELECT RAISE(ABORT, 'entry_date is inside a closed period');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_journal_entries_closed_update
+BEFORE UPDATE OF entry_date ON journal_entries
+WHEN EXISTS (
+    SELECT 1 FROM closed_periods
+    WHERE reopened_at IS NULL
+      AND (NEW.entry_date BETWEEN start_date AND end_date
+           OR OLD.entry_date BETWEEN start_date AND end_date)
+)
+BEGIN
+    SELECT RAISE(ABORT, 'entry_date is inside a closed period');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_journal_lines_closed_insert
+BEFORE INSERT ON journal_lines
+WHEN EXISTS (
+    SELECT 1 FROM closed_periods cp
+    JOIN journal_entries je ON je.id = NEW.entry_id
+    WHERE cp.reopened_at IS NULL AND je.entry_date BETWEEN cp.start_date AND cp.end_date
+)
+BEGIN
+    SELECT RAISE(ABORT, 'journal line is inside a closed period');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_journal_lines_closed_update
+BEFORE UPDATE OF entry_id, account_id, debit, credit, native_amount ON journal_lines
+WHEN EXISTS (
+    SELECT 1 FROM closed_periods
+    WHERE reopened_at IS NULL AND OLD.entry_date BETWEEN start_date AND end_date
+)
+BEGIN
+    SELECT RAISE(ABORT, 'journal line is inside a closed period');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_journal_lines_closed_delete
+BEFORE DELETE ON journal_lines
+WHEN EXISTS (
+    SELECT 1 FROM closed_periods
+    WHERE reopened_at IS NULL AND OLD.entry_date BETWEEN start_date AND end_date
+)
+BEGIN
+    SELECT RAISE(ABORT, 'journal line is inside a closed period');
+END;
@@ -0,0 +1,43 @@
+-- Posting rules enforced by the database. Lines may only reference existing
+-- accounts with allow_posting = 1, whatever path writes them.
+CREATE TRIGGER IF NOT EXISTS trg_journal_lines_posting_insert
+BEFORE INSERT ON journal_lines
+WHEN (SELECT allow_posting FROM accounts WHERE id = NEW.account_id) IS NOT 1
+BEGIN
+    SELECT RAISE(ABORT, 'account does not allow posting');
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_journal_lines_posting_update
+BEFORE UPDATE OF account_id ON journal_lines
+WHEN (SELECT allow_posting FROM accounts WHERE id = NEW.account_id) IS NOT 1
+BEGIN
+    SELECT RAISE(ABORT, 'account does not allow posting');
+END;
+
+-- Entry balance cannot be checked one row at a time, so bulk loads go through
+-- staging tables: rows are loaded with plain executemany, validated set-wise
+-- per batch and moved into journal_entries/journal_lines only when the batch
+-- passes (see staging_service).
+CREATE TABLE IF NOT EXISTS journal_entries_staging (
+    batch_id TEXT NOT NULL,
+    entry_key INTEGER NOT NULL,
+    entry_date DATE NOT NULL,
+    description TEXT NOT NULL,
+    source TEXT NOT NULL DEFAULT 'import',
+    PRIMARY KEY (batch_id, entry_key)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS journal_lines_staging (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    batch_id TEXT NOT NULL,
+    entry_key INTEGER NOT NULL,
+    account_id INTEGER NOT NULL,
+    debit REAL NOT NULL DEFAULT 0.0,
+    credit REAL NOT NULL DEFAULT 0.0,
+    memo TEXT NOT NULL DEFAULT '',
+    native_amount REAL,
+    native_currency TEXT,
+    fx_rate REAL
+);
+CREATE INDEX IF NOT EXISTS ix_journal_lines_staging_batch
+    ON journal_lines_staging (batch_id, entry_key);
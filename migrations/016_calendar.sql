@@ -0,0 +1,63 @@
+-- Calendar dimension for period bucketing. One row per day, filled by
+-- calendar_service (ISO weeks and Korean public holidays are computed in
+-- Python); calendar_months rolls the days up per month. period_id is the
+-- month as YYYYMM and is also stored on journal_entries, so month-aligned
+-- reports group on an indexed integer and join calendar_months for labels.
+ALTER TABLE app_settings ADD COLUMN fiscal_year_start_month INTEGER NOT NULL DEFAULT 1;
+
+CREATE TABLE IF NOT EXISTS calendar (
+    date DATE PRIMARY KEY,
+    period_id INTEGER NOT NULL,
+    year INTEGER NOT NULL,
+    quarter INTEGER NOT NULL,
+    month INTEGER NOT NULL,
+    day INTEGER NOT NULL,
+    weekday INTEGER NOT NULL, -- 0 = Monday
+    iso_year INTEGER NOT NULL,
+    iso_week INTEGER NOT NULL,
+    week_id INTEGER NOT NULL, -- iso_year * 100 + iso_week
+    fiscal_year INTEGER NOT NULL, -- calendar year the fiscal year starts in
+    fiscal_period INTEGER NOT NULL, -- 1..12 from the fiscal start month
+    fiscal_quarter INTEGER NOT NULL,
+    is_holiday INTEGER NOT NULL DEFAULT 0,
+    holiday_name TEXT,
+    is_business_day INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_calendar_period ON calendar (period_id, date);
+CREATE INDEX IF NOT EXISTS ix_calendar_week ON calendar (week_id, date);
+
+CREATE TABLE IF NOT EXISTS calendar_months (
+    period_id INTEGER PRIMARY KEY,
+    year INTEGER NOT NULL,
+    quarter INTEGER NOT NULL,
+    month INTEGER NOT NULL,
+    start_date DATE NOT NULL,
+    end_date DATE NOT NULL,
+    fiscal_year INTEGER NOT NULL,
+    fiscal_period INTEGER NOT NULL,
+    fiscal_quarter INTEGER NOT NULL,
+    business_days INTEGER NOT NULL
+);
+
+ALTER TABLE journal_entries ADD COLUMN period_id INTEGER;
+
+CREATE TRIGGER IF NOT EXISTS trg_journal_entries_period_insert
+AFTER INSERT ON journal_entries
+BEGIN
+    UPDATE journal_entries
+    SET period_id = CAST(strftime('%Y%m', NEW.entry_date) AS INTEGER)
+    WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_journal_entries_period_update
+AFTER UPDATE OF entry_date ON journal_entries
+BEGIN
+    UPDATE journal_entries
+    SET period_id = CAST(strftime('%Y%m', NEW.entry_date) AS INTEGER)
+    WHERE id = NEW.id;
+END;
+
+UPDATE journal_entries SET period_id = CAST(strftime('%Y%m', entry_date) AS INTEGER);
+
+CREATE INDEX IF NOT EXISTS ix_journal_entries_period
+    ON journal_entries (period_id, id);
@@ -0,0 +1,21 @@
+-- Bulk moves of journal lines between accounts. Each run records its
+-- criteria and the ids of the lines it moved so it can be undone.
+CREATE TABLE IF NOT EXISTS reclassifications (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    from_account_id INTEGER NOT NULL,
+    to_account_id INTEGER NOT NULL,
+    criteria TEXT NOT NULL, -- JSON of the matching filters
+    line_count INTEGER NOT NULL,
+    base_amount REAL NOT NULL, -- signed base total moved
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    undone_at DATETIME,
+    FOREIGN KEY (from_account_id) REFERENCES accounts (id),
+    FOREIGN KEY (to_account_id) REFERENCES accounts (id)
+);
+
+CREATE TABLE IF NOT EXISTS reclassification_lines (
+    reclassification_id INTEGER NOT NULL,
+    line_id INTEGER NOT NULL,
+    PRIMARY KEY (reclassification_id, line_id),
+    FOREIGN KEY (reclassification_id) REFERENCES reclassifications (id)
+) WITHOUT ROWID;
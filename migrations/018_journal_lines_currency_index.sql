@@ -0,0 +1,9 @@
+-- Balances per (account, native currency) bucket for accounts that hold more
+-- than one currency. Covers the grouped scan in currency_balances, including
+-- the as-of date filter and the native_amount NULL check that decides the
+-- bucket.
+CREATE INDEX IF NOT EXISTS ix_journal_lines_account_currency
+    ON journal_lines (
+        account_id, native_currency, entry_date, native_amount,
+        signed_base, signed_native
+    );
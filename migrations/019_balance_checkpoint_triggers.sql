@@ -0,0 +1,153 @@
+-- Keep the monthly balance checkpoints exact with triggers on journal_lines,
+-- so direct SQL edits and entry date changes (which reach the lines through
+-- trg_journal_entries_date_update) move balances between months too. A line
+-- counts once it carries its entry_date: raw inserts get it from the fill
+-- trigger, which arrives here as an UPDATE from a NULL date.
+--
+-- Adding a line seeds its month from the previous checkpoint, then shifts
+-- every checkpoint from that month on. Removing one shifts them back and
+-- drops the month if the account has no lines left in it.
+CREATE TRIGGER IF NOT EXISTS trg_journal_lines_checkpoint_insert
+AFTER INSERT ON journal_lines
+WHEN NEW.entry_date IS NOT NULL
+BEGIN
+    INSERT OR IGNORE INTO account_balance_checkpoints
+        (account_id, period, base_balance, native_balance)
+    SELECT
+        NEW.account_id,
+        substr(NEW.entry_date, 1, 7),
+        COALESCE(prev.base_balance, 0.0),
+        COALESCE(prev.native_balance, 0.0)
+    FROM (SELECT 1) AS seed
+    LEFT JOIN (
+        SELECT base_balance, native_balance
+        FROM account_balance_checkpoints
+        WHERE account_id = NEW.account_id
+          AND period < substr(NEW.entry_date, 1, 7)
+        ORDER BY period DESC
+        LIMIT 1
+    ) AS prev ON 1 = 1;
+
+    UPDATE account_balance_checkpoints SET
+        base_balance = base_balance + (NEW.debit - NEW.credit),
+        native_balance = native_balance + CASE
+            WHEN NEW.native_amount IS NOT NULL THEN (
+                CASE WHEN NEW.debit > 0 THEN NEW.native_amount ELSE -NEW.native_amount END
+            )
+            ELSE (NEW.debit - NEW.credit)
+        END
+    WHERE account_id = NEW.account_id
+      AND period >= substr(NEW.entry_date, 1, 7);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_journal_lines_checkpoint_update
+AFTER UPDATE OF account_id, debit, credit, native_amount, entry_date ON journal_lines
+WHEN OLD.account_id IS NOT NEW.account_id
+  OR OLD.debit IS NOT NEW.debit
+  OR OLD.credit IS NOT NEW.credit
+  OR OLD.native_amount IS NOT NEW.native_amount
+  OR OLD.entry_date IS NOT NEW.entry_date
+BEGIN
+    INSERT OR IGNORE INTO account_balance_checkpoints
+        (account_id, period, base_balance, native_balance)
+    SELECT
+        NEW.account_id,
+        substr(NEW.entry_date, 1, 7),
+        COALESCE(prev.base_balance, 0.0),
+        COALESCE(prev.native_balance, 0.0)
+    FROM (SELECT 1) AS seed
+    LEFT JOIN (
+        SELECT base_balance, native_balance
+        FROM account_balance_checkpoints
+        WHERE account_id = NEW.account_id
+          AND period < substr(NEW.entry_date, 1, 7)
+        ORDER BY period DESC
+        LIMIT 1
+    ) AS prev ON 1 = 1
+    WHERE NEW.entry_date IS NOT NULL;
+
+    UPDATE account_balance_checkpoints SET
+        base_balance = base_balance + (NEW.debit - NEW.credit),
+        native_balance = native_balance + CASE
+            WHEN NEW.native_amount IS NOT NULL THEN (
+                CASE WHEN NEW.debit > 0 THEN NEW.native_amount ELSE -NEW.native_amount END
+            )
+            ELSE (NEW.debit - NEW.credit)
+        END
+    WHERE account_id = NEW.account_id
+      AND period >= substr(NEW.entry_date, 1, 7);
+
+    UPDATE account_balance_checkpoints SET
+        base_balance = base_balance - (OLD.debit - OLD.credit),
+        native_balance = native_balance - CASE
+            WHEN OLD.native_amount IS NOT NULL THEN (
+                CASE WHEN OLD.debit > 0 THEN OLD.native_amount ELSE -OLD.native_amount END
+            )
+            ELSE (OLD.debit - OLD.credit)
+        END
+    WHERE account_id = OLD.account_id
+      AND period >= substr(OLD.entry_date, 1, 7);
+
+    DELETE FROM account_balance_checkpoints
+    WHERE account_id = OLD.account_id
+      AND period = substr(OLD.entry_date, 1, 7)
+      AND NOT EXISTS (
+          SELECT 1 FROM journal_lines
+          WHERE account_id = OLD.account_id
+            AND entry_date >= substr(OLD.entry_date, 1, 7) || '-01'
+            AND entry_date < date(substr(OLD.entry_date, 1, 7) || '-01', '+1 month')
+      );
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_journal_lines_checkpoint_delete
+AFTER DELETE ON journal_lines
+WHEN OLD.entry_date IS NOT NULL
+BEGIN
+    UPDATE account_balance_checkpoints SET
+        base_balance = base_balance - (OLD.debit - OLD.credit),
+        native_balance = native_balance - CASE
+            WHEN OLD.native_amount IS NOT NULL THEN (
+                CASE WHEN OLD.debit > 0 THEN OLD.native_amount ELSE -OLD.native_amount END
+            )
+            ELSE (OLD.debit - OLD.credit)
+        END
+    WHERE account_id = OLD.account_id
+      AND period >= substr(OLD.entry_date, 1, 7);
+
+    DELETE FROM account_balance_checkpoints
+    WHERE account_id = OLD.account_id
+      AND period = substr(OLD.entry_date, 1, 7)
+      AND NOT EXISTS (
+          SELECT 1 FROM journal_lines
+          WHERE account_id = OLD.account_id
+            AND entry_date >= substr(OLD.entry_date, 1, 7) || '-01'
+            AND entry_date < date(substr(OLD.entry_date, 1, 7) || '-01', '+1 month')
+      );
+END;
+
+-- Start from exact checkpoints; earlier Python upkeep missed direct edits.
+DELETE FROM account_balance_checkpoints;
+INSERT INTO account_balance_checkpoints
+    (account_id, period, base_balance, native_balance)
+SELECT
+    m.account_id,
+    m.period,
+    SUM(m.base_change) OVER (PARTITION BY m.account_id ORDER BY m.period),
+    SUM(m.native_change) OVER (PARTITION BY m.account_id ORDER BY m.period)
+FROM (
+    SELECT
+        jl.account_id,
+        substr(je.entry_date, 1, 7) AS period,
+        SUM(jl.debit - jl.credit) AS base_change,
+        SUM(
+            CASE
+                WHEN jl.native_amount IS NOT NULL THEN (
+                    CASE WHEN jl.debit > 0 THEN jl.native_amount ELSE -jl.native_amount END
+                )
+                ELSE (jl.debit - jl.credit)
+            END
+        ) AS native_change
+    FROM journal_lines jl
+    JOIN journal_entries je ON je.id = jl.entry_id
+    GROUP BY jl.account_id, substr(je.entry_date, 1, 7)
+) m;
@@ -0,0 +1,92 @@
+-- account_totals are REAL running sums, so each trigger step added binary
+-- rounding error that never cancelled out (ten 0.1 postings left 0.9999...).
+-- The triggers are recreated to snap every new total to 6 decimals, the
+-- same precision period_service rounds raw balances to. Posted amounts have
+-- far fewer decimals, so the stored totals stay exact decimal sums.
+DROP TRIGGER IF EXISTS trg_journal_lines_totals_insert;
+CREATE TRIGGER IF NOT EXISTS trg_journal_lines_totals_insert
+AFTER INSERT ON journal_lines
+BEGIN
+    INSERT INTO account_totals (account_id, debit_total, credit_total, native_total)
+    VALUES (
+        NEW.account_id,
+        NEW.debit,
+        NEW.credit,
+        CASE
+            WHEN NEW.native_amount IS NOT NULL THEN (
+                CASE WHEN NEW.debit > 0 THEN NEW.native_amount ELSE -NEW.native_amount END
+            )
+            ELSE (NEW.debit - NEW.credit)
+        END
+    )
+    ON CONFLICT (account_id) DO UPDATE SET
+        debit_total = ROUND(debit_total + excluded.debit_total, 6),
+        credit_total = ROUND(credit_total + excluded.credit_total, 6),
+        native_total = ROUND(native_total + excluded.native_total, 6);
+END;
+
+DROP TRIGGER IF EXISTS trg_journal_lines_totals_delete;
+CREATE TRIGGER IF NOT EXISTS trg_journal_lines_totals_delete
+AFTER DELETE ON journal_lines
+BEGIN
+    UPDATE account_totals SET
+        debit_total = ROUND(debit_total - OLD.debit, 6),
+        credit_total = ROUND(credit_total - OLD.credit, 6),
+        native_total = ROUND(native_total - CASE
+            WHEN OLD.native_amount IS NOT NULL THEN (
+                CASE WHEN OLD.debit > 0 THEN OLD.native_amount ELSE -OLD.native_amount END
+            )
+            ELSE (OLD.debit - OLD.credit)
+        END, 6)
+    WHERE account_id = OLD.account_id;
+END;
+
+DROP TRIGGER IF EXISTS trg_journal_lines_totals_update;
+CREATE TRIGGER IF NOT EXISTS trg_journal_lines_totals_update
+AFTER UPDATE OF account_id, debit, credit, native_amount ON journal_lines
+BEGIN
+    UPDATE account_totals SET
+        debit_total = ROUND(debit_total - OLD.debit, 6),
+        credit_total = ROUND(credit_total - OLD.credit, 6),
+        native_total = ROUND(native_total - CASE
+            WHEN OLD.native_amount IS NOT NULL THEN (
+                CASE WHEN OLD.debit > 0 THEN OLD.native_amount ELSE -OLD.native_amount END
+            )
+            ELSE (OLD.debit - OLD.credit)
+        END, 6)
+    WHERE account_id = OLD.account_id;
+
+    INSERT INTO account_totals (account_id, debit_total, credit_total, native_total)
+    VALUES (
+        NEW.account_id,
+        NEW.debit,
+        NEW.credit,
+        CASE
+            WHEN NEW.native_amount IS NOT NULL THEN (
+                CASE WHEN NEW.debit > 0 THEN NEW.native_amount ELSE -NEW.native_amount END
+            )
+            ELSE (NEW.debit - NEW.credit)
+        END
+    )
+    ON CONFLICT (account_id) DO UPDATE SET
+        debit_total = ROUND(debit_total + excluded.debit_total, 6),
+        credit_total = ROUND(credit_total + excluded.credit_total, 6),
+        native_total = ROUND(native_total + excluded.native_total, 6);
+END;
+
+DELETE FROM account_totals;
+INSERT INTO account_totals (account_id, debit_total, credit_total, native_total)
+SELECT
+    jl.account_id,
+    ROUND(SUM(jl.debit), 6),
+    ROUND(SUM(jl.credit), 6),
+    ROUND(SUM(
+        CASE
+            WHEN jl.native_amount IS NOT NULL THEN (
+                CASE WHEN jl.debit > 0 THEN jl.native_amount ELSE -jl.native_amount END
+            )
+            ELSE (jl.debit - jl.credit)
+        END
+    ), 6)
+FROM journal_lines jl
+GROUP BY jl.account_id;
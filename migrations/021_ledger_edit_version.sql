@@ -0,0 +1,37 @@
+-- A counter bumped whenever already-posted journal data changes: line
+-- amounts, accounts or entries, entry dates, or deletions. Appending new
+-- lines leaves it alone, so in-memory caches (LedgerEngine) can load new
+-- lines incrementally and reload only when the counter has moved. The
+-- initial fill of a raw insert (entry_date still NULL) is not an edit.
+CREATE TABLE IF NOT EXISTS ledger_state (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    edit_version INTEGER NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO ledger_state (id, edit_version) VALUES (1, 0);
+
+CREATE TRIGGER IF NOT EXISTS trg_journal_lines_edit_version_update
+AFTER UPDATE OF entry_id, account_id, debit, credit, native_amount,
+    signed_base, signed_native ON journal_lines
+WHEN OLD.entry_date IS NOT NULL
+BEGIN
+    UPDATE ledger_state SET edit_version = edit_version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_journal_lines_edit_version_delete
+AFTER DELETE ON journal_lines
+BEGIN
+    UPDATE ledger_state SET edit_version = edit_version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_journal_entries_edit_version_update
+AFTER UPDATE OF entry_date ON journal_entries
+WHEN OLD.entry_date IS NOT NEW.entry_date
+BEGIN
+    UPDATE ledger_state SET edit_version = edit_version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_journal_entries_edit_version_delete
+AFTER DELETE ON journal_entries
+BEGIN
+    UPDATE ledger_state SET edit_version = edit_version + 1 WHERE id = 1;
+END;
@@ -0,0 +1,46 @@
+-- Minor-unit factor per currency (1 for KRW/JPY, 100 for USD/EUR). Rows are
+-- written by core.money.sync_currency_units from CURRENCY_CONFIG after the
+-- migrations run, so SQL never hardcodes a currency's precision; the
+-- is_default row is used for currencies that are not configured.
+CREATE TABLE IF NOT EXISTS currency_units (
+    currency TEXT PRIMARY KEY,
+    minor_factor INTEGER NOT NULL,
+    is_default INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+-- The posting services write debit/credit/native_minor on insert; keep them
+-- equal to the REAL amounts when those are edited afterwards.
+CREATE TRIGGER IF NOT EXISTS trg_journal_lines_minor_update
+AFTER UPDATE OF debit, credit, native_amount, native_currency ON journal_lines
+BEGIN
+    UPDATE journal_lines SET
+        debit_minor = CAST(ROUND(NEW.debit * (
+            COALESCE(
+                (SELECT minor_factor FROM currency_units WHERE currency = (
+                    SELECT base_currency FROM app_settings ORDER BY id DESC LIMIT 1
+                )),
+                (SELECT minor_factor FROM currency_units WHERE is_default = 1)
+            )
+        )) AS INTEGER),
+        credit_minor = CAST(ROUND(NEW.credit * (
+            COALESCE(
+                (SELECT minor_factor FROM currency_units WHERE currency = (
+                    SELECT base_currency FROM app_settings ORDER BY id DESC LIMIT 1
+                )),
+                (SELECT minor_factor FROM currency_units WHERE is_default = 1)
+            )
+        )) AS INTEGER),
+        native_minor = CASE
+            WHEN NEW.native_amount IS NULL THEN NULL
+            ELSE CAST(ROUND(NEW.native_amount * (
+                COALESCE(
+                    (SELECT minor_factor FROM currency_units WHERE currency = COALESCE(
+                        NEW.native_currency,
+                        (SELECT base_currency FROM app_settings ORDER BY id DESC LIMIT 1)
+                    )),
+                    (SELECT minor_factor FROM currency_units WHERE is_default = 1)
+                )
+            )) AS INTEGER)
+        END
+    WHERE id = NEW.id;
+END;
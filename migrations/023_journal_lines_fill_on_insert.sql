@@ -0,0 +1,29 @@
+-- The posting services now write signed_base, signed_native and entry_date
+-- in the INSERT itself. The fill trigger from migration 013 updated every
+-- new line right after inserting it, doubling the writes; it is recreated
+-- to fire only for raw inserts that left those columns unset or wrong.
+DROP TRIGGER IF EXISTS trg_journal_lines_signed_insert;
+CREATE TRIGGER IF NOT EXISTS trg_journal_lines_signed_insert
+AFTER INSERT ON journal_lines
+WHEN NEW.entry_date IS NULL
+  OR NEW.signed_base IS NOT (NEW.debit - NEW.credit)
+  OR NEW.signed_native IS NOT (
+      CASE
+          WHEN NEW.native_amount IS NOT NULL THEN (
+              CASE WHEN NEW.debit > 0 THEN NEW.native_amount ELSE -NEW.native_amount END
+          )
+          ELSE (NEW.debit - NEW.credit)
+      END
+  )
+BEGIN
+    UPDATE journal_lines SET
+        signed_base = NEW.debit - NEW.credit,
+        signed_native = CASE
+            WHEN NEW.native_amount IS NOT NULL THEN (
+                CASE WHEN NEW.debit > 0 THEN NEW.native_amount ELSE -NEW.native_amount END
+            )
+            ELSE (NEW.debit - NEW.credit)
+        END,
+        entry_date = (SELECT entry_date FROM journal_entries WHERE id = NEW.entry_id)
+    WHERE id = NEW.id;
+END;
@@ -0,0 +1,18 @@
+-- A line could be moved into a closed period by pointing its entry_id at an
+-- entry dated inside it, since only the line's old date was checked. The
+-- update guard now rejects the change when either the old date or the new
+-- entry's date falls in a closed period.
+DROP TRIGGER IF EXISTS trg_journal_lines_closed_update;
+CREATE TRIGGER IF NOT EXISTS trg_journal_lines_closed_update
+BEFORE UPDATE OF entry_id, account_id, debit, credit, native_amount ON journal_lines
+WHEN EXISTS (
+    SELECT 1 FROM closed_periods
+    WHERE reopened_at IS NULL AND OLD.entry_date BETWEEN start_date AND end_date
+) OR EXISTS (
+    SELECT 1 FROM closed_periods cp
+    JOIN journal_entries je ON je.id = NEW.entry_id
+    WHERE cp.reopened_at IS NULL AND je.entry_date BETWEEN cp.start_date AND cp.end_date
+)
+BEGIN
+    SELECT RAISE(ABORT, 'journal line is inside a closed period');
+END;
@@ -0,0 +1,199 @@
+-- Balance checkpoints per currency bucket. A native amount in one currency
+-- cannot be added to one in another, so an account that holds several
+-- currencies keeps one checkpoint series per currency. A line belongs to its
+-- native_currency when it has a native amount; plain base-currency lines go to
+-- the '' bucket, which readers label with the current base currency.
+DROP TRIGGER IF EXISTS trg_journal_lines_checkpoint_insert;
+DROP TRIGGER IF EXISTS trg_journal_lines_checkpoint_update;
+DROP TRIGGER IF EXISTS trg_journal_lines_checkpoint_delete;
+DROP TABLE IF EXISTS account_balance_checkpoints;
+
+CREATE TABLE IF NOT EXISTS account_balance_checkpoints (
+    account_id INTEGER NOT NULL,
+    currency TEXT NOT NULL,
+    period TEXT NOT NULL,
+    base_balance REAL NOT NULL DEFAULT 0.0,
+    native_balance REAL NOT NULL DEFAULT 0.0,
+    PRIMARY KEY (account_id, currency, period),
+    FOREIGN KEY (account_id) REFERENCES accounts (id)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS trg_journal_lines_checkpoint_insert
+AFTER INSERT ON journal_lines
+WHEN NEW.entry_date IS NOT NULL
+BEGIN
+    INSERT OR IGNORE INTO account_balance_checkpoints
+        (account_id, currency, period, base_balance, native_balance)
+    SELECT
+        NEW.account_id,
+        CASE WHEN NEW.native_amount IS NOT NULL THEN COALESCE(NEW.native_currency, '') ELSE '' END,
+        substr(NEW.entry_date, 1, 7),
+        COALESCE(prev.base_balance, 0.0),
+        COALESCE(prev.native_balance, 0.0)
+    FROM (SELECT 1) AS seed
+    LEFT JOIN (
+        SELECT base_balance, native_balance
+        FROM account_balance_checkpoints
+        WHERE account_id = NEW.account_id
+          AND currency = CASE WHEN NEW.native_amount IS NOT NULL THEN COALESCE(NEW.native_currency, '') ELSE '' END
+          AND period < substr(NEW.entry_date, 1, 7)
+        ORDER BY period DESC
+        LIMIT 1
+    ) AS prev ON 1 = 1;
+
+    UPDATE account_balance_checkpoints SET
+        base_balance = base_balance + (NEW.debit - NEW.credit),
+        native_balance = native_balance + CASE
+            WHEN NEW.native_amount IS NOT NULL THEN (
+                CASE WHEN NEW.debit > 0 THEN NEW.native_amount ELSE -NEW.native_amount END
+            )
+            ELSE (NEW.debit - NEW.credit)
+        END
+    WHERE account_id = NEW.account_id
+      AND currency = CASE WHEN NEW.native_amount IS NOT NULL THEN COALESCE(NEW.native_currency, '') ELSE '' END
+      AND period >= substr(NEW.entry_date, 1, 7);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_journal_lines_checkpoint_update
+AFTER UPDATE OF account_id, debit, credit, native_amount, native_currency, entry_date
+ON journal_lines
+WHEN OLD.account_id IS NOT NEW.account_id
+  OR OLD.debit IS NOT NEW.debit
+  OR OLD.credit IS NOT NEW.credit
+  OR OLD.native_amount IS NOT NEW.native_amount
+  OR OLD.native_currency IS NOT NEW.native_currency
+  OR OLD.entry_date IS NOT NEW.entry_date
+BEGIN
+    INSERT OR IGNORE INTO account_balance_checkpoints
+        (account_id, currency, period, base_balance, native_balance)
+    SELECT
+        NEW.account_id,
+        CASE WHEN NEW.native_amount IS NOT NULL THEN COALESCE(NEW.native_currency, '') ELSE '' END,
+        substr(NEW.entry_date, 1, 7),
+        COALESCE(prev.base_balance, 0.0),
+        COALESCE(prev.native_balance, 0.0)
+    FROM (SELECT 1) AS seed
+    LEFT JOIN (
+        SELECT base_balance, native_balance
+        FROM account_balance_checkpoints
+        WHERE account_id = NEW.account_id
+          AND currency = CASE WHEN NEW.native_amount IS NOT NULL THEN COALESCE(NEW.native_currency, '') ELSE '' END
+          AND period < substr(NEW.entry_date, 1, 7)
+        ORDER BY period DESC
+        LIMIT 1
+    ) AS prev ON 1 = 1
+    WHERE NEW.entry_date IS NOT NULL;
+
+    UPDATE account_balance_checkpoints SET
+        base_balance = base_balance + (NEW.debit - NEW.credit),
+        native_balance = native_balance + CASE
+            WHEN NEW.native_amount IS NOT NULL THEN (
+                CASE WHEN NEW.debit > 0 THEN NEW.native_amount ELSE -NEW.native_amount END
+            )
+            ELSE (NEW.debit - NEW.credit)
+        END
+    WHERE account_id = NEW.account_id
+      AND currency = CASE WHEN NEW.native_amount IS NOT NULL THEN COALESCE(NEW.native_currency, '') ELSE '' END
+      AND period >= substr(NEW.entry_date, 1, 7);
+
+    UPDATE account_balance_checkpoints SET
+        base_balance = base_balance - (OLD.debit - OLD.credit),
+        native_balance = native_balance - CASE
+            WHEN OLD.native_amount IS NOT NULL THEN (
+                CASE WHEN OLD.debit > 0 THEN OLD.native_amount ELSE -OLD.native_amount END
+            )
+            ELSE (OLD.debit - OLD.credit)
+        END
+    WHERE account_id = OLD.account_id
+      AND currency = CASE WHEN OLD.native_amount IS NOT NULL THEN COALESCE(OLD.native_currency, '') ELSE '' END
+      AND period >= substr(OLD.entry_date, 1, 7);
+
+    DELETE FROM account_balance_checkpoints
+    WHERE account_id = OLD.account_id
+      AND currency = CASE WHEN OLD.native_amount IS NOT NULL THEN COALESCE(OLD.native_currency, '') ELSE '' END
+      AND period = substr(OLD.entry_date, 1, 7)
+      AND NOT EXISTS (
+          SELECT 1 FROM journal_lines jl
+          WHERE jl.account_id = OLD.account_id
+            AND jl.entry_date >= substr(OLD.entry_date, 1, 7) || '-01'
+            AND jl.entry_date < date(substr(OLD.entry_date, 1, 7) || '-01', '+1 month')
+            AND CASE WHEN jl.native_amount IS NOT NULL THEN COALESCE(jl.native_currency, '') ELSE '' END
+                = CASE WHEN OLD.native_amount IS NOT NULL THEN COALESCE(OLD.native_currency, '') ELSE '' END
+      );
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_journal_lines_checkpoint_delete
+AFTER DELETE ON journal_lines
+WHEN OLD.entry_date IS NOT NULL
+BEGIN
+    UPDATE account_balance_checkpoints SET
+        base_balance = base_balance - (OLD.debit - OLD.credit),
+        native_balance = native_balance - CASE
+            WHEN OLD.native_amount IS NOT NULL THEN (
+                CASE WHEN OLD.debit > 0 THEN OLD.native_amount ELSE -OLD.native_amount END
+            )
+            ELSE (OLD.debit - OLD.credit)
+        END
+    WHERE account_id = OLD.account_id
+      AND currency = CASE WHEN OLD.native_amount IS NOT NULL THEN COALESCE(OLD.native_currency, '') ELSE '' END
+      AND period >= substr(OLD.entry_date, 1, 7);
+
+    DELETE FROM account_balance_checkpoints
+    WHERE account_id = OLD.account_id
+      AND currency = CASE WHEN OLD.native_amount IS NOT NULL THEN COALESCE(OLD.native_currency, '') ELSE '' END
+      AND period = substr(OLD.entry_date, 1, 7)
+      AND NOT EXISTS (
+          SELECT 1 FROM journal_lines jl
+          WHERE jl.account_id = OLD.account_id
+            AND jl.entry_date >= substr(OLD.entry_date, 1, 7) || '-01'
+            AND jl.entry_date < date(substr(OLD.entry_date, 1, 7) || '-01', '+1 month')
+            AND CASE WHEN jl.native_amount IS NOT NULL THEN COALESCE(jl.native_currency, '') ELSE '' END
+                = CASE WHEN OLD.native_amount IS NOT NULL THEN COALESCE(OLD.native_currency, '') ELSE '' END
+      );
+END;
+
+INSERT INTO account_balance_checkpoints
+    (account_id, currency, period, base_balance, native_balance)
+SELECT
+    m.account_id,
+    m.currency,
+    m.period,
+    SUM(m.base_change) OVER (PARTITION BY m.account_id, m.currency ORDER BY m.period),
+    SUM(m.native_change) OVER (PARTITION BY m.account_id, m.currency ORDER BY m.period)
+FROM (
+    SELECT
+        jl.account_id,
+        CASE WHEN jl.native_amount IS NOT NULL THEN COALESCE(jl.native_currency, '') ELSE '' END
+            AS currency,
+        substr(je.entry_date, 1, 7) AS period,
+        SUM(jl.debit - jl.credit) AS base_change,
+        SUM(
+            CASE
+                WHEN jl.native_amount IS NOT NULL THEN (
+                    CASE WHEN jl.debit > 0 THEN jl.native_amount ELSE -jl.native_amount END
+                )
+                ELSE (jl.debit - jl.credit)
+            END
+        ) AS native_change
+    FROM journal_lines jl
+    JOIN journal_entries je ON je.id = jl.entry_id
+    GROUP BY jl.account_id, 2, substr(je.entry_date, 1, 7)
+) m;
+
+-- LedgerEngine reports native balances in the account's own currency, so a
+-- line changing currency or an account changing currency is an edit too.
+DROP TRIGGER IF EXISTS trg_journal_lines_edit_version_update;
+CREATE TRIGGER IF NOT EXISTS trg_journal_lines_edit_version_update
+AFTER UPDATE OF entry_id, account_id, debit, credit, native_amount, native_currency,
+    signed_base, signed_native ON journal_lines
+WHEN OLD.entry_date IS NOT NULL
+BEGIN
+    UPDATE ledger_state SET edit_version = edit_version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_accounts_edit_version_currency
+AFTER UPDATE OF currency ON accounts
+WHEN OLD.currency IS NOT NEW.currency
+BEGIN
+    UPDATE ledger_state SET edit_version = edit_version + 1 WHERE id = 1;
+END;
@@ -0,0 +1,121 @@
+-- Running totals per account and currency bucket, the same buckets as the
+-- balance checkpoints of migration 025: a line belongs to its native
+-- currency when it has a native amount and to '' (the base currency)
+-- otherwise. native_total no longer adds amounts of different currencies,
+-- and current balances stay a primary-key range read per account. A bucket
+-- whose totals all return to zero (its lines moved or deleted) is dropped.
+DROP TRIGGER IF EXISTS trg_journal_lines_totals_insert;
+DROP TRIGGER IF EXISTS trg_journal_lines_totals_delete;
+DROP TRIGGER IF EXISTS trg_journal_lines_totals_update;
+DROP TABLE IF EXISTS account_totals;
+
+CREATE TABLE IF NOT EXISTS account_totals (
+    account_id INTEGER NOT NULL,
+    currency TEXT NOT NULL,
+    debit_total REAL NOT NULL DEFAULT 0.0,
+    credit_total REAL NOT NULL DEFAULT 0.0,
+    native_total REAL NOT NULL DEFAULT 0.0,
+    PRIMARY KEY (account_id, currency),
+    FOREIGN KEY (account_id) REFERENCES accounts (id)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS trg_journal_lines_totals_insert
+AFTER INSERT ON journal_lines
+BEGIN
+    INSERT INTO account_totals
+        (account_id, currency, debit_total, credit_total, native_total)
+    VALUES (
+        NEW.account_id,
+        CASE WHEN NEW.native_amount IS NOT NULL THEN COALESCE(NEW.native_currency, '') ELSE '' END,
+        NEW.debit,
+        NEW.credit,
+        CASE
+            WHEN NEW.native_amount IS NOT NULL THEN (
+                CASE WHEN NEW.debit > 0 THEN NEW.native_amount ELSE -NEW.native_amount END
+            )
+            ELSE (NEW.debit - NEW.credit)
+        END
+    )
+    ON CONFLICT (account_id, currency) DO UPDATE SET
+        debit_total = ROUND(debit_total + excluded.debit_total, 6),
+        credit_total = ROUND(credit_total + excluded.credit_total, 6),
+        native_total = ROUND(native_total + excluded.native_total, 6);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_journal_lines_totals_delete
+AFTER DELETE ON journal_lines
+BEGIN
+    UPDATE account_totals SET
+        debit_total = ROUND(debit_total - OLD.debit, 6),
+        credit_total = ROUND(credit_total - OLD.credit, 6),
+        native_total = ROUND(native_total - CASE
+            WHEN OLD.native_amount IS NOT NULL THEN (
+                CASE WHEN OLD.debit > 0 THEN OLD.native_amount ELSE -OLD.native_amount END
+            )
+            ELSE (OLD.debit - OLD.credit)
+        END, 6)
+    WHERE account_id = OLD.account_id
+      AND currency = CASE WHEN OLD.native_amount IS NOT NULL THEN COALESCE(OLD.native_currency, '') ELSE '' END;
+
+    DELETE FROM account_totals
+    WHERE account_id = OLD.account_id
+      AND currency = CASE WHEN OLD.native_amount IS NOT NULL THEN COALESCE(OLD.native_currency, '') ELSE '' END
+      AND debit_total = 0 AND credit_total = 0 AND native_total = 0;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_journal_lines_totals_update
+AFTER UPDATE OF account_id, debit, credit, native_amount, native_currency ON journal_lines
+BEGIN
+    UPDATE account_totals SET
+        debit_total = ROUND(debit_total - OLD.debit, 6),
+        credit_total = ROUND(credit_total - OLD.credit, 6),
+        native_total = ROUND(native_total - CASE
+            WHEN OLD.native_amount IS NOT NULL THEN (
+                CASE WHEN OLD.debit > 0 THEN OLD.native_amount ELSE -OLD.native_amount END
+            )
+            ELSE (OLD.debit - OLD.credit)
+        END, 6)
+    WHERE account_id = OLD.account_id
+      AND currency = CASE WHEN OLD.native_amount IS NOT NULL THEN COALESCE(OLD.native_currency, '') ELSE '' END;
+
+    DELETE FROM account_totals
+    WHERE account_id = OLD.account_id
+      AND currency = CASE WHEN OLD.native_amount IS NOT NULL THEN COALESCE(OLD.native_currency, '') ELSE '' END
+      AND debit_total = 0 AND credit_total = 0 AND native_total = 0;
+
+    INSERT INTO account_totals
+        (account_id, currency, debit_total, credit_total, native_total)
+    VALUES (
+        NEW.account_id,
+        CASE WHEN NEW.native_amount IS NOT NULL THEN COALESCE(NEW.native_currency, '') ELSE '' END,
+        NEW.debit,
+        NEW.credit,
+        CASE
+            WHEN NEW.native_amount IS NOT NULL THEN (
+                CASE WHEN NEW.debit > 0 THEN NEW.native_amount ELSE -NEW.native_amount END
+            )
+            ELSE (NEW.debit - NEW.credit)
+        END
+    )
+    ON CONFLICT (account_id, currency) DO UPDATE SET
+        debit_total = ROUND(debit_total + excluded.debit_total, 6),
+        credit_total = ROUND(credit_total + excluded.credit_total, 6),
+        native_total = ROUND(native_total + excluded.native_total, 6);
+END;
+
+INSERT INTO account_totals (account_id, currency, debit_total, credit_total, native_total)
+SELECT
+    jl.account_id,
+    CASE WHEN jl.native_amount IS NOT NULL THEN COALESCE(jl.native_currency, '') ELSE '' END,
+    ROUND(SUM(jl.debit), 6),
+    ROUND(SUM(jl.credit), 6),
+    ROUND(SUM(
+        CASE
+            WHEN jl.native_amount IS NOT NULL THEN (
+                CASE WHEN jl.debit > 0 THEN jl.native_amount ELSE -jl.native_amount END
+            )
+            ELSE (jl.debit - jl.credit)
+        END
+    ), 6)
+FROM journal_lines jl
+GROUP BY jl.account_id, 2;
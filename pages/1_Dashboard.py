@@ -4,13 +4,10 @@ import pandas as pd
 import streamlit as st
 
 from core.db import Session
-from core.services.asset_service import (
-    list_assets,
-    reconcile_asset_valuations_with_ledger,
-)
-from core.services.fx_service import get_latest_rate
+from core.services.asset_service import reconcile_asset_valuations_with_ledger
+from core.services.fx_service import FxRateBook
 from core.services.ledger_service import balance_sheet, income_statement
-from core.services.valuation_service import get_valuations_for_dashboard
+from core.services.report_service import net_worth_series
 from ui.utils import format_currency, get_currency_config, get_pandas_style_fmt
 
 st.set_page_config(page_title="Dashboard", page_icon="📊", layout="wide")
@@ -24,47 +21,35 @@ curr_cfg = get_currency_config(display_currency)
 
 def _get_dashboard_data(as_of, display_currency):
     with Session() as session:
-        bs = balance_sheet(session, as_of=as_of, display_currency=display_currency)
-        latest_vals = get_valuations_for_dashboard(session)
-        all_registered_assets = list_assets(session)
-        reconciliation = reconcile_asset_valuations_with_ledger(session, as_of=as_of)
+        # One rate book shared by every report on this page
+        fx_book = FxRateBook(session)
+        bs = balance_sheet(
+            session, as_of=as_of, display_currency=display_currency, fx_book=fx_book
+        )
+        reconciliation = reconcile_asset_valuations_with_ledger(
+            session, as_of=as_of, fx_book=fx_book
+        )
 
         # IS data
         start = date(as_of.year, as_of.month, 1)
         end = as_of
         income_stmt = income_statement(session, start=start, end=end)
 
-        # Need latest rates for manual valuations in base currency
-        # This part has complex logic using the connection, better keep it inside or prepare it.
-        registered_linked_ids = {
-            int(a["linked_account_id"]): a["id"] for a in all_registered_assets
-        }
-
-        valuation_base_total = 0.0
-        missing_rate_pairs = []
-
-        for acc in bs["assets"]:
-            acc_id = int(acc["id"])
-            asset_id = registered_linked_ids.get(acc_id)
-            manual_val = latest_vals.get(asset_id) if asset_id else None
-
-            if manual_val:
-                rate = get_latest_rate(
-                    session, bs["base_currency"], manual_val["currency"]
-                )
-                if rate is None:
-                    missing_rate_pairs.append(
-                        (bs["base_currency"], manual_val["currency"])
-                    )
-                else:
-                    valuation_base_total += manual_val["value_native"] * rate
-            else:
-                valuation_base_total += acc["book_value_base"]
+        # Ledger values with the latest asset valuations laid over them
+        valued = net_worth_series(
+            session,
+            start=as_of,
+            end=as_of,
+            freq="D",
+            display_currency=display_currency,
+            fx_book=fx_book,
+        )
+        point = valued["points"][0]
 
-        return bs, reconciliation, income_stmt, valuation_base_total, missing_rate_pairs
+        return bs, reconciliation, income_stmt, point, valued["missing_rates"]
 
 
-bs, reconciliation, is_, valuation_base_total, val_missing_rates = _get_dashboard_data(
+bs, reconciliation, is_, valued_point, val_missing_rates = _get_dashboard_data(
     as_of, display_currency
 )
 
@@ -77,12 +62,8 @@ fmt_base = get_pandas_style_fmt(base_cur)
 
 # --- Metrics Calculation ---
 total_book_value_base = bs["total_assets_base"]
-
-valuation_disp_total = valuation_base_total * (
-    bs["total_assets_disp"] / bs["total_assets_base"]
-    if bs["total_assets_base"] != 0
-    else 1.0
-)
+valuation_base_total = valued_point["valued_assets_base"]
+valuation_disp_total = valued_point["valued_assets_disp"]
 unrealized_pnl_base = valuation_base_total - total_book_value_base
 recon_items = reconciliation["items"]
 has_recon_delta = any(abs(item["delta_base"]) > 1e-6 for item in recon_items)
@@ -122,7 +103,7 @@ with st.expander("🔍 장부 vs 평가 상세 (KRW 기준)", expanded=False):
 
 if val_missing_rates:
     missing_pairs = ", ".join(f"{b}/{q}" for b, q in val_missing_rates)
-    st.warning(f"{missing_pairs} 환율이 없어 일부 평가값을 제외했습니다.")
+    st.warning(f"{missing_pairs} 환율이 없어 일부 값은 장부 기준으로 계산했습니다.")
 
 if reconciliation.get("missing_rates"):
     missing_pairs = ", ".join(
@@ -169,6 +150,49 @@ with st.expander("🧾 자산 평가 ↔ 장부 계정 대사", expanded=has_rec
     else:
         st.info("등록된 자산이 없습니다.")
 
+st.divider()
+st.subheader("순자산 추이")
+
+FREQ_LABELS = {"D": "일별", "W": "주별", "M": "월별", "Q": "분기별", "Y": "연별"}
+tc1, tc2 = st.columns([1, 1])
+with tc1:
+    trend_start = st.date_input(
+        "시작일", value=date(as_of.year - 1, as_of.month, 1), key="nw_start"
+    )
+with tc2:
+    trend_freq = st.selectbox(
+        "주기",
+        list(FREQ_LABELS),
+        index=2,
+        format_func=FREQ_LABELS.get,
+        key="nw_freq",
+    )
+
+with Session() as session:
+    trend = net_worth_series(
+        session,
+        start=trend_start,
+        end=as_of,
+        freq=trend_freq,
+        display_currency=display_currency,
+    )
+
+if trend["points"]:
+    trend_df = pd.DataFrame(trend["points"]).set_index("date")
+    st.line_chart(
+        trend_df[
+            ["net_worth_disp", "valued_net_worth_disp", "liabilities_disp"]
+        ].rename(
+            columns={
+                "net_worth_disp": "순자산 (장부)",
+                "valued_net_worth_disp": "순자산 (평가)",
+                "liabilities_disp": "부채",
+            }
+        )
+    )
+else:
+    st.info("표시할 기간이 없습니다.")
+
 st.divider()
 st.subheader("재무상태표(BS) 요약")
 
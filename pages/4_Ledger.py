@@ -1,12 +1,23 @@
+import os
+import tempfile
 from datetime import date
+from pathlib import Path
 
 import pandas as pd
 import streamlit as st
 
 from core.db import Session
-from core.services.ledger_service import trial_balance
+from core.services.export_service import write_journal_csv, write_journal_xlsx
+from core.services.ledger_service import (
+    account_ledger,
+    list_journal_entries_page,
+    list_journal_lines_page,
+    list_posting_accounts,
+    search_journal,
+    trial_balance,
+)
 from core.services.settings_service import get_base_currency
-from ui.utils import get_currency_config, get_pandas_style_fmt
+from ui.utils import format_currency, get_currency_config, get_pandas_style_fmt
 
 st.set_page_config(page_title="Ledger", page_icon="📚", layout="wide")
 
@@ -17,19 +28,98 @@ with c1:
     start = st.date_input("시작일", value=date(date.today().year, 1, 1))
 with c2:
     end = st.date_input("종료일", value=date.today())
+with c3:
+    page_size = st.selectbox("페이지 크기", [50, 100, 200], index=0)
+
+
+def _page_state(key: str, *extra_filters) -> dict:
+    """Cursor state for one paginated table; reset when the filters change."""
+    filters = (start, end, page_size, *extra_filters)
+    state = st.session_state.get(key)
+    if state is None or state["filters"] != filters:
+        state = {"filters": filters, "cursor": None, "direction": "next"}
+        st.session_state[key] = state
+    return state
+
+
+def _page_controls(key: str, page: dict) -> None:
+    p1, p2, _ = st.columns([1, 1, 6])
+    if p1.button("◀ 이전", key=f"{key}_prev", disabled=page["prev_cursor"] is None):
+        st.session_state[key].update(cursor=page["prev_cursor"], direction="prev")
+        st.rerun()
+    if p2.button("다음 ▶", key=f"{key}_next", disabled=page["next_cursor"] is None):
+        st.session_state[key].update(cursor=page["next_cursor"], direction="next")
+        st.rerun()
+
+
+def _discard_export() -> None:
+    """Delete the previously generated export file, if any."""
+    previous = st.session_state.pop("ledger_export", None)
+    if previous:
+        Path(previous[0]).unlink(missing_ok=True)
+
+
+with Session() as session:
+    base_cur = get_base_currency(session)
+base_cfg = get_currency_config(base_cur)
+fmt_base = get_pandas_style_fmt(base_cur)
+
+
+st.subheader("전표 검색")
+search_text = st.text_input(
+    "설명·메모 검색",
+    placeholder="예: 쿠팡 (여러 단어는 모두 포함된 항목)",
+    help="단어의 앞부분이 일치하는 전표 라인을 관련도 순으로 보여준다. 기간 필터와 무관하다.",
+)
+if search_text.strip():
+    search_state = _page_state("ledger_search_page", search_text)
+    with Session() as session:
+        search_page = search_journal(
+            session,
+            search_text,
+            limit=page_size,
+            cursor=search_state["cursor"],
+            direction=search_state["direction"],
+        )
+    results = pd.DataFrame(search_page["items"])
+    if results.empty:
+        st.info("검색 결과가 없습니다.")
+    else:
+        display_results = results.rename(
+            columns={
+                "entry_date": "날짜",
+                "entry_id": "전표ID",
+                "description": "설명",
+                "account": "계정",
+                "debit": "차변",
+                "credit": "대변",
+                "memo": "메모",
+            }
+        )[["날짜", "전표ID", "설명", "계정", "차변", "대변", "메모"]]
+        st.dataframe(
+            display_results.style.format({"차변": fmt_base, "대변": fmt_base}),
+            width="stretch",
+            hide_index=True,
+            column_config={
+                "차변": st.column_config.NumberColumn(),
+                "대변": st.column_config.NumberColumn(),
+            },
+        )
+        _page_controls("ledger_search_page", search_page)
 
 st.subheader("전표 목록")
 
-sql_entries = """
-    SELECT id, entry_date, description, source
-    FROM journal_entries
-    WHERE entry_date >= ? AND entry_date <= ?
-    ORDER BY entry_date DESC, id DESC
-"""
+entries_state = _page_state("ledger_entries_page")
 with Session() as session:
-    entries = pd.read_sql(
-        sql_entries, session, params=(start.isoformat(), end.isoformat())
+    entries_page = list_journal_entries_page(
+        session,
+        start=start,
+        end=end,
+        cursor=entries_state["cursor"],
+        limit=page_size,
+        direction=entries_state["direction"],
     )
+entries = pd.DataFrame(entries_page["items"])
 
 if not entries.empty:
     display_entries = entries.rename(
@@ -39,24 +129,24 @@ if not entries.empty:
             "description": "설명",
             "source": "출처",
         }
-    )
+    )[["전표ID", "날짜", "설명", "출처"]]
     st.dataframe(display_entries, width="stretch", hide_index=True)
+    _page_controls("ledger_entries_page", entries_page)
 
-sql_lines = """
-    SELECT je.entry_date, je.id AS entry_id, je.description,
-           a.name AS account, a.type,
-           jl.debit, jl.credit, jl.memo
-    FROM journal_lines jl
-    JOIN journal_entries je ON je.id = jl.entry_id
-    JOIN accounts a ON a.id = jl.account_id
-    WHERE je.entry_date >= ? AND je.entry_date <= ?
-    ORDER BY je.entry_date DESC, je.id DESC
-"""
+lines_state = _page_state("ledger_lines_page")
 with Session() as session:
-    lines = pd.read_sql(sql_lines, session, params=(start.isoformat(), end.isoformat()))
+    lines_page = list_journal_lines_page(
+        session,
+        start=start,
+        end=end,
+        cursor=lines_state["cursor"],
+        limit=page_size,
+        direction=lines_state["direction"],
+    )
+lines = pd.DataFrame(lines_page["items"])
 
 if not lines.empty:
-    display_lines = lines.rename(
+    display_lines = lines.drop(columns=["line_id"]).rename(
         columns={
             "entry_date": "날짜",
             "entry_id": "전표ID",
@@ -69,11 +159,6 @@ if not lines.empty:
         }
     )
 
-    with Session() as session:
-        base_cur = get_base_currency(session)
-    base_cfg = get_currency_config(base_cur)
-    fmt_base = get_pandas_style_fmt(base_cur)
-
     st.dataframe(
         display_lines.style.format({"차변": fmt_base, "대변": fmt_base}),
         width="stretch",
@@ -83,42 +168,173 @@ if not lines.empty:
             "대변": st.column_config.NumberColumn(),
         },
     )
+    _page_controls("ledger_lines_page", lines_page)
+
+st.subheader("전표 내보내기")
+ec1, ec2 = st.columns([1, 3])
+with ec1:
+    export_format = st.radio("형식", ["CSV", "XLSX"], horizontal=True)
+with ec2:
+    st.caption(
+        "선택한 기간의 전표 라인을 청크 단위로 파일에 기록한다. 기간이 길어도 메모리 사용량은 일정하다."
+    )
+
+if st.button("내보내기 파일 생성"):
+    suffix = ".csv" if export_format == "CSV" else ".xlsx"
+    _discard_export()
+    # The export stays on disk and the download button reads it from an open
+    # file; only its path is kept in session_state.
+    fd, name = tempfile.mkstemp(prefix="journal_", suffix=suffix)
+    with Session() as session:
+        if export_format == "CSV":
+            # utf-8-sig so Excel opens Korean text correctly
+            with open(fd, "w", encoding="utf-8-sig", newline="") as f:
+                row_count = write_journal_csv(session, f, start, end)
+        else:
+            # constant_memory needs a real file path.
+            os.close(fd)
+            row_count = write_journal_xlsx(session, name, start, end)
+    st.session_state["ledger_export"] = (name, suffix, row_count, start, end)
+
+ledger_export = st.session_state.get("ledger_export")
+if ledger_export and Path(ledger_export[0]).exists():
+    export_path, suffix, row_count, export_start, export_end = ledger_export
+    mime = (
+        "text/csv"
+        if suffix == ".csv"
+        else "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    )
+    with open(export_path, "rb") as export_file:
+        st.download_button(
+            f"다운로드 ({row_count:,}행)",
+            data=export_file,
+            file_name=(
+                f"journal_{export_start.isoformat()}_{export_end.isoformat()}{suffix}"
+            ),
+            mime=mime,
+        )
 
 st.divider()
 
 st.subheader("시산표(Trial Balance) - 기준일")
 as_of = st.date_input("시산표 기준일", value=end)
+show_rollups = st.checkbox("상위 계정 합계 표시", value=False)
 
 with Session() as session:
-    tb = trial_balance(session, as_of=as_of)
+    tb = trial_balance(session, as_of=as_of, rollups=show_rollups)
 tb_df = pd.DataFrame(tb)
 
 # show only non-zero by default
 show_zero = st.checkbox("0 잔액 계정도 표시", value=False)
 if not tb_df.empty and not show_zero:
-    tb_df = tb_df[(tb_df["debit"].abs() > 1e-9) | (tb_df["credit"].abs() > 1e-9)]
+    nonzero = (tb_df["debit"].abs() > 1e-9) | (tb_df["credit"].abs() > 1e-9)
+    if show_rollups:
+        nonzero |= tb_df["rollup_balance"].abs() > 1e-9
+    tb_df = tb_df[nonzero]
 
 if not tb_df.empty:
     tb_display = tb_df.rename(
-        columns={"account": "계정", "type": "유형", "debit": "차변", "credit": "대변"}
+        columns={
+            "account": "계정",
+            "type": "유형",
+            "debit": "차변",
+            "credit": "대변",
+            "rollup_balance": "하위 합계",
+        }
     )
-    # Get fmt_base again if it wasn't defined in this branch
-    with Session() as session:
-        base_cur = get_base_currency(session)
-    fmt_base = get_pandas_style_fmt(base_cur)
-
+    tb_columns = ["계정", "유형", "차변", "대변"]
+    if show_rollups:
+        tb_columns.append("하위 합계")
     st.dataframe(
-        tb_display[["계정", "유형", "차변", "대변"]].style.format(
-            {"차변": fmt_base, "대변": fmt_base}
+        tb_display[tb_columns].style.format(
+            {"차변": fmt_base, "대변": fmt_base, "하위 합계": fmt_base}
         ),
         width="stretch",
         hide_index=True,
         column_config={
             "차변": st.column_config.NumberColumn(),
             "대변": st.column_config.NumberColumn(),
+            "하위 합계": st.column_config.NumberColumn(),
         },
     )
 else:
     st.info("표시할 시산표 데이터가 없습니다.")
 
 st.caption("debit/credit은 raw_balance를 기준으로 양/음수 분리 표시한 값이다.")
+
+st.divider()
+
+st.subheader("계정별 원장")
+with Session() as session:
+    posting_accounts = list_posting_accounts(session)
+account_names = {
+    a["id"]: f"{a['name']} ({a['currency'] or base_cur})" for a in posting_accounts
+}
+ledger_account_id = st.selectbox(
+    "계정",
+    options=list(account_names),
+    format_func=account_names.get,
+    index=None,
+    placeholder="잔액을 대사할 계정을 선택하세요",
+)
+
+if ledger_account_id is not None:
+    ledger_state = _page_state("account_ledger_page", ledger_account_id)
+    # Forward-only keyset pages; earlier cursors are kept for the back button.
+    ledger_state.setdefault("history", [])
+    with Session() as session:
+        ledger_page = account_ledger(
+            session,
+            ledger_account_id,
+            start=start,
+            end=end,
+            cursor=ledger_state["cursor"],
+            limit=page_size,
+        )
+    account = next(a for a in posting_accounts if a["id"] == ledger_account_id)
+    account_cur = account["currency"] or base_cur
+    fmt_native = get_pandas_style_fmt(account_cur)
+
+    st.metric(
+        "기초 잔액" if ledger_state["cursor"] is None else "이전 페이지까지 잔액",
+        format_currency(ledger_page["opening_balance"]["base"], base_cur),
+    )
+    ledger_df = pd.DataFrame(ledger_page["items"])
+    if ledger_df.empty:
+        st.info("기간 내 전표 라인이 없습니다.")
+    else:
+        ledger_columns = {
+            "entry_date": "날짜",
+            "entry_id": "전표ID",
+            "description": "설명",
+            "memo": "메모",
+            "debit": "차변",
+            "credit": "대변",
+            "balance_base": "잔액",
+        }
+        ledger_format = {"차변": fmt_base, "대변": fmt_base, "잔액": fmt_base}
+        if account_cur != base_cur:
+            ledger_columns["balance_native"] = f"잔액({account_cur})"
+            ledger_format[f"잔액({account_cur})"] = fmt_native
+        st.dataframe(
+            ledger_df.rename(columns=ledger_columns)[
+                list(ledger_columns.values())
+            ].style.format(ledger_format),
+            width="stretch",
+            hide_index=True,
+        )
+
+    l1, l2, _ = st.columns([1, 1, 6])
+    if l1.button(
+        "◀ 이전", key="account_ledger_prev", disabled=not ledger_state["history"]
+    ):
+        ledger_state["cursor"] = ledger_state["history"].pop()
+        st.rerun()
+    if l2.button(
+        "다음 ▶",
+        key="account_ledger_next",
+        disabled=ledger_page["next_cursor"] is None,
+    ):
+        ledger_state["history"].append(ledger_state["cursor"])
+        ledger_state["cursor"] = ledger_page["next_cursor"]
+        st.rerun()
@@ -4,11 +4,13 @@ import pandas as pd
 import streamlit as st
 
 from core.db import Session
+from core.services.calendar_service import calendar_range
 from core.services.ledger_service import (
     balance_sheet,
     income_statement,
-    monthly_cashflow,
+    monthly_cash_balances,
 )
+from core.services.report_service import income_statement_matrix
 from core.services.settings_service import get_base_currency
 from ui.utils import format_currency, get_currency_config, get_pandas_style_fmt
 
@@ -19,9 +21,12 @@ st.title("리포트")
 st.subheader("재무상태표(BS)")
 as_of = st.date_input("기준일", value=date.today())
 display_currency = st.session_state.get("display_currency", "KRW")
+show_tree = st.toggle("계정 트리(상위 계정 합계)로 보기", value=False)
 
 with Session() as session:
-    bs = balance_sheet(session, as_of=as_of, display_currency=display_currency)
+    bs = balance_sheet(
+        session, as_of=as_of, display_currency=display_currency, rollups=show_tree
+    )
 
 if bs.get("missing_rates"):
     missing_pairs = ", ".join(f"{base}/{quote}" for base, quote in bs["missing_rates"])
@@ -44,9 +49,30 @@ def _prep_bs_df(items):
     return pd.DataFrame(data)
 
 
-assets_df = _prep_bs_df(bs["assets"])
-liab_df = _prep_bs_df(bs["liabilities"])
-eq_df = _prep_bs_df(bs["equity"])
+def _prep_bs_tree_df(nodes, account_type):
+    data = []
+    for n in nodes:
+        if n["type"] != account_type:
+            continue
+        indent = "\u3000" * (int(n["level"]) - 1)
+        data.append(
+            {
+                "계정": f"{indent}{n['name']}",
+                "통화": ", ".join(sorted(n["native_by_currency"])),
+                "평가가치(표시)": n["display_value"],
+            }
+        )
+    return pd.DataFrame(data, columns=["계정", "통화", "평가가치(표시)"])
+
+
+if show_tree:
+    assets_df = _prep_bs_tree_df(bs["tree"], "ASSET")
+    liab_df = _prep_bs_tree_df(bs["tree"], "LIABILITY")
+    eq_df = _prep_bs_tree_df(bs["tree"], "EQUITY")
+else:
+    assets_df = _prep_bs_df(bs["assets"])
+    liab_df = _prep_bs_df(bs["liabilities"])
+    eq_df = _prep_bs_df(bs["equity"])
 
 col1, col2, col3 = st.columns(3)
 with col1:
@@ -91,64 +117,162 @@ with c3:
 st.divider()
 
 st.subheader("손익계산서(IS)")
-col1, col2 = st.columns(2)
-with col1:
-    start = st.date_input("시작일", value=date(as_of.year, 1, 1), key="is_start")
-with col2:
-    end = st.date_input("종료일", value=as_of, key="is_end")
+is_tab, trend_tab = st.tabs(["기간 손익", "손익 추이"])
 
-with Session() as session:
-    is_ = income_statement(session, start=start, end=end)
-    base_currency = get_base_currency(session)
-base_cfg = get_currency_config(base_currency)
-fmt_base = get_pandas_style_fmt(base_currency)
+with is_tab:
+    col1, col2 = st.columns(2)
+    with col1:
+        start = st.date_input("시작일", value=date(as_of.year, 1, 1), key="is_start")
+    with col2:
+        end = st.date_input("종료일", value=as_of, key="is_end")
 
-col1, col2, col3 = st.columns(3)
-col1.metric("총 수익", format_currency(is_["total_income"], base_currency))
-col2.metric("총 비용", format_currency(is_["total_expense"], base_currency))
-col3.metric("순이익", format_currency(is_["net_profit"], base_currency))
+    with Session() as session:
+        is_ = income_statement(session, start=start, end=end)
+        base_currency = get_base_currency(session)
+    base_cfg = get_currency_config(base_currency)
+    fmt_base = get_pandas_style_fmt(base_currency)
 
-income_df = pd.DataFrame(is_["income"], columns=["수익", "금액"])
-expense_df = pd.DataFrame(is_["expense"], columns=["비용", "금액"])
+    col1, col2, col3 = st.columns(3)
+    col1.metric("총 수익", format_currency(is_["total_income"], base_currency))
+    col2.metric("총 비용", format_currency(is_["total_expense"], base_currency))
+    col3.metric("순이익", format_currency(is_["net_profit"], base_currency))
 
-c1, c2 = st.columns(2)
-with c1:
-    st.dataframe(
-        income_df,
-        width="stretch",
-        hide_index=True,
-        column_config={
-            "금액": st.column_config.NumberColumn(format=base_cfg["format"])
-        },
+    income_df = pd.DataFrame(is_["income"], columns=["수익", "금액"])
+    expense_df = pd.DataFrame(is_["expense"], columns=["비용", "금액"])
+
+    c1, c2 = st.columns(2)
+    with c1:
+        st.dataframe(
+            income_df,
+            width="stretch",
+            hide_index=True,
+            column_config={
+                "금액": st.column_config.NumberColumn(format=base_cfg["format"])
+            },
+        )
+    with c2:
+        st.dataframe(
+            expense_df,
+            width="stretch",
+            hide_index=True,
+            column_config={
+                "금액": st.column_config.NumberColumn(format=base_cfg["format"])
+            },
+        )
+
+with trend_tab:
+    FREQ_LABELS = {
+        "W": "주별",
+        "M": "월별",
+        "Q": "분기별",
+        "Y": "연별",
+        "FY": "회계연도별",
+    }
+    # The period buckets come from the calendar, filled at startup.
+    with Session() as session:
+        first_day, last_day = calendar_range(session)
+    tc1, tc2, tc3 = st.columns(3)
+    with tc1:
+        trend_start = st.date_input(
+            "시작일",
+            value=max(date(as_of.year - 1, 1, 1), first_day),
+            min_value=first_day,
+            max_value=last_day,
+            key="is_trend_start",
+        )
+    with tc2:
+        trend_end = st.date_input(
+            "종료일",
+            value=min(as_of, last_day),
+            min_value=first_day,
+            max_value=last_day,
+            key="is_trend_end",
+        )
+    with tc3:
+        trend_freq = st.selectbox(
+            "주기", list(FREQ_LABELS), format_func=FREQ_LABELS.get, key="is_freq"
+        )
+
+    with Session() as session:
+        matrix = income_statement_matrix(session, trend_start, trend_end, trend_freq)
+    period_cols = [
+        c for c in matrix.columns if c not in ("kind", "account_id", "account", "total")
+    ]
+
+    totals = matrix[
+        matrix["kind"].isin(["TOTAL_INCOME", "TOTAL_EXPENSE", "NET_PROFIT"])
+    ]
+    chart_df = totals.set_index("kind")[period_cols].T.rename(
+        columns={
+            "TOTAL_INCOME": "총 수익",
+            "TOTAL_EXPENSE": "총 비용",
+            "NET_PROFIT": "순이익",
+        }
     )
-with c2:
+    st.line_chart(chart_df)
+
+    label_map = {
+        "Total income": "총 수익",
+        "Total expense": "총 비용",
+        "Net profit": "순이익",
+    }
+    display_matrix = matrix.drop(columns=["kind", "account_id"]).assign(
+        account=matrix["account"].replace(label_map)
+    )
+    display_matrix = display_matrix.rename(columns={"account": "계정", "total": "합계"})
     st.dataframe(
-        expense_df,
+        display_matrix.style.format(dict.fromkeys([*period_cols, "합계"], fmt_base)),
         width="stretch",
         hide_index=True,
-        column_config={
-            "금액": st.column_config.NumberColumn(format=base_cfg["format"])
-        },
     )
 
 st.divider()
 
 st.subheader("월별 현금 변화(Cashflow proxy)")
-year = st.number_input("연도", min_value=2000, max_value=2100, value=as_of.year, step=1)
+yc1, yc2 = st.columns(2)
+with yc1:
+    year = st.number_input(
+        "연도", min_value=2000, max_value=2100, value=as_of.year, step=1
+    )
+with yc2:
+    end_year = st.number_input(
+        "종료 연도", min_value=int(year), max_value=2100, value=int(year), step=1
+    )
 with Session() as session:
-    cf = monthly_cashflow(session, year=int(year))
-cf_df = pd.DataFrame(cf)
+    cash_rows = monthly_cash_balances(session, int(year), int(end_year))
+cash_df = pd.DataFrame(cash_rows)
 
-if len(cf_df) == 0:
-    st.info("현금/예금 계정이 없거나 거래가 없다.")
+if len(cash_df) == 0:
+    st.info("현금성 계정이 없다. 설정에서 계정을 현금성으로 지정하세요.")
 else:
+    cf_df = (
+        cash_df.groupby("month", as_index=False)
+        .agg(
+            opening_balance=("opening_balance", "sum"),
+            net_change=("net_change", "sum"),
+            ending_balance=("ending_balance", "sum"),
+        )
+        .sort_values("month")
+    )
+    cf_columns = {
+        "month": "월",
+        "opening_balance": st.column_config.NumberColumn("기초잔액"),
+        "net_change": st.column_config.NumberColumn("순유입"),
+        "ending_balance": st.column_config.NumberColumn("기말잔액"),
+    }
+    cf_format = dict.fromkeys(
+        ["opening_balance", "net_change", "ending_balance"], fmt_base
+    )
     st.dataframe(
-        cf_df.style.format({"net_change": fmt_base, "ending_balance": fmt_base}),
+        cf_df.style.format(cf_format),
         width="stretch",
         hide_index=True,
-        column_config={
-            "month": "월",
-            "net_change": st.column_config.NumberColumn("순유입"),
-            "ending_balance": st.column_config.NumberColumn("기말잔액"),
-        },
+        column_config=cf_columns,
     )
+    with st.expander("계정별 상세"):
+        st.dataframe(
+            cash_df.drop(columns=["account_id"]).style.format(cf_format),
+            width="stretch",
+            hide_index=True,
+            column_config={"account": "계정", **cf_columns},
+        )
@@ -1,3 +1,5 @@
+from datetime import date
+
 import pandas as pd
 import streamlit as st
 
@@ -9,14 +11,32 @@ from core.services.account_service import (
     delete_user_account,
     get_account,
     get_parents_for_household_group,
+    list_account_subtree,
     update_user_account,
 )
 from core.services.fx_service import get_latest_rate, save_rate
+from core.services.integrity_service import (
+    integrity_status,
+    list_integrity_issues,
+    scan_integrity,
+)
+from core.services.ledger_service import list_accounts, list_posting_accounts
+from core.services.period_service import close_year, list_closed_periods, reopen_year
+from core.services.reclassification_service import (
+    list_reclassifications,
+    reclassify_lines,
+    undo_reclassification,
+)
 from core.services.settings_service import (
+    AMOUNT_STORAGE_MODES,
+    get_amount_storage,
     get_av_api_key,
     get_base_currency,
+    get_fiscal_year_start_month,
+    set_amount_storage,
     set_av_api_key,
     set_base_currency,
+    set_fiscal_year_start_month,
 )
 
 st.set_page_config(page_title="Settings", page_icon="⚙️", layout="wide")
@@ -62,6 +82,233 @@ with st.expander("🌐 전역 설정 (Global Settings)", expanded=True):
             st.success("API 키가 저장되었습니다.")
             st.rerun()
 
+    st.markdown("---")
+    with Session() as session:
+        current_storage = get_amount_storage(session)
+    storage_labels = {
+        "REAL": "실수 (기존 방식)",
+        "MINOR": "정수 최소 단위 (정확한 합계)",
+    }
+    new_storage = st.selectbox(
+        "금액 집계 방식",
+        options=list(AMOUNT_STORAGE_MODES),
+        index=AMOUNT_STORAGE_MODES.index(current_storage),
+        format_func=storage_labels.get,
+        help="정수 최소 단위(원, 센트)로 잔액을 합산하고 전표 대차를 검증합니다.",
+    )
+    if new_storage != current_storage:
+        if st.button("집계 방식 저장"):
+            with Session() as session:
+                set_amount_storage(session, new_storage)
+            st.success("금액 집계 방식이 변경되었습니다.")
+            st.rerun()
+
+    st.markdown("---")
+    with Session() as session:
+        current_fiscal_start = get_fiscal_year_start_month(session)
+    new_fiscal_start = st.selectbox(
+        "회계연도 시작 월",
+        options=list(range(1, 13)),
+        index=current_fiscal_start - 1,
+        format_func=lambda m: f"{m}월",
+        help="리포트의 회계연도별 집계 기준입니다. (예: 3월 시작 가계 연도)",
+    )
+    if new_fiscal_start != current_fiscal_start:
+        if st.button("회계연도 저장"):
+            with Session() as session:
+                set_fiscal_year_start_month(session, new_fiscal_start)
+            st.success("회계연도 시작 월이 변경되었습니다.")
+            st.rerun()
+
+with st.expander("🩺 장부 무결성 검사 (Integrity Scan)"):
+    with Session() as session:
+        scan_status = integrity_status(session)
+    s1, s2, s3 = st.columns(3)
+    s1.metric("검사 완료 전표 ID", scan_status["last_entry_id"])
+    s2.metric("검사 대기", scan_status["new_entries"] + scan_status["dirty_entries"])
+    s3.metric("발견된 문제", scan_status["issues"])
+    st.caption(f"마지막 검사: {scan_status['last_run_at'] or '없음'}")
+
+    b1, b2, _ = st.columns([1, 1, 4])
+    if b1.button("새/변경 전표 검사"):
+        with Session() as session:
+            result = scan_integrity(session)
+        st.success(f"{result['scanned_entries']}건의 전표를 검사했습니다.")
+        st.rerun()
+    if b2.button("전체 재검사"):
+        with Session() as session:
+            result = scan_integrity(session, full=True)
+        st.success(f"{result['scanned_entries']}건의 전표를 검사했습니다.")
+        st.rerun()
+
+    with Session() as session:
+        issues = list_integrity_issues(session)
+    if issues:
+        check_labels = {
+            "UNBALANCED": "대차 불일치",
+            "NON_POSTING_ACCOUNT": "집계 계정에 전기",
+            "MISSING_FX": "외화 정보 누락",
+            "ORPHAN_LINK": "존재하지 않는 전표 참조",
+        }
+        issues_df = pd.DataFrame(issues)
+        issues_df["check_name"] = issues_df["check_name"].map(check_labels)
+        st.dataframe(
+            issues_df.rename(
+                columns={
+                    "check_name": "검사 항목",
+                    "entry_id": "전표ID",
+                    "entry_date": "날짜",
+                    "description": "설명",
+                    "line_id": "라인ID",
+                    "ref_table": "참조 테이블",
+                    "ref_id": "참조 ID",
+                    "detail": "상세",
+                }
+            )[
+                [
+                    "검사 항목",
+                    "전표ID",
+                    "날짜",
+                    "설명",
+                    "라인ID",
+                    "참조 테이블",
+                    "참조 ID",
+                    "상세",
+                ]
+            ],
+            width="stretch",
+            hide_index=True,
+        )
+    elif scan_status["last_run_at"]:
+        st.success("발견된 문제가 없습니다.")
+
+with st.expander("📅 결산 마감 (Year-end Close)"):
+    st.caption(
+        "연도의 수익·비용을 자본 계정으로 대체하는 마감 전표를 만들고, 마감된 연도에는 "
+        "전표 입력을 막는다. 마감을 취소하면 마감 전표의 역분개가 자동으로 생성된다."
+    )
+    with Session() as session:
+        equity_accounts = [
+            a for a in list_posting_accounts(session) if a["type"] == "EQUITY"
+        ]
+        closed_periods = list_closed_periods(session)
+    equity_names = {a["id"]: a["name"] for a in equity_accounts}
+
+    cc1, cc2, cc3 = st.columns([1, 2, 1])
+    with cc1:
+        close_target = st.number_input(
+            "마감 연도",
+            min_value=2000,
+            max_value=2100,
+            value=date.today().year - 1,
+            step=1,
+        )
+    with cc2:
+        close_equity_id = st.selectbox(
+            "대체할 자본 계정",
+            options=list(equity_names),
+            format_func=equity_names.get,
+        )
+    with cc3:
+        st.write("")
+        if st.button("마감", disabled=close_equity_id is None):
+            try:
+                with Session() as session:
+                    closed = close_year(session, int(close_target), close_equity_id)
+                st.success(f"{closed['period']}년을 마감했습니다.")
+                st.rerun()
+            except ValueError as e:
+                st.error(str(e))
+
+    for cp in closed_periods:
+        pc1, pc2 = st.columns([4, 1])
+        pc1.write(
+            f"**{cp['period']}** · {cp['equity_account']} · "
+            f"당기순이익 {cp['net_income']:,.0f} · 마감 {cp['closed_at']}"
+        )
+        if pc2.button("마감 취소", key=f"reopen_{cp['id']}"):
+            try:
+                with Session() as session:
+                    reopen_year(session, int(cp["period"]))
+                st.success(f"{cp['period']}년 마감을 취소했습니다.")
+                st.rerun()
+            except ValueError as e:
+                st.error(str(e))
+
+with st.expander("🔀 분개 재분류 (Reclassify Lines)"):
+    st.caption(
+        "계정을 나눌 때(예: 식비 → 외식/장보기) 조건에 맞는 분개 라인을 한 번에 다른 "
+        "계정으로 옮긴다. 잔액 요약과 체크포인트도 함께 갱신되며, 실행 기록으로 되돌릴 수 있다."
+    )
+    with Session() as session:
+        source_names = {a["id"]: a["name"] for a in list_accounts(session)}
+        target_names = {a["id"]: a["name"] for a in list_posting_accounts(session)}
+        recent_reclasses = list_reclassifications(session)
+
+    rc1, rc2 = st.columns(2)
+    with rc1:
+        reclass_from = st.selectbox(
+            "원래 계정", options=list(source_names), format_func=source_names.get
+        )
+        reclass_start = st.date_input("시작일", value=None, key="reclass_start")
+        reclass_desc = st.text_input("적요 패턴 (LIKE)", placeholder="%배달%")
+    with rc2:
+        reclass_to = st.selectbox(
+            "옮길 계정", options=list(target_names), format_func=target_names.get
+        )
+        reclass_end = st.date_input("종료일", value=None, key="reclass_end")
+        reclass_memo = st.text_input("메모 패턴 (LIKE)", placeholder="%레스토랑%")
+    reclass_match = st.text_input("검색어", help="분개 검색과 같은 방식으로 찾습니다.")
+    reclass_args = {
+        "start": reclass_start,
+        "end": reclass_end,
+        "description_like": reclass_desc or None,
+        "memo_like": reclass_memo or None,
+        "match": reclass_match or None,
+    }
+
+    bc1, bc2 = st.columns(2)
+    if bc1.button("미리보기", disabled=reclass_from is None or reclass_to is None):
+        try:
+            with Session() as session:
+                preview = reclassify_lines(
+                    session, reclass_from, reclass_to, dry_run=True, **reclass_args
+                )
+            st.info(
+                f"라인 {preview['line_count']}건 (전표 {preview['entry_count']}건), "
+                f"금액 {preview['base_amount']:,.0f}"
+            )
+        except ValueError as e:
+            st.error(str(e))
+    if bc2.button("재분류 실행", disabled=reclass_from is None or reclass_to is None):
+        try:
+            with Session() as session:
+                moved = reclassify_lines(
+                    session, reclass_from, reclass_to, **reclass_args
+                )
+            st.success(f"라인 {moved['line_count']}건을 옮겼습니다.")
+            st.rerun()
+        except ValueError as e:
+            st.error(str(e))
+
+    for rc in recent_reclasses:
+        hc1, hc2 = st.columns([4, 1])
+        hc1.write(
+            f"**{rc['from_account']} → {rc['to_account']}** · {rc['line_count']}건 · "
+            f"{rc['base_amount']:,.0f} · {rc['created_at']}"
+            + (" · 취소됨" if rc["undone_at"] else "")
+        )
+        if not rc["undone_at"] and hc2.button(
+            "되돌리기", key=f"undo_reclass_{rc['id']}"
+        ):
+            try:
+                with Session() as session:
+                    undo_reclassification(session, int(rc["id"]))
+                st.success("재분류를 되돌렸습니다.")
+                st.rerun()
+            except ValueError as e:
+                st.error(str(e))
+
 st.divider()
 
 
@@ -123,6 +370,11 @@ def _dialog_edit_account(acc: dict):
                 else 0
             ),
         )
+        is_cash_equivalent = st.checkbox(
+            "현금성 계정 (현금흐름 집계 대상)",
+            value=bool(acc.get("is_cash_equivalent")),
+            disabled=acc["type"] != "ASSET",
+        )
 
         col1, col2 = st.columns(2)
         if col1.form_submit_button("저장", type="primary"):
@@ -134,6 +386,7 @@ def _dialog_edit_account(acc: dict):
                         name=name,
                         is_active=is_active,
                         currency=currency,
+                        is_cash_equivalent=is_cash_equivalent,
                     )
                     session.commit()
                 st.success("수정되었습니다.")
@@ -190,6 +443,11 @@ def _dialog_add_account_hierarchical(parent: dict | None, type_hint: str = "ASSE
                 else 0
             ),
         )
+        is_cash_equivalent = st.checkbox(
+            "현금성 계정 (현금흐름 집계 대상)",
+            value=bool(parent.get("is_cash_equivalent")) if parent else False,
+            help="자산 계정에만 적용됩니다. 하위 계정은 상위 계정 설정을 기본값으로 사용합니다.",
+        )
 
         col1, col2 = st.columns(2)
         if col1.form_submit_button("저장", type="primary"):
@@ -204,6 +462,7 @@ def _dialog_add_account_hierarchical(parent: dict | None, type_hint: str = "ASSE
                             type_=type_,
                             parent_id=parent["id"] if parent else None,
                             currency=currency,
+                            is_cash_equivalent=is_cash_equivalent,
                         )
                         session.commit()
                     st.success("추가되었습니다.")
@@ -287,18 +546,8 @@ with col_p:
 with col_c:
     st.write("**3. 상세 계정 (Level 2, 3)**")
     if selected_l1_id:
-        # Recursive helper to get descendants
-        def get_descendants(pid, depth=1):
-            children = [a for a in all_accounts if a["parent_id"] == pid]
-            results = []
-            for c in children:
-                c_copy = c.copy()
-                c_copy["depth"] = depth
-                results.append(c_copy)
-                results.extend(get_descendants(c["id"], depth + 1))
-            return results
-
-        l2or3_accounts = get_descendants(selected_l1_id)
+        with Session() as session:
+            l2or3_accounts = list_account_subtree(session, selected_l1_id)
         if l2or3_accounts:
             l23_df = pd.DataFrame(l2or3_accounts)
             l23_df["display_name"] = l23_df.apply(
@@ -14,10 +14,11 @@ def conn():
     conn = sqlite3.connect(":memory:", check_same_thread=False)
     conn.row_factory = sqlite3.Row
 
-    # Initialize schema
-    schema_path = ROOT / "core" / "schema.sql"
-    with open(schema_path, encoding="utf-8") as f:
-        conn.executescript(f.read())
+    # Initialize schema (baseline + numbered migrations)
+    from core.db import apply_migrations
+
+    apply_migrations(conn)
+    conn.commit()
 
     yield conn
     conn.close()
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from core.services.account_service import (
+    create_root_account,
+    create_user_account,
+    delete_user_account,
+    list_account_subtree,
+    list_household_accounts,
+    rebuild_account_closure,
+)
+
+
+def _closure(conn) -> set[tuple[int, int, int]]:
+    rows = conn.execute(
+        "SELECT ancestor_id, descendant_id, depth FROM account_closure"
+    ).fetchall()
+    return {tuple(r) for r in rows}
+
+
+def test_closure_follows_account_service(conn) -> None:
+    bank = create_root_account(conn, "보통예금", "ASSET")
+    kb = create_user_account(conn, "국민", "ASSET", parent_id=bank)
+    kb_salary = create_user_account(conn, "국민 급여통장", "ASSET", parent_id=kb)
+    shinhan = create_user_account(conn, "신한", "ASSET", parent_id=bank)
+
+    assert (bank, kb_salary, 2) in _closure(conn)
+    assert (kb, kb_salary, 1) in _closure(conn)
+    assert (kb_salary, kb_salary, 0) in _closure(conn)
+
+    subtree = list_account_subtree(conn, bank)
+    assert [(a["id"], a["depth"]) for a in subtree] == [
+        (kb, 1),
+        (kb_salary, 2),
+        (shinhan, 1),
+    ]
+    assert list_account_subtree(conn, bank, include_self=True)[0]["id"] == bank
+
+    groups = {a["id"]: a for a in list_household_accounts(conn)}
+    assert groups[kb_salary]["l1_name"] == "보통예금"
+    assert groups[kb_salary]["household_group"] == "Bank"
+
+    delete_user_account(conn, kb_salary)
+    assert not any(kb_salary in pair[:2] for pair in _closure(conn))
+
+    before = _closure(conn)
+    rebuild_account_closure(conn)
+    assert _closure(conn) == before
+
+
+def test_reparent_moves_whole_subtree(conn) -> None:
+    a = create_root_account(conn, "A", "ASSET")
+    b = create_root_account(conn, "B", "ASSET")
+    child = create_user_account(conn, "child", "ASSET", parent_id=a)
+    grandchild = create_user_account(conn, "grandchild", "ASSET", parent_id=child)
+
+    conn.execute("UPDATE accounts SET parent_id = ? WHERE id = ?", (b, child))
+
+    closure = _closure(conn)
+    assert (b, grandchild, 2) in closure
+    assert (a, grandchild, 2) not in closure
+    before = closure
+    rebuild_account_closure(conn)
+    assert _closure(conn) == before
@@ -0,0 +1,104 @@
+from datetime import date
+
+from core.models import JournalEntryInput, JournalLine
+from core.services.account_service import create_user_account
+from core.services.ledger_service import account_ledger, create_journal_entry
+
+
+def _setup(conn, basic_accounts):
+    bank = create_user_account(conn, "은행", "ASSET", basic_accounts["현금"])
+    salary = create_user_account(conn, "급여", "INCOME", basic_accounts["수익"])
+    food = create_user_account(conn, "식비", "EXPENSE", basic_accounts["비용"])
+    return bank, salary, food
+
+
+def _post(conn, entry_date, debit_account, credit_account, amount):
+    return create_journal_entry(
+        conn,
+        JournalEntryInput(
+            entry_date=entry_date,
+            description=f"{entry_date}",
+            lines=[
+                JournalLine(account_id=debit_account, debit=amount),
+                JournalLine(account_id=credit_account, credit=amount),
+            ],
+        ),
+    )
+
+
+def test_account_ledger_running_balance_across_pages(conn, basic_accounts):
+    bank, salary, food = _setup(conn, basic_accounts)
+    _post(conn, date(2024, 1, 25), bank, salary, 3000.0)
+    _post(conn, date(2024, 2, 3), food, bank, 100.0)
+    _post(conn, date(2024, 2, 10), food, bank, 200.0)
+    _post(conn, date(2024, 2, 25), bank, salary, 3000.0)
+    _post(conn, date(2024, 3, 1), food, bank, 50.0)
+    # Back-dated entry posted last still sorts by date.
+    _post(conn, date(2024, 2, 5), food, bank, 400.0)
+
+    first = account_ledger(conn, bank, start=date(2024, 2, 4), limit=2)
+    assert first["opening_balance"] == {"base": 2900.0, "native": 2900.0}
+    assert [i["balance_base"] for i in first["items"]] == [2500.0, 2300.0]
+
+    second = account_ledger(
+        conn, bank, start=date(2024, 2, 4), cursor=first["next_cursor"], limit=2
+    )
+    assert second["opening_balance"]["base"] == 2300.0
+    assert [i["entry_date"] for i in second["items"]] == ["2024-02-25", "2024-03-01"]
+    assert [i["balance_base"] for i in second["items"]] == [5300.0, 5250.0]
+    assert second["next_cursor"] is None
+
+    bounded = account_ledger(conn, bank, end=date(2024, 2, 5))
+    assert [i["balance_base"] for i in bounded["items"]] == [3000.0, 2900.0, 2500.0]
+
+
+def test_account_ledger_follows_entry_date_changes(conn, basic_accounts):
+    bank, salary, _ = _setup(conn, basic_accounts)
+    entry_id = _post(conn, date(2024, 1, 1), bank, salary, 10.0)
+    conn.execute(
+        "UPDATE journal_entries SET entry_date = '2024-05-01' WHERE id = ?",
+        (entry_id,),
+    )
+    page = account_ledger(conn, bank, start=date(2024, 4, 1))
+    assert [i["entry_date"] for i in page["items"]] == ["2024-05-01"]
+
+
+def test_account_ledger_native_balance_stays_in_account_currency(conn, basic_accounts):
+    usd = create_user_account(
+        conn, "달러예금", "ASSET", basic_accounts["현금"], currency="USD"
+    )
+    equity = basic_accounts["기초순자산(Opening Equity)"]
+    for entry_date, amount, native in (
+        (date(2024, 1, 10), 1300000.0, 1000.0),
+        (date(2024, 2, 10), 500000.0, None),
+        (date(2024, 2, 20), 130000.0, 100.0),
+    ):
+        usd_line = JournalLine(account_id=usd, debit=amount)
+        if native is not None:
+            usd_line = JournalLine(
+                account_id=usd,
+                debit=amount,
+                native_amount=native,
+                native_currency="USD",
+                fx_rate=amount / native,
+            )
+        create_journal_entry(
+            conn,
+            JournalEntryInput(
+                entry_date=entry_date,
+                description="입금",
+                lines=[usd_line, JournalLine(account_id=equity, credit=amount)],
+            ),
+        )
+
+    page = account_ledger(conn, usd)
+    assert [i["balance_native"] for i in page["items"]] == [1000.0, 1000.0, 1100.0]
+    assert [i["balance_base"] for i in page["items"]] == [
+        1300000.0,
+        1800000.0,
+        1930000.0,
+    ]
+
+    later = account_ledger(conn, usd, start=date(2024, 2, 15))
+    assert later["opening_balance"] == {"base": 1800000.0, "native": 1000.0}
+    assert [i["balance_native"] for i in later["items"]] == [1100.0]
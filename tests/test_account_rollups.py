@@ -0,0 +1,87 @@
+from datetime import date
+
+from core.models import JournalEntryInput, JournalLine
+from core.services.fx_service import save_rate
+from core.services.ledger_service import (
+    balance_sheet,
+    create_journal_entry,
+    trial_balance,
+)
+
+
+def _setup_tree(conn) -> None:
+    # 자산 > 보통예금 > (국민, 달러예금); 부채 > 카드; 자본 > 기초순자산
+    for acc in [
+        (1, "자산", "ASSET", None, 1, 0, "KRW"),
+        (11, "보통예금", "ASSET", 1, 2, 0, "KRW"),
+        (111, "국민", "ASSET", 11, 3, 1, "KRW"),
+        (112, "달러예금", "ASSET", 11, 3, 1, "USD"),
+        (12, "현금", "ASSET", 1, 2, 1, "KRW"),
+        (2, "부채", "LIABILITY", None, 1, 0, "KRW"),
+        (21, "카드", "LIABILITY", 2, 2, 1, "KRW"),
+        (3, "자본", "EQUITY", None, 1, 0, "KRW"),
+        (31, "기초순자산", "EQUITY", 3, 2, 1, "KRW"),
+    ]:
+        conn.execute(
+            """INSERT INTO accounts
+               (id, name, type, parent_id, level, allow_posting, currency)
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            acc,
+        )
+
+
+def _post(conn, debit_id, credit_id, amount, **native) -> None:
+    create_journal_entry(
+        conn,
+        JournalEntryInput(
+            entry_date=date(2024, 1, 10),
+            description="test",
+            lines=[
+                JournalLine(account_id=debit_id, debit=amount, credit=0.0, **native),
+                JournalLine(account_id=credit_id, debit=0.0, credit=amount),
+            ],
+        ),
+    )
+
+
+def test_trial_balance_rollups_sum_subtrees(conn) -> None:
+    _setup_tree(conn)
+    _post(conn, 111, 31, 1000.0)
+    _post(conn, 112, 31, 2600.0, native_amount=2.0, native_currency="USD")
+    _post(conn, 12, 21, 50.0)
+
+    rows = {r["account_id"]: r for r in trial_balance(conn, rollups=True)}
+
+    assert rows[11]["raw_balance"] == 0.0
+    assert rows[11]["rollup_balance"] == 3600.0
+    assert rows[11]["rollup_native"] == {"KRW": 1000.0, "USD": 2.0}
+    assert rows[1]["rollup_balance"] == 3650.0
+    assert rows[2]["rollup_balance"] == -50.0
+    assert rows[3]["rollup_balance"] == -3600.0
+    assert rows[112]["parent_id"] == 11
+    assert rows[112]["level"] == 3
+
+    assert "rollup_balance" not in trial_balance(conn)[0]
+
+
+def test_balance_sheet_tree_in_depth_first_order(conn) -> None:
+    _setup_tree(conn)
+    save_rate(conn, base="KRW", quote="USD", rate=1300.0)
+    _post(conn, 111, 31, 1000.0)
+    _post(conn, 112, 31, 2600.0, native_amount=2.0, native_currency="USD")
+
+    bs = balance_sheet(conn, rollups=True)
+    tree = bs["tree"]
+
+    # 현금 and 부채 have no balance and are left out.
+    assert [n["id"] for n in tree] == [1, 11, 111, 112, 3, 31]
+    nodes = {n["id"]: n for n in tree}
+    assert nodes[1]["current_value_base"] == bs["total_assets_base"]
+    assert abs(nodes[11]["current_value_base"] - (1000.0 + 2 * 1300)) < 1e-6
+    assert nodes[11]["native_by_currency"] == {"KRW": 1000.0, "USD": 2.0}
+    assert not nodes[11]["is_leaf"]
+    assert nodes[112]["is_leaf"]
+    # Equity is shown with flipped sign, like the flat items.
+    assert nodes[3]["book_value_base"] == bs["total_equity_base"] == 3600.0
+
+    assert "tree" not in balance_sheet(conn)
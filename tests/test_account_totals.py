@@ -0,0 +1,128 @@
+from datetime import date
+
+from core.models import JournalEntryInput, JournalLine
+from core.services.ledger_service import (
+    account_balances,
+    account_balances_multi,
+    create_journal_entry,
+)
+from core.services.totals_service import (
+    currency_totals,
+    current_balances,
+    rebuild_account_totals,
+    verify_account_totals,
+)
+
+
+def _setup_accounts(conn) -> tuple[int, int, int]:
+    for acc in [
+        (1101, "지갑", "ASSET", "KRW"),
+        (1102, "달러예금", "ASSET", "USD"),
+        (3101, "자본", "EQUITY", "KRW"),
+    ]:
+        conn.execute(
+            """INSERT INTO accounts (id, name, type, level, allow_posting, currency)
+               VALUES (?, ?, ?, 1, 1, ?)""",
+            acc,
+        )
+    return 1101, 1102, 3101
+
+
+def _post(conn, entry_date, debit_id, credit_id, amount, **native) -> int:
+    return create_journal_entry(
+        conn,
+        JournalEntryInput(
+            entry_date=entry_date,
+            description="test",
+            lines=[
+                JournalLine(account_id=debit_id, debit=amount, credit=0.0, **native),
+                JournalLine(account_id=credit_id, debit=0.0, credit=amount),
+            ],
+        ),
+    )
+
+
+def test_totals_follow_inserts_updates_and_deletes(conn) -> None:
+    cash, usd, equity = _setup_accounts(conn)
+
+    _post(conn, date(2024, 1, 5), cash, equity, 100.0)
+    entry_id = _post(
+        conn,
+        date(2024, 2, 1),
+        usd,
+        equity,
+        1300.0,
+        native_amount=1.0,
+        native_currency="USD",
+        fx_rate=1300.0,
+    )
+    balances = current_balances(conn)
+    assert balances[cash] == {"base": 100.0, "native": 100.0}
+    assert balances[usd] == {"base": 1300.0, "native": 1.0}
+    assert balances[equity] == {"base": -1400.0, "native": -1400.0}
+
+    # Direct edits (moving a line, changing amounts) are picked up by triggers.
+    conn.execute(
+        "UPDATE journal_lines SET account_id = ? WHERE account_id = ? AND debit > 0",
+        (usd, cash),
+    )
+    conn.execute(
+        "UPDATE journal_lines SET native_amount = 2.0 WHERE entry_id = ? AND debit > 0",
+        (entry_id,),
+    )
+    # The moved KRW line keeps its own bucket; native stays in USD.
+    balances = current_balances(conn)
+    assert cash not in balances
+    assert balances[usd] == {"base": 1400.0, "native": 2.0}
+    assert currency_totals(conn, "KRW", [usd])[usd] == {
+        "KRW": {"base": 100.0, "native": 100.0},
+        "USD": {"base": 1300.0, "native": 2.0},
+    }
+
+    conn.execute("DELETE FROM journal_lines WHERE entry_id = ?", (entry_id,))
+    balances = current_balances(conn, [usd, equity])
+    assert balances[usd] == {"base": 100.0, "native": 0.0}
+    assert balances[equity]["base"] == -100.0
+
+    assert verify_account_totals(conn) == []
+
+
+def test_current_balances_match_ledger_and_verify_reports_drift(conn) -> None:
+    cash, usd, equity = _setup_accounts(conn)
+    _post(conn, date(2024, 1, 5), cash, equity, 100.0)
+    _post(conn, date(2024, 3, 5), cash, equity, 50.0)
+
+    assert account_balances(conn)[cash] == 150.0
+    assert account_balances_multi(conn) == account_balances_multi(
+        conn, as_of=date(2024, 12, 31)
+    )
+
+    conn.execute(
+        "UPDATE account_totals SET debit_total = 999 WHERE account_id = ?", (cash,)
+    )
+    drift = verify_account_totals(conn)
+    assert [d["account_id"] for d in drift] == [cash]
+    assert drift[0]["expected_debit_total"] == 150.0
+    assert drift[0]["stored_debit_total"] == 999.0
+
+    rebuild_account_totals(conn)
+    assert verify_account_totals(conn) == []
+    assert current_balances(conn)[cash]["base"] == 150.0
+
+
+def test_totals_do_not_drift_over_many_small_postings(conn) -> None:
+    cash, _, equity = _setup_accounts(conn)
+    for day in range(1, 11):
+        _post(conn, date(2024, 1, day), cash, equity, 0.1)
+    conn.execute(
+        "UPDATE journal_lines SET debit = 0.2 WHERE entry_id = 1 AND debit > 0"
+    )
+    conn.execute(
+        "UPDATE journal_lines SET debit = 0.1 WHERE entry_id = 1 AND debit > 0"
+    )
+
+    row = conn.execute(
+        "SELECT debit_total, native_total FROM account_totals WHERE account_id = ?",
+        (cash,),
+    ).fetchone()
+    assert (row["debit_total"], row["native_total"]) == (1.0, 1.0)
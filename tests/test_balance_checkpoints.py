@@ -0,0 +1,125 @@
+from datetime import date
+
+from core.models import JournalEntryInput, JournalLine
+from core.services.checkpoint_service import (
+    NATIVE_SIGNED_SQL,
+    rebuild_checkpoints,
+    verify_checkpoints,
+)
+from core.services.ledger_service import account_balances_multi, create_journal_entry
+
+
+def _raw_balances(conn, as_of=None) -> dict[int, tuple[float, float]]:
+    sql = f"""
+        SELECT jl.account_id, SUM(jl.debit - jl.credit) AS base,
+               SUM({NATIVE_SIGNED_SQL}) AS native
+        FROM journal_lines jl
+        JOIN journal_entries je ON je.id = jl.entry_id
+        WHERE (? IS NULL OR je.entry_date <= ?)
+        GROUP BY jl.account_id
+    """
+    rows = conn.execute(sql, (as_of, as_of)).fetchall()
+    return {r["account_id"]: (r["base"], r["native"]) for r in rows}
+
+
+def _post(conn, entry_date, debit_id, credit_id, amount, **native):
+    create_journal_entry(
+        conn,
+        JournalEntryInput(
+            entry_date=entry_date,
+            description="test",
+            lines=[
+                JournalLine(account_id=debit_id, debit=amount, credit=0.0, **native),
+                JournalLine(account_id=credit_id, debit=0.0, credit=amount),
+            ],
+        ),
+    )
+
+
+def _setup_accounts(conn) -> tuple[int, int, int]:
+    for acc in [
+        (1101, "지갑", "ASSET", "KRW"),
+        (1102, "달러예금", "ASSET", "USD"),
+        (3101, "자본", "EQUITY", "KRW"),
+    ]:
+        conn.execute(
+            """INSERT INTO accounts (id, name, type, level, allow_posting, currency)
+               VALUES (?, ?, ?, 1, 1, ?)""",
+            acc,
+        )
+    return 1101, 1102, 3101
+
+
+def test_as_of_balances_match_raw_sums_with_backdated_entries(conn) -> None:
+    cash, usd, equity = _setup_accounts(conn)
+
+    _post(conn, date(2024, 3, 10), cash, equity, 300.0)
+    _post(conn, date(2024, 1, 5), cash, equity, 100.0)
+    _post(
+        conn,
+        date(2024, 2, 20),
+        usd,
+        equity,
+        1300.0,
+        native_amount=1.0,
+        native_currency="USD",
+        fx_rate=1300.0,
+    )
+    _post(conn, date(2024, 2, 25), equity, cash, 40.0)
+
+    for as_of in ["2023-12-31", "2024-01-31", "2024-02-24", "2024-03-01", "2024-12-31"]:
+        expected = _raw_balances(conn, as_of)
+        actual = account_balances_multi(conn, as_of=as_of)
+        assert {k: (v["base"], v["native"]) for k, v in actual.items()} == expected
+
+    current = account_balances_multi(conn)
+    assert current[cash] == {"base": 360.0, "native": 360.0}
+    assert current[usd] == {"base": 1300.0, "native": 1.0}
+    assert verify_checkpoints(conn) == []
+
+
+def test_verify_detects_drift_and_rebuild_repairs(conn) -> None:
+    cash, _, equity = _setup_accounts(conn)
+    _post(conn, date(2024, 1, 5), cash, equity, 100.0)
+    _post(conn, date(2024, 2, 5), cash, equity, 50.0)
+
+    conn.execute(
+        "UPDATE account_balance_checkpoints SET base_balance = 0 WHERE period = '2024-02'"
+    )
+    problems = verify_checkpoints(conn)
+    assert {(p["account_id"], p["period"]) for p in problems} == {
+        (cash, "2024-02"),
+        (equity, "2024-02"),
+    }
+
+    assert rebuild_checkpoints(conn) == 4
+    assert verify_checkpoints(conn) == []
+    assert account_balances_multi(conn)[cash]["base"] == 150.0
+
+
+def test_direct_edits_keep_checkpoints_exact(conn) -> None:
+    cash, _, equity = _setup_accounts(conn)
+    _post(conn, date(2024, 1, 5), cash, equity, 100.0)
+    _post(conn, date(2024, 3, 5), cash, equity, 50.0)
+
+    # Move the January entry past March, then change an amount in place.
+    conn.execute("UPDATE journal_entries SET entry_date = '2024-04-02' WHERE id = 1")
+    conn.execute(
+        "UPDATE journal_lines SET debit = 70.0 WHERE entry_id = 2 AND debit > 0"
+    )
+    conn.execute(
+        "UPDATE journal_lines SET credit = 70.0 WHERE entry_id = 2 AND credit > 0"
+    )
+    assert verify_checkpoints(conn) == []
+    periods = conn.execute(
+        "SELECT period FROM account_balance_checkpoints WHERE account_id = ?", (cash,)
+    ).fetchall()
+    assert [r[0] for r in periods] == ["2024-03", "2024-04"]
+
+    for as_of in ["2024-01-31", "2024-03-31", "2024-04-30"]:
+        expected = _raw_balances(conn, as_of)
+        actual = account_balances_multi(conn, as_of=as_of)
+        assert {k: (v["base"], v["native"]) for k, v in actual.items()} == expected
+
+    conn.execute("DELETE FROM journal_lines WHERE entry_id = 2")
+    assert verify_checkpoints(conn) == []
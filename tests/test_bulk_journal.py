@@ -0,0 +1,90 @@
+from datetime import date
+
+import pytest
+
+from core.models import JournalEntryInput, JournalLine
+from core.services.checkpoint_service import verify_checkpoints
+from core.services.ledger_service import (
+    account_balances,
+    create_journal_entries_bulk,
+    create_journal_entry,
+)
+
+
+def _entry(day: int, debit_id: int, credit_id: int, amount: float, credit=None):
+    return JournalEntryInput(
+        entry_date=date(2024, 1, day),
+        description=f"import {day}",
+        source="import",
+        lines=[
+            JournalLine(account_id=debit_id, debit=amount, credit=0.0, memo=""),
+            JournalLine(
+                account_id=credit_id,
+                debit=0.0,
+                credit=amount if credit is None else credit,
+                memo="",
+            ),
+        ],
+    )
+
+
+def test_bulk_posting_reports_errors_and_keeps_order(conn, basic_accounts) -> None:
+    cash = 110001
+    conn.execute(
+        """INSERT INTO accounts (id, name, type, parent_id, level, allow_posting)
+           VALUES (?, '지갑', 'ASSET', ?, 2, 1)""",
+        (cash, basic_accounts["현금"]),
+    )
+    equity = basic_accounts["기초순자산(Opening Equity)"]
+    first_id = create_journal_entry(conn, _entry(1, cash, equity, 10.0))
+
+    result = create_journal_entries_bulk(
+        conn,
+        [
+            _entry(2, cash, equity, 100.0),
+            _entry(3, cash, equity, 100.0, credit=90.0),
+            _entry(4, basic_accounts["현금"], equity, 5.0),
+            _entry(5, cash, equity, 20.0),
+        ],
+    )
+
+    ids = result["entry_ids"]
+    assert ids[0] == first_id + 1
+    assert ids[1] is None
+    assert ids[2] is None
+    assert ids[3] == first_id + 2
+    assert [e["index"] for e in result["errors"]] == [1, 2]
+    assert "Unbalanced entry" in result["errors"][0]["error"]
+
+    descriptions = conn.execute(
+        "SELECT id, description FROM journal_entries ORDER BY id"
+    ).fetchall()
+    assert [(r["id"], r["description"]) for r in descriptions][-2:] == [
+        (ids[0], "import 2"),
+        (ids[3], "import 5"),
+    ]
+    assert account_balances(conn)[cash] == 130.0
+    assert verify_checkpoints(conn) == []
+
+    # The AUTOINCREMENT sequence follows the explicitly assigned ids.
+    next_id = create_journal_entry(conn, _entry(6, cash, equity, 1.0))
+    assert next_id == ids[3] + 1
+
+
+def test_bulk_posting_stop_on_error_writes_nothing(conn, basic_accounts) -> None:
+    equity = basic_accounts["기초순자산(Opening Equity)"]
+    conn.execute(
+        """INSERT INTO accounts (id, name, type, parent_id, level, allow_posting)
+           VALUES (110001, '지갑', 'ASSET', ?, 2, 1)""",
+        (basic_accounts["현금"],),
+    )
+
+    with pytest.raises(ValueError, match="Entry #1"):
+        create_journal_entries_bulk(
+            conn,
+            [_entry(2, 110001, equity, 100.0), _entry(3, 110001, 999, 100.0)],
+            stop_on_error=True,
+            defer_foreign_keys=True,
+        )
+
+    assert conn.execute("SELECT COUNT(*) FROM journal_entries").fetchone()[0] == 0
@@ -0,0 +1,109 @@
+from datetime import date
+
+import pytest
+
+from core.models import JournalEntryInput, JournalLine
+from core.services.account_service import create_user_account
+from core.services.calendar_service import (
+    business_days,
+    calendar_range,
+    ensure_calendar,
+    korean_holidays,
+    populate_calendar,
+)
+from core.services.ledger_service import create_journal_entry
+from core.services.report_service import income_statement_matrix
+from core.services.settings_service import set_fiscal_year_start_month
+
+
+def _post(conn, entry_date, debit, credit, amount):
+    return create_journal_entry(
+        conn,
+        JournalEntryInput(
+            entry_date=entry_date,
+            description="test",
+            lines=[
+                JournalLine(account_id=debit, debit=amount),
+                JournalLine(account_id=credit, credit=amount),
+            ],
+        ),
+    )
+
+
+def test_korean_holidays_include_substitute_days():
+    holidays = korean_holidays(2024)
+    assert holidays[date(2024, 2, 10)] == "설날"
+    assert holidays[date(2024, 2, 12)] == "대체공휴일(설날)"
+    assert holidays[date(2024, 5, 6)] == "대체공휴일(어린이날)"
+    assert date(2024, 6, 8) not in holidays
+
+    # 부처님오신날 on 어린이날 earns one substitute day, 추석 on a Sunday another.
+    subs = [d for d, name in korean_holidays(2025).items() if name.startswith("대체")]
+    assert subs == [date(2025, 3, 3), date(2025, 5, 6), date(2025, 10, 8)]
+
+
+def test_calendar_rows_and_business_days(conn):
+    assert ensure_calendar(conn, date(2024, 1, 1), date(2024, 12, 31)) == 366
+    assert ensure_calendar(conn, date(2024, 5, 1), date(2024, 5, 31)) == 0
+
+    row = conn.execute("SELECT * FROM calendar WHERE date = '2024-12-30'").fetchone()
+    assert (row["period_id"], row["quarter"], row["week_id"]) == (202412, 4, 202501)
+
+    may = business_days(conn, date(2024, 5, 1), date(2024, 5, 31))
+    assert len(may) == 21
+    assert date(2024, 5, 6) not in may
+    assert date(2024, 5, 15) not in may
+    month = conn.execute(
+        "SELECT business_days FROM calendar_months WHERE period_id = 202405"
+    ).fetchone()
+    assert month[0] == 21
+
+
+def test_entries_carry_period_id(conn, basic_accounts):
+    bank = create_user_account(conn, "은행", "ASSET", basic_accounts["현금"])
+    food = create_user_account(conn, "식비", "EXPENSE", basic_accounts["비용"])
+    entry_id = _post(conn, date(2024, 3, 31), food, bank, 10.0)
+
+    period = "SELECT period_id FROM journal_entries WHERE id = ?"
+    assert conn.execute(period, (entry_id,)).fetchone()[0] == 202403
+    conn.execute(
+        "UPDATE journal_entries SET entry_date = '2024-04-01' WHERE id = ?",
+        (entry_id,),
+    )
+    assert conn.execute(period, (entry_id,)).fetchone()[0] == 202404
+
+
+def test_matrix_buckets_weeks_and_fiscal_years(conn, basic_accounts):
+    bank = create_user_account(conn, "은행", "ASSET", basic_accounts["현금"])
+    salary = create_user_account(conn, "급여", "INCOME", basic_accounts["수익"])
+    food = create_user_account(conn, "식비", "EXPENSE", basic_accounts["비용"])
+    _post(conn, date(2024, 1, 7), food, bank, 100.0)
+    _post(conn, date(2024, 1, 8), food, bank, 50.0)
+    _post(conn, date(2024, 2, 25), bank, salary, 1000.0)
+    _post(conn, date(2024, 3, 25), bank, salary, 2000.0)
+    ensure_calendar(conn, 2024, 2024)
+
+    weekly = income_statement_matrix(conn, date(2024, 1, 1), date(2024, 1, 14), "W")
+    food_row = weekly.set_index("account").loc["식비"]
+    assert (food_row["2024-W01"], food_row["2024-W02"]) == (100.0, 50.0)
+
+    set_fiscal_year_start_month(conn, 3)
+    fiscal = income_statement_matrix(conn, date(2024, 1, 1), date(2024, 12, 31), "FY")
+    net = fiscal.set_index("kind").loc["NET_PROFIT"]
+    assert (net["FY2023"], net["FY2024"]) == (850.0, 2000.0)
+
+
+def test_reports_read_a_calendar_filled_at_startup(conn, basic_accounts):
+    bank = create_user_account(conn, "은행", "ASSET", basic_accounts["현금"])
+    food = create_user_account(conn, "식비", "EXPENSE", basic_accounts["비용"])
+    _post(conn, date(1998, 7, 1), food, bank, 10.0)
+
+    with pytest.raises(ValueError, match="Calendar"):
+        income_statement_matrix(conn, date(1998, 1, 1), date(1998, 12, 31), "M")
+    assert conn.execute("SELECT COUNT(*) FROM calendar").fetchone()[0] == 0
+
+    populate_calendar(conn, today=date(2024, 6, 1))
+    assert calendar_range(conn) == (date(1998, 1, 1), date(2034, 12, 31))
+    assert populate_calendar(conn, today=date(2024, 6, 1)) == 0
+    matrix = income_statement_matrix(conn, date(1998, 1, 1), date(1998, 12, 31), "Y")
+    assert matrix.set_index("account").loc["식비", "1998"] == 10.0
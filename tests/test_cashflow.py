@@ -0,0 +1,73 @@
+from datetime import date
+
+from core.models import JournalEntryInput, JournalLine
+from core.services.account_service import (
+    create_root_account,
+    create_user_account,
+    update_user_account,
+)
+from core.services.ledger_service import (
+    create_journal_entry,
+    monthly_cash_balances,
+    monthly_cashflow,
+)
+
+
+def _post(conn, entry_date, debit_id, credit_id, amount) -> None:
+    create_journal_entry(
+        conn,
+        JournalEntryInput(
+            entry_date=entry_date,
+            description="test",
+            lines=[
+                JournalLine(account_id=debit_id, debit=amount, credit=0.0),
+                JournalLine(account_id=credit_id, debit=0.0, credit=amount),
+            ],
+        ),
+    )
+
+
+def _setup(conn) -> dict[str, int]:
+    bank = create_root_account(conn, "은행", "ASSET", is_cash_equivalent=True)
+    kb = create_user_account(conn, "국민", "ASSET", parent_id=bank)
+    stock = create_root_account(conn, "주식", "ASSET")
+    salary = create_root_account(conn, "급여", "INCOME")
+    food = create_root_account(conn, "식비", "EXPENSE")
+    return {"kb": kb, "stock": stock, "salary": salary, "food": food}
+
+
+def test_cash_flag_is_inherited_and_drives_cashflow(conn) -> None:
+    ids = _setup(conn)
+    flags = dict(conn.execute("SELECT id, is_cash_equivalent FROM accounts"))
+    assert flags[ids["kb"]] == 1
+    assert flags[ids["stock"]] == 0
+
+    _post(conn, date(2023, 12, 20), ids["kb"], ids["salary"], 1000.0)
+    _post(conn, date(2024, 1, 25), ids["kb"], ids["salary"], 3000.0)
+    _post(conn, date(2024, 3, 2), ids["food"], ids["kb"], 400.0)
+    _post(conn, date(2024, 3, 5), ids["stock"], ids["kb"], 500.0)
+
+    cf = monthly_cashflow(conn, 2024)
+    assert [m["net_change"] for m in cf[:4]] == [3000.0, 0.0, -900.0, 0.0]
+    assert cf[0]["ending_balance"] == 4000.0
+    assert cf[-1]["ending_balance"] == 3100.0
+
+    rows = monthly_cash_balances(conn, 2023, 2024)
+    assert len(rows) == 24
+    jan = next(r for r in rows if r["month"] == "2024-01")
+    assert (jan["opening_balance"], jan["net_change"], jan["ending_balance"]) == (
+        1000.0,
+        3000.0,
+        4000.0,
+    )
+    assert rows[0] == {
+        "account_id": ids["kb"],
+        "account": "국민",
+        "month": "2023-01",
+        "opening_balance": 0.0,
+        "net_change": 0.0,
+        "ending_balance": 0.0,
+    }
+
+    update_user_account(conn, ids["kb"], "국민", True, is_cash_equivalent=False)
+    assert monthly_cash_balances(conn, 2024) == []
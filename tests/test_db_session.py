@@ -0,0 +1,87 @@
+import threading
+
+import pytest
+
+from core import db
+from core.db import Session, configure_connections, connection_stats
+
+
+@pytest.fixture
+def pooled_db(tmp_path):
+    previous = db._manager
+    configure_connections(db_path=tmp_path / "pool.db")
+    with Session() as conn:
+        conn.execute("CREATE TABLE t (v INTEGER)")
+    yield
+    db._manager.close_all()
+    db._manager = previous
+
+
+def test_sessions_reuse_one_tuned_connection(pooled_db) -> None:
+    with Session() as first:
+        mode = first.execute("PRAGMA journal_mode").fetchone()[0]
+        fk = first.execute("PRAGMA foreign_keys").fetchone()[0]
+    with Session() as second:
+        pass
+
+    assert first is second
+    assert mode == "wal"
+    assert fk == 1
+    assert connection_stats()["opened"] == 1
+    assert connection_stats()["reused"] == 2
+
+
+def _insert_then_fail(value: int) -> None:
+    with Session() as conn:
+        conn.execute("INSERT INTO t (v) VALUES (?)", (value,))
+        raise RuntimeError("boom")
+
+
+def _nested_insert_then_fail(value: int) -> None:
+    with Session() as outer:
+        with Session() as inner:
+            inner.execute("INSERT INTO t (v) VALUES (?)", (value,))
+        assert outer.in_transaction
+        raise RuntimeError("outer failure")
+
+
+def test_session_commit_and_rollback(pooled_db) -> None:
+    with Session() as conn:
+        conn.execute("INSERT INTO t (v) VALUES (1)")
+
+    with pytest.raises(RuntimeError):
+        _insert_then_fail(2)
+
+    with Session() as conn:
+        assert [r[0] for r in conn.execute("SELECT v FROM t")] == [1]
+
+
+def test_nested_sessions_commit_once(pooled_db) -> None:
+    with pytest.raises(RuntimeError):
+        _nested_insert_then_fail(3)
+
+    with Session() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+
+
+def test_connections_of_finished_threads_are_closed(pooled_db) -> None:
+    def worker() -> None:
+        with Session() as conn:
+            conn.execute("INSERT INTO t (v) VALUES (4)")
+
+    for _ in range(3):
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+
+    # Only the test thread's own connection is left open.
+    assert connection_stats()["open_connections"] == 1
+    assert connection_stats()["opened"] == 4
+    with Session() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 3
+
+
+def test_session_acquires_on_enter(pooled_db) -> None:
+    session = Session()
+    assert session.conn is None
+    assert connection_stats()["reused"] == 0
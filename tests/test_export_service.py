@@ -0,0 +1,66 @@
+import csv
+import io
+from datetime import date
+
+from openpyxl import load_workbook
+
+from core.models import JournalEntryInput, JournalLine
+from core.services.export_service import (
+    JOURNAL_EXPORT_COLUMNS,
+    iter_journal_rows,
+    write_journal_csv,
+    write_journal_xlsx,
+)
+from core.services.ledger_service import create_journal_entry
+
+
+def _seed(conn, basic_accounts) -> None:
+    cash = 110001
+    conn.execute(
+        """INSERT INTO accounts (id, name, type, parent_id, level, allow_posting)
+           VALUES (?, '지갑', 'ASSET', ?, 2, 1)""",
+        (cash, basic_accounts["현금"]),
+    )
+    equity = basic_accounts["기초순자산(Opening Equity)"]
+    for day in range(1, 6):
+        create_journal_entry(
+            conn,
+            JournalEntryInput(
+                entry_date=date(2024, 1, day),
+                description=f"쿠팡 {day}",
+                lines=[
+                    JournalLine(account_id=cash, debit=100.0 * day, memo="in"),
+                    JournalLine(account_id=equity, credit=100.0 * day, memo="eq"),
+                ],
+            ),
+        )
+
+
+def test_rows_are_read_in_fixed_size_chunks(conn, basic_accounts) -> None:
+    _seed(conn, basic_accounts)
+
+    chunks = list(iter_journal_rows(conn, date(2024, 1, 2), date(2024, 1, 4), 4))
+
+    assert [len(c) for c in chunks] == [4, 2]
+    assert chunks[0][0][:3] == ("2024-01-02", 2, "쿠팡 2")
+    assert len(chunks[0][0]) == len(JOURNAL_EXPORT_COLUMNS)
+
+
+def test_csv_and_xlsx_export(conn, basic_accounts, tmp_path) -> None:
+    _seed(conn, basic_accounts)
+
+    out = io.StringIO()
+    assert write_journal_csv(conn, out, "2024-01-01", "2024-01-31", chunk_size=3) == 10
+    rows = list(csv.reader(io.StringIO(out.getvalue())))
+    assert rows[0] == JOURNAL_EXPORT_COLUMNS
+    assert rows[1][5] == "지갑"
+
+    path = tmp_path / "journal.xlsx"
+    assert (
+        write_journal_xlsx(conn, path, "2024-01-01", "2024-01-31", chunk_size=3) == 10
+    )
+    sheet = load_workbook(path, read_only=True)["journal"]
+    values = list(sheet.iter_rows(values_only=True))
+    assert list(values[0]) == JOURNAL_EXPORT_COLUMNS
+    assert len(values) == 11
+    assert values[-1][8] == 500.0
@@ -0,0 +1,120 @@
+from datetime import date, datetime
+
+from core.models import JournalEntryInput, JournalLine
+from core.services.fx_service import FxRateBook, save_rate
+from core.services.ledger_service import balance_sheet, create_journal_entry
+
+
+def test_rate_book_as_of_lookups(conn) -> None:
+    save_rate(conn, "KRW", "USD", 1300.0, as_of=datetime(2024, 1, 1, 9, 0))
+    save_rate(conn, "KRW", "USD", 1350.0, as_of=datetime(2024, 2, 1, 9, 0))
+    save_rate(conn, "KRW", "JPY", 9.0, as_of=datetime(2024, 1, 15))
+
+    book = FxRateBook(conn, pairs=[("KRW", "USD")])
+
+    assert book.rate("KRW", "KRW") == 1.0
+    assert book.rate("KRW", "USD") == 1350.0
+    assert book.rate("KRW", "USD", as_of=date(2023, 12, 31)) is None
+    assert book.rate("KRW", "USD", as_of=date(2024, 1, 1)) == 1300.0
+    assert book.rate("KRW", "USD", as_of="2024-01-31") == 1300.0
+    assert book.rate("KRW", "USD", as_of=date(2024, 2, 1)) == 1350.0
+    # Pairs outside the initial set are loaded on demand.
+    assert book.rate("KRW", "JPY") == 9.0
+    assert book.rate("KRW", "EUR") is None
+
+
+def test_rate_book_reloads_after_save_rate(conn) -> None:
+    save_rate(conn, "KRW", "USD", 1300.0, as_of=datetime(2024, 1, 1))
+    book = FxRateBook(conn)
+    assert book.rate("KRW", "USD") == 1300.0
+
+    save_rate(conn, "KRW", "USD", 1400.0, as_of=datetime(2024, 3, 1))
+    assert book.rate("KRW", "USD") == 1400.0
+
+
+def test_balance_sheet_uses_shared_book_without_rate_queries(conn) -> None:
+    conn.execute(
+        """INSERT INTO accounts (id, name, type, level, allow_posting, currency)
+           VALUES (1401, '달러예금', 'ASSET', 1, 1, 'USD'),
+                  (3400, '자본', 'EQUITY', 1, 1, 'KRW')"""
+    )
+    create_journal_entry(
+        conn,
+        JournalEntryInput(
+            entry_date=date(2024, 1, 2),
+            description="USD",
+            lines=[
+                JournalLine(
+                    account_id=1401,
+                    debit=1300.0,
+                    credit=0.0,
+                    native_amount=1.0,
+                    native_currency="USD",
+                    fx_rate=1300.0,
+                ),
+                JournalLine(account_id=3400, debit=0.0, credit=1300.0),
+            ],
+        ),
+    )
+    save_rate(conn, "KRW", "USD", 1500.0, as_of=datetime(2024, 1, 1))
+    book = FxRateBook(conn)
+
+    statements: list[str] = []
+    conn.set_trace_callback(statements.append)
+    bs = balance_sheet(conn, display_currency="USD", fx_book=book)
+    conn.set_trace_callback(None)
+
+    assert not [s for s in statements if "fx_rates" in s]
+    assert bs["total_assets_base"] == 1500.0
+    assert bs["total_assets_disp"] == 1.0
+
+
+def test_daily_series_is_forward_filled(conn) -> None:
+    save_rate(conn, "KRW", "USD", 1300.0, as_of=datetime(2024, 1, 2, 15, 30))
+    save_rate(conn, "KRW", "USD", 1320.0, as_of=datetime(2024, 1, 4))
+    book = FxRateBook(conn)
+
+    series = book.daily_series("KRW", "USD", date(2024, 1, 1), date(2024, 1, 5))
+    assert series == [None, 1300.0, 1300.0, 1320.0, 1320.0]
+    assert book.daily_series(
+        "KRW", "USD", date(2023, 12, 31), date(2024, 1, 1), backfill=True
+    ) == [1300.0, 1300.0]
+    assert book.rate("KRW", "USD", as_of=date(2024, 1, 3)) == 1300.0
+
+
+def test_past_balance_sheet_uses_rate_in_effect(conn) -> None:
+    conn.execute(
+        """INSERT INTO accounts (id, name, type, level, allow_posting, currency)
+           VALUES (1401, '달러예금', 'ASSET', 1, 1, 'USD'),
+                  (3400, '자본', 'EQUITY', 1, 1, 'KRW')"""
+    )
+    create_journal_entry(
+        conn,
+        JournalEntryInput(
+            entry_date=date(2023, 12, 1),
+            description="USD",
+            lines=[
+                JournalLine(
+                    account_id=1401,
+                    debit=1200.0,
+                    credit=0.0,
+                    native_amount=1.0,
+                    native_currency="USD",
+                    fx_rate=1200.0,
+                ),
+                JournalLine(account_id=3400, debit=0.0, credit=1200.0),
+            ],
+        ),
+    )
+    save_rate(conn, "KRW", "USD", 1250.0, as_of=datetime(2023, 12, 1))
+    save_rate(conn, "KRW", "USD", 1400.0, as_of=datetime(2024, 6, 1))
+    book = FxRateBook(conn)
+
+    december = balance_sheet(conn, as_of=date(2023, 12, 31), fx_book=book)
+    june = balance_sheet(conn, as_of=date(2024, 6, 30), fx_book=book)
+    latest = balance_sheet(conn, fx_book=book)
+
+    assert december["total_assets_base"] == 1250.0
+    assert june["total_assets_base"] == 1400.0
+    assert latest["total_assets_base"] == 1400.0
+    assert december["missing_rates"] == []
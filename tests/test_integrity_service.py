@@ -0,0 +1,101 @@
+from datetime import date
+
+from core.models import JournalEntryInput, JournalLine
+from core.services.account_service import create_user_account
+from core.services.integrity_service import (
+    integrity_status,
+    list_integrity_issues,
+    scan_integrity,
+)
+from core.services.ledger_service import create_journal_entry
+
+
+def _setup(conn, basic_accounts):
+    cash = create_user_account(conn, "지갑", "ASSET", basic_accounts["현금"])
+    usd = create_user_account(
+        conn, "달러 통장", "ASSET", basic_accounts["현금"], currency="USD"
+    )
+    food = create_user_account(conn, "식비", "EXPENSE", basic_accounts["비용"])
+    return cash, usd, food
+
+
+def _post(conn, debit_account, credit_account, amount=1000.0):
+    return create_journal_entry(
+        conn,
+        JournalEntryInput(
+            entry_date=date(2024, 1, 1),
+            description="test",
+            lines=[
+                JournalLine(account_id=debit_account, debit=amount),
+                JournalLine(account_id=credit_account, credit=amount),
+            ],
+        ),
+    )
+
+
+def _checks(conn):
+    return sorted((i["check_name"], i["entry_id"]) for i in list_integrity_issues(conn))
+
+
+def test_scan_reports_each_check(conn, basic_accounts):
+    cash, usd, food = _setup(conn, basic_accounts)
+    good = _post(conn, food, cash)
+    unbalanced = _post(conn, food, cash)
+    conn.execute(
+        "UPDATE journal_lines SET debit = 900 WHERE entry_id = ? AND debit > 0",
+        (unbalanced,),
+    )
+    retired = create_user_account(conn, "옛 카드", "ASSET", basic_accounts["현금"])
+    non_posting = _post(conn, food, retired)
+    conn.execute("UPDATE accounts SET allow_posting = 0 WHERE id = ?", (retired,))
+    missing_fx = _post(conn, usd, cash, 1300.0)
+    conn.execute(
+        "INSERT INTO loan_schedules (loan_id, due_date, installment_number,"
+        " principal_payment, interest_payment, total_payment, remaining_balance,"
+        " journal_entry_id) VALUES (1, '2024-01-01', 1, 0, 0, 0, 0, 9999)"
+    )
+
+    result = scan_integrity(conn)
+
+    assert result["scanned_entries"] == 4
+    assert _checks(conn) == [
+        ("MISSING_FX", missing_fx),
+        ("NON_POSTING_ACCOUNT", non_posting),
+        ("ORPHAN_LINK", 9999),
+        ("UNBALANCED", unbalanced),
+    ]
+    assert good not in {entry for _, entry in _checks(conn)}
+
+
+def test_routine_scan_reads_only_new_and_changed_entries(conn, basic_accounts):
+    cash, _, food = _setup(conn, basic_accounts)
+    first = _post(conn, food, cash)
+    _post(conn, food, cash)
+    assert scan_integrity(conn)["scanned_entries"] == 2
+    assert integrity_status(conn)["new_entries"] == 0
+
+    assert scan_integrity(conn)["scanned_entries"] == 0
+
+    _post(conn, food, cash)
+    conn.execute(
+        "UPDATE journal_lines SET credit = 10 WHERE entry_id = ? AND credit > 0",
+        (first,),
+    )
+    status = integrity_status(conn)
+    assert (status["new_entries"], status["dirty_entries"]) == (1, 1)
+
+    result = scan_integrity(conn)
+    assert result["scanned_entries"] == 2
+    assert _checks(conn) == [("UNBALANCED", first)]
+
+    conn.execute(
+        "UPDATE journal_lines SET credit = 1000 WHERE entry_id = ? AND credit > 0",
+        (first,),
+    )
+    scan_integrity(conn)
+    assert _checks(conn) == []
+
+    conn.execute("UPDATE accounts SET allow_posting = 0 WHERE id = ?", (food,))
+    assert scan_integrity(conn)["scanned_entries"] == 3
+    assert [c for c, _ in _checks(conn)] == ["NON_POSTING_ACCOUNT"] * 3
+    assert scan_integrity(conn, full=True)["issues"] == 3
@@ -0,0 +1,92 @@
+from datetime import date
+
+from core.models import JournalEntryInput, JournalLine
+from core.services.ledger_service import (
+    create_journal_entries_bulk,
+    list_journal_entries_page,
+    list_journal_lines_page,
+)
+
+
+def _seed(conn, basic_accounts) -> list[int]:
+    conn.execute(
+        """INSERT INTO accounts (id, name, type, parent_id, level, allow_posting)
+           VALUES (110001, '지갑', 'ASSET', ?, 2, 1)""",
+        (basic_accounts["현금"],),
+    )
+    equity = basic_accounts["기초순자산(Opening Equity)"]
+    entries = [
+        JournalEntryInput(
+            entry_date=date(2024, 1, 1 + i // 2),
+            description=f"entry {i}",
+            lines=[
+                JournalLine(account_id=110001, debit=10.0),
+                JournalLine(account_id=equity, credit=10.0),
+            ],
+        )
+        for i in range(7)
+    ]
+    return create_journal_entries_bulk(conn, entries)["entry_ids"]
+
+
+def test_entry_pages_walk_forward_and_back(conn, basic_accounts) -> None:
+    ids = _seed(conn, basic_accounts)
+    newest_first = list(reversed(ids))
+
+    page1 = list_journal_entries_page(conn, limit=3)
+    assert [e["id"] for e in page1["items"]] == newest_first[:3]
+    assert page1["prev_cursor"] is None
+
+    page2 = list_journal_entries_page(conn, cursor=page1["next_cursor"], limit=3)
+    assert [e["id"] for e in page2["items"]] == newest_first[3:6]
+
+    page3 = list_journal_entries_page(conn, cursor=page2["next_cursor"], limit=3)
+    assert [e["id"] for e in page3["items"]] == newest_first[6:]
+    assert page3["next_cursor"] is None
+
+    back = list_journal_entries_page(
+        conn, cursor=page3["prev_cursor"], limit=3, direction="prev"
+    )
+    assert back["items"] == page2["items"]
+    assert back["next_cursor"] == page2["next_cursor"]
+
+    first = list_journal_entries_page(
+        conn, cursor=back["prev_cursor"], limit=3, direction="prev"
+    )
+    assert first["items"] == page1["items"]
+    assert first["prev_cursor"] is None
+
+
+def test_line_pages_respect_date_range(conn, basic_accounts) -> None:
+    _seed(conn, basic_accounts)
+
+    page = list_journal_lines_page(
+        conn, start=date(2024, 1, 2), end=date(2024, 1, 3), limit=5
+    )
+    assert len(page["items"]) == 5
+    rest = list_journal_lines_page(
+        conn,
+        start=date(2024, 1, 2),
+        end=date(2024, 1, 3),
+        cursor=page["next_cursor"],
+        limit=5,
+    )
+    assert len(rest["items"]) == 3
+    assert rest["next_cursor"] is None
+    keys = [
+        (r["entry_date"], r["entry_id"], r["line_id"])
+        for r in page["items"] + rest["items"]
+    ]
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_entry_pages_seek_with_the_date_id_index(conn) -> None:
+    plan = conn.execute(
+        """EXPLAIN QUERY PLAN
+           SELECT je.id FROM journal_entries je
+           WHERE (je.entry_date, je.id) < ('2024-01-01', 5)
+           ORDER BY je.entry_date DESC, je.id DESC LIMIT 51"""
+    ).fetchall()
+    detail = " ".join(row["detail"] for row in plan)
+    assert "ix_journal_entries_date_id" in detail
+    assert "TEMP B-TREE" not in detail
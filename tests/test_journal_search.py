@@ -0,0 +1,79 @@
+from datetime import date
+
+from core.models import JournalEntryInput, JournalLine
+from core.services.account_service import create_user_account
+from core.services.ledger_service import create_journal_entry, search_journal
+
+
+def _accounts(conn, basic_accounts):
+    card = create_user_account(conn, "카드", "ASSET", basic_accounts["현금"])
+    food = create_user_account(conn, "식비", "EXPENSE", basic_accounts["비용"])
+    return card, food
+
+
+def _post(conn, card, food, description, amount, memo=""):
+    return create_journal_entry(
+        conn,
+        JournalEntryInput(
+            entry_date=date(2024, 1, 1),
+            description=description,
+            lines=[
+                JournalLine(account_id=food, debit=amount, memo=memo),
+                JournalLine(account_id=card, credit=amount),
+            ],
+        ),
+    )
+
+
+def test_search_matches_korean_prefixes_with_amounts(conn, basic_accounts):
+    card, food = _accounts(conn, basic_accounts)
+    _post(conn, card, food, "쿠팡에서 생필품", 30000)
+    _post(conn, card, food, "이마트 장보기", 50000, memo="쿠팡 대신")
+    _post(conn, card, food, "스타벅스", 6000)
+
+    page = search_journal(conn, "쿠팡")
+    descriptions = {item["description"] for item in page["items"]}
+    assert descriptions == {"쿠팡에서 생필품", "이마트 장보기"}
+
+    memo_hit = [item for item in page["items"] if item["memo"] == "쿠팡 대신"]
+    assert memo_hit[0]["account_id"] == food
+    assert memo_hit[0]["debit"] == 50000
+
+    assert search_journal(conn, "쿠팡 생필")["items"][0]["description"] == (
+        "쿠팡에서 생필품"
+    )
+    assert search_journal(conn, "   ")["items"] == []
+    assert search_journal(conn, 'bad"quote')["items"] == []
+
+
+def test_search_index_follows_edits_and_deletes(conn, basic_accounts):
+    card, food = _accounts(conn, basic_accounts)
+    entry_id = _post(conn, card, food, "배달의민족", 20000)
+
+    conn.execute(
+        "UPDATE journal_entries SET description = '요기요' WHERE id = ?", (entry_id,)
+    )
+    assert search_journal(conn, "배달")["items"] == []
+    assert len(search_journal(conn, "요기요")["items"]) == 2
+
+    conn.execute("DELETE FROM journal_lines WHERE entry_id = ?", (entry_id,))
+    assert search_journal(conn, "요기요")["items"] == []
+
+
+def test_search_pages_by_score(conn, basic_accounts):
+    card, food = _accounts(conn, basic_accounts)
+    for i in range(5):
+        _post(conn, card, food, f"편의점 {i}", 1000 + i)
+
+    first = search_journal(conn, "편의점", limit=5)
+    second = search_journal(conn, "편의점", limit=5, cursor=first["next_cursor"])
+    seen = [item["line_id"] for item in first["items"] + second["items"]]
+    assert len(seen) == len(set(seen)) == 10
+    assert second["next_cursor"] is None
+
+    back = search_journal(
+        conn, "편의점", limit=5, cursor=second["prev_cursor"], direction="prev"
+    )
+    assert [i["line_id"] for i in back["items"]] == [
+        i["line_id"] for i in first["items"]
+    ]
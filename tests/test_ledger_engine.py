@@ -0,0 +1,118 @@
+from datetime import date
+
+import pytest
+
+from core.models import JournalEntryInput, JournalLine
+from core.services.ledger_engine import LedgerEngine
+from core.services.ledger_service import account_balances_multi, create_journal_entry
+
+
+def _setup_accounts(conn) -> tuple[int, int, int]:
+    for acc in [
+        (1101, "지갑", "ASSET", "KRW"),
+        (1102, "달러예금", "ASSET", "USD"),
+        (3101, "자본", "EQUITY", "KRW"),
+    ]:
+        conn.execute(
+            """INSERT INTO accounts (id, name, type, level, allow_posting, currency)
+               VALUES (?, ?, ?, 1, 1, ?)""",
+            acc,
+        )
+    return 1101, 1102, 3101
+
+
+def _post(conn, entry_date, debit_id, credit_id, amount, **native) -> int:
+    return create_journal_entry(
+        conn,
+        JournalEntryInput(
+            entry_date=entry_date,
+            description="test",
+            lines=[
+                JournalLine(account_id=debit_id, debit=amount, credit=0.0, **native),
+                JournalLine(account_id=credit_id, debit=0.0, credit=amount),
+            ],
+        ),
+    )
+
+
+def _assert_same(actual, expected) -> None:
+    assert actual.keys() == expected.keys()
+    for account_id, values in expected.items():
+        assert actual[account_id]["base"] == pytest.approx(values["base"])
+        assert actual[account_id]["native"] == pytest.approx(values["native"])
+
+
+def test_engine_matches_sql_balances_at_many_dates(conn) -> None:
+    cash, usd, equity = _setup_accounts(conn)
+    _post(conn, date(2024, 3, 10), cash, equity, 300.0)
+    _post(conn, date(2024, 1, 5), cash, equity, 100.0)
+    _post(
+        conn,
+        date(2024, 2, 20),
+        usd,
+        equity,
+        1300.0,
+        native_amount=1.0,
+        native_currency="USD",
+        fx_rate=1300.0,
+    )
+    _post(conn, date(2024, 2, 25), equity, cash, 40.0)
+
+    engine = LedgerEngine(conn)
+    dates = [
+        date(2023, 12, 31),
+        date(2024, 1, 5),
+        date(2024, 2, 20),
+        date(2024, 2, 29),
+        "2024-12-31",
+    ]
+    result = engine.balances_at(dates)
+    for as_of in dates:
+        _assert_same(result[as_of], account_balances_multi(conn, as_of=as_of))
+    assert result[date(2023, 12, 31)] == {}
+    _assert_same(engine.balances(), account_balances_multi(conn))
+
+
+def test_engine_refreshes_incrementally_and_reloads_on_edits(conn) -> None:
+    cash, _usd, equity = _setup_accounts(conn)
+    entry_id = _post(conn, date(2024, 1, 5), cash, equity, 100.0)
+    engine = LedgerEngine(conn)
+
+    _post(conn, date(2024, 1, 6), cash, equity, 50.0)
+    assert engine.refresh() == 2
+    assert engine.balances()[cash]["base"] == pytest.approx(150.0)
+
+    assert engine.refresh() == 0
+
+    conn.execute("DELETE FROM journal_lines WHERE entry_id = ?", (entry_id,))
+    engine.refresh()
+    _assert_same(engine.balances(), account_balances_multi(conn))
+
+    conn.execute("UPDATE journal_lines SET debit = 70.0 WHERE debit = 50.0")
+    conn.execute("UPDATE journal_lines SET credit = 70.0 WHERE credit = 50.0")
+    engine.refresh()
+    assert engine.balances()[cash]["base"] == pytest.approx(70.0)
+
+
+def test_engine_reloads_after_entry_date_change(conn) -> None:
+    cash, _usd, equity = _setup_accounts(conn)
+    entry_id = _post(conn, date(2024, 1, 5), cash, equity, 100.0)
+    _post(conn, date(2024, 2, 5), cash, equity, 50.0)
+    engine = LedgerEngine(conn)
+    assert engine.balances(date(2024, 1, 31))[cash]["base"] == pytest.approx(100.0)
+
+    conn.execute(
+        "UPDATE journal_entries SET entry_date = '2024-03-01' WHERE id = ?",
+        (entry_id,),
+    )
+    engine.refresh()
+    as_of = date(2024, 2, 29)
+    _assert_same(engine.balances(as_of), account_balances_multi(conn, as_of=as_of))
+    assert cash not in engine.balances(date(2024, 1, 31))
+
+    # New lines alone are appended without a reload.
+    version = engine.edit_version
+    assert engine.refresh() == 0
+    _post(conn, date(2024, 3, 2), cash, equity, 10.0)
+    assert engine.refresh() == 2
+    assert engine.edit_version == version
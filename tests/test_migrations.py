@@ -0,0 +1,62 @@
+import sqlite3
+
+from core import db
+from core.db import apply_migrations, init_db, list_migrations
+
+
+def _columns(conn, table: str) -> set[str]:
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def test_fresh_database_gets_baseline_and_all_migrations() -> None:
+    conn = sqlite3.connect(":memory:")
+    latest = list_migrations()[-1][0]
+
+    assert apply_migrations(conn) == latest
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == latest
+    assert {"description", "account_number"} <= _columns(conn, "accounts")
+
+    # Up-to-date databases are left alone.
+    assert apply_migrations(conn) == latest
+    conn.close()
+
+
+def test_pre_versioning_database_is_upgraded() -> None:
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        """CREATE TABLE accounts (
+               id INTEGER PRIMARY KEY, type TEXT NOT NULL, name TEXT NOT NULL,
+               parent_id INTEGER, level INTEGER NOT NULL DEFAULT 1,
+               is_active INTEGER NOT NULL DEFAULT 1, is_system INTEGER NOT NULL DEFAULT 0,
+               allow_posting INTEGER NOT NULL DEFAULT 0,
+               currency TEXT NOT NULL DEFAULT 'KRW'
+           )"""
+    )
+    conn.execute("INSERT INTO accounts (id, type, name) VALUES (1, 'ASSET', '현금')")
+    conn.commit()
+
+    apply_migrations(conn)
+
+    assert {"description", "account_number"} <= _columns(conn, "accounts")
+    assert conn.execute("SELECT name FROM accounts").fetchone()[0] == "현금"
+    assert conn.execute(
+        "SELECT name FROM sqlite_master WHERE name = 'journal_lines'"
+    ).fetchone()
+    conn.close()
+
+
+def test_init_db_verifies_schema_once_per_process(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(db, "_verified_databases", set())
+    path = tmp_path / "app.db"
+
+    init_db(path)
+    with sqlite3.connect(path) as conn:
+        conn.execute("PRAGMA user_version = 0")
+        conn.execute("DROP TABLE evidences")
+
+    # The process already verified this database, so nothing is re-applied.
+    init_db(path)
+    with sqlite3.connect(path) as conn:
+        assert not conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'evidences'"
+        ).fetchone()
@@ -0,0 +1,165 @@
+from datetime import date
+
+import pytest
+
+from core.models import JournalEntryInput, JournalLine
+from core.money import (
+    CURRENCY_CONFIG,
+    from_minor,
+    minor_factor,
+    sync_currency_units,
+    to_minor,
+)
+from core.services.account_service import create_user_account
+from core.services.ledger_service import (
+    account_balances_multi,
+    create_journal_entries_bulk,
+    create_journal_entry,
+)
+from core.services.settings_service import set_amount_storage, set_base_currency
+
+
+def test_to_minor_rounds_half_up_per_currency():
+    assert to_minor(0.1 + 0.2, "USD") == 30
+    assert to_minor(1.005, "USD") == 101
+    assert to_minor(2.675, "EUR") == 268
+    assert to_minor(1234.5, "KRW") == 1235
+    assert to_minor(-0.5, "KRW") == -1
+    assert from_minor(101, "USD") == 1.01
+    assert from_minor(None, "KRW") == 0.0
+
+
+def _usd_accounts(conn, basic_accounts):
+    cash = create_user_account(
+        conn, "USD 현금", "ASSET", basic_accounts["현금"], currency="USD"
+    )
+    income = create_user_account(
+        conn, "USD 수익", "INCOME", basic_accounts["수익"], currency="USD"
+    )
+    return cash, income
+
+
+def test_minor_columns_written_on_post(conn, basic_accounts):
+    cash, income = _usd_accounts(conn, basic_accounts)
+    create_journal_entry(
+        conn,
+        JournalEntryInput(
+            entry_date=date(2024, 1, 1),
+            description="fx",
+            lines=[
+                JournalLine(
+                    account_id=cash,
+                    debit=1300.4,
+                    native_amount=1.01,
+                    native_currency="USD",
+                    fx_rate=1287.5,
+                ),
+                JournalLine(account_id=income, credit=1300.4),
+            ],
+        ),
+    )
+    rows = conn.execute(
+        "SELECT debit_minor, credit_minor, native_minor FROM journal_lines ORDER BY id"
+    ).fetchall()
+    assert [tuple(r) for r in rows] == [(1300, 0, 101), (0, 1300, None)]
+
+
+def test_minor_mode_sums_cents_exactly(conn, basic_accounts):
+    set_base_currency(conn, "USD")
+    set_amount_storage(conn, "MINOR")
+    cash, income = _usd_accounts(conn, basic_accounts)
+
+    entries = [
+        JournalEntryInput(
+            entry_date=date(2024, 1, 1),
+            description=f"dime {i}",
+            lines=[
+                JournalLine(account_id=cash, debit=0.1),
+                JournalLine(account_id=income, credit=0.1),
+            ],
+        )
+        for i in range(10)
+    ]
+    create_journal_entries_bulk(conn, entries)
+    create_journal_entry(
+        conn,
+        JournalEntryInput(
+            entry_date=date(2024, 2, 1),
+            description="rounded at the edge",
+            lines=[
+                JournalLine(account_id=cash, debit=0.204),
+                JournalLine(account_id=income, credit=0.196),
+            ],
+        ),
+    )
+
+    balances = account_balances_multi(conn)
+    assert balances[cash]["base"] == 1.2
+    assert balances[income]["base"] == -1.2
+    assert account_balances_multi(conn, as_of=date(2024, 1, 31))[cash]["base"] == 1.0
+
+    stored = conn.execute(
+        "SELECT debit FROM journal_lines WHERE debit_minor = 20"
+    ).fetchone()
+    assert stored["debit"] == 0.2
+
+
+def test_minor_mode_rejects_entry_unbalanced_in_minor_units(conn, basic_accounts):
+    set_amount_storage(conn, "MINOR")
+    cash = create_user_account(conn, "지갑", "ASSET", basic_accounts["현금"])
+    income = create_user_account(conn, "용돈", "INCOME", basic_accounts["수익"])
+    with pytest.raises(ValueError, match="Unbalanced"):
+        create_journal_entry(
+            conn,
+            JournalEntryInput(
+                entry_date=date(2024, 1, 1),
+                description="off by one won",
+                lines=[
+                    JournalLine(account_id=cash, debit=100.4),
+                    JournalLine(account_id=income, credit=100.6),
+                ],
+            ),
+        )
+
+
+def test_unknown_storage_mode_rejected(conn):
+    with pytest.raises(ValueError):
+        set_amount_storage(conn, "DECIMAL")
+
+
+def test_minor_columns_follow_direct_edits(conn, basic_accounts):
+    set_base_currency(conn, "USD")
+    set_amount_storage(conn, "MINOR")
+    cash, income = _usd_accounts(conn, basic_accounts)
+    entry_id = create_journal_entry(
+        conn,
+        JournalEntryInput(
+            entry_date=date(2024, 1, 1),
+            description="edited later",
+            lines=[
+                JournalLine(account_id=cash, debit=10.0),
+                JournalLine(account_id=income, credit=10.0),
+            ],
+        ),
+    )
+    conn.execute(
+        "UPDATE journal_lines SET debit = 20.0 WHERE entry_id = ? AND debit > 0",
+        (entry_id,),
+    )
+    conn.execute(
+        "UPDATE journal_lines SET credit = 20.0 WHERE entry_id = ? AND credit > 0",
+        (entry_id,),
+    )
+    assert account_balances_multi(conn)[cash]["base"] == 20.0
+    rows = conn.execute(
+        "SELECT debit_minor, credit_minor FROM journal_lines ORDER BY id"
+    ).fetchall()
+    assert [tuple(r) for r in rows] == [(2000, 0), (0, 2000)]
+
+
+def test_currency_units_follow_currency_config(conn):
+    units = dict(
+        conn.execute("SELECT currency, minor_factor FROM currency_units").fetchall()
+    )
+    assert units == {code: minor_factor(code) for code in CURRENCY_CONFIG}
+    assert sync_currency_units(conn) is False
@@ -1,10 +1,20 @@
-from datetime import date
+from datetime import date, datetime
 
 import pytest
 
 from core.models import JournalEntryInput, JournalLine
 from core.services.account_service import create_user_account
-from core.services.ledger_service import create_journal_entry
+from core.services.checkpoint_service import verify_checkpoints
+from core.services.fx_service import save_rate
+from core.services.ledger_engine import LedgerEngine
+from core.services.ledger_service import (
+    account_balances_multi,
+    balance_sheet,
+    create_journal_entry,
+    currency_balances,
+    trial_balance,
+)
+from core.services.settings_service import set_amount_storage
 
 
 def test_multi_currency_journal_entry(conn, basic_accounts):
@@ -88,3 +98,119 @@ def test_unbalanced_multi_currency_entry_fails(conn, basic_accounts):
 
     with pytest.raises(ValueError, match="Unbalanced entry"):
         create_journal_entry(conn, entry)
+
+
+def test_mixed_currency_account_converts_each_bucket(conn, basic_accounts):
+    brokerage = create_user_account(
+        conn, "증권 예수금", "ASSET", basic_accounts["현금"], currency="KRW"
+    )
+    equity = basic_accounts["기초순자산(Opening Equity)"]
+    for lines in (
+        [
+            JournalLine(account_id=brokerage, debit=500000.0),
+            JournalLine(account_id=equity, credit=500000.0),
+        ],
+        [
+            JournalLine(
+                account_id=brokerage,
+                debit=1300000.0,
+                native_amount=1000.0,
+                native_currency="USD",
+                fx_rate=1300.0,
+            ),
+            JournalLine(account_id=equity, credit=1300000.0),
+        ],
+    ):
+        create_journal_entry(
+            conn,
+            JournalEntryInput(
+                entry_date=date(2024, 1, 2), description="입금", lines=lines
+            ),
+        )
+    save_rate(conn, "KRW", "USD", 1400.0, as_of=datetime(2024, 1, 2))
+
+    buckets = {
+        "KRW": {"base": 500000.0, "native": 500000.0},
+        "USD": {"base": 1300000.0, "native": 1000.0},
+    }
+    assert currency_balances(conn)[brokerage] == buckets
+    assert currency_balances(conn, as_of=date(2024, 1, 1)) == {}
+
+    bs = balance_sheet(conn, as_of=date(2024, 1, 31))
+    item = next(i for i in bs["assets"] if i["id"] == brokerage)
+    assert item["native_balance"] == 500000.0
+    assert item["currency_balances"] == {"KRW": 500000.0, "USD": 1000.0}
+    assert item["book_value_base"] == 1800000.0
+    assert item["current_value_base"] == 1900000.0
+
+    plan = conn.execute(
+        "EXPLAIN QUERY PLAN SELECT account_id, native_currency, SUM(signed_native)"
+        " FROM journal_lines WHERE entry_date <= '2024-12-31'"
+        " GROUP BY account_id, native_currency"
+    ).fetchall()
+    assert any("ix_journal_lines_account_currency" in r[-1] for r in plan)
+    assert not any("TEMP B-TREE" in r[-1] for r in plan)
+
+    set_amount_storage(conn, "MINOR")
+    assert currency_balances(conn)[brokerage] == buckets
+
+
+def test_mixed_currency_account_keeps_native_amounts_apart(conn, basic_accounts):
+    cash = basic_accounts["현금"]
+    brokerage = create_user_account(conn, "증권 예수금", "ASSET", cash, currency="KRW")
+    equity = basic_accounts["기초순자산(Opening Equity)"]
+    for entry_date, line in (
+        (date(2024, 1, 2), JournalLine(account_id=brokerage, debit=500000.0)),
+        (
+            date(2024, 2, 3),
+            JournalLine(
+                account_id=brokerage,
+                debit=1300000.0,
+                native_amount=1000.0,
+                native_currency="USD",
+                fx_rate=1300.0,
+            ),
+        ),
+    ):
+        create_journal_entry(
+            conn,
+            JournalEntryInput(
+                entry_date=entry_date,
+                description="입금",
+                lines=[line, JournalLine(account_id=equity, credit=line.debit)],
+            ),
+        )
+
+    # native is the account's own currency; the USD bucket only adds to base.
+    assert account_balances_multi(conn)[brokerage] == {
+        "base": 1800000.0,
+        "native": 500000.0,
+    }
+    assert currency_balances(conn, as_of=date(2024, 2, 10))[brokerage] == {
+        "KRW": {"base": 500000.0, "native": 500000.0},
+        "USD": {"base": 1300000.0, "native": 1000.0},
+    }
+    assert currency_balances(conn, as_of=date(2024, 1, 31))[brokerage] == {
+        "KRW": {"base": 500000.0, "native": 500000.0},
+    }
+
+    rows = {r["account_id"]: r for r in trial_balance(conn, rollups=True)}
+    assert rows[cash]["rollup_balance"] == 1800000.0
+    assert rows[cash]["rollup_native"] == {"KRW": 500000.0, "USD": 1000.0}
+
+    engine = LedgerEngine(conn)
+    assert engine.balances()[brokerage] == pytest.approx(
+        account_balances_multi(conn)[brokerage]
+    )
+
+    conn.execute(
+        "UPDATE journal_lines SET native_currency = 'EUR'"
+        " WHERE account_id = ? AND native_amount IS NOT NULL",
+        (brokerage,),
+    )
+    assert verify_checkpoints(conn) == []
+    assert set(currency_balances(conn)[brokerage]) == {"KRW", "EUR"}
+    engine.refresh()
+    assert engine.balances()[brokerage] == pytest.approx(
+        account_balances_multi(conn)[brokerage]
+    )
@@ -0,0 +1,187 @@
+import sqlite3
+from datetime import date
+
+import pytest
+
+from core.models import JournalEntryInput, JournalLine
+from core.services.account_service import create_user_account
+from core.services.calendar_service import ensure_calendar
+from core.services.ledger_service import (
+    account_balances,
+    create_journal_entries_bulk,
+    create_journal_entry,
+    currency_balances,
+    income_statement,
+)
+from core.services.period_service import close_year, reopen_year, split_closed_range
+from core.services.report_service import income_statement_matrix
+
+
+@pytest.fixture
+def ledger(conn, basic_accounts):
+    accounts = {
+        "bank": create_user_account(conn, "은행", "ASSET", basic_accounts["현금"]),
+        "salary": create_user_account(conn, "급여", "INCOME", basic_accounts["수익"]),
+        "food": create_user_account(conn, "식비", "EXPENSE", basic_accounts["비용"]),
+        "retained": basic_accounts["기초순자산(Opening Equity)"],
+    }
+    _post(conn, accounts, date(2023, 3, 1), "bank", "salary", 5000.0)
+    _post(conn, accounts, date(2023, 6, 1), "food", "bank", 1200.0)
+    _post(conn, accounts, date(2024, 2, 1), "bank", "salary", 6000.0)
+    _post(conn, accounts, date(2024, 2, 2), "food", "bank", 700.0)
+    return accounts
+
+
+def _post(conn, accounts, entry_date, debit, credit, amount):
+    return create_journal_entry(
+        conn,
+        JournalEntryInput(
+            entry_date=entry_date,
+            description="test",
+            lines=[
+                JournalLine(account_id=accounts[debit], debit=amount),
+                JournalLine(account_id=accounts[credit], credit=amount),
+            ],
+        ),
+    )
+
+
+def test_close_year_moves_results_to_equity(conn, ledger):
+    before = income_statement(conn, date(2023, 1, 1), date(2024, 12, 31))
+
+    result = close_year(conn, 2023, ledger["retained"])
+    assert result["net_income"] == 3800.0
+
+    balances = account_balances(conn, as_of=date(2023, 12, 31))
+    assert balances[ledger["salary"]] == 0.0
+    assert balances[ledger["food"]] == 0.0
+    assert balances[ledger["retained"]] == -3800.0
+
+    assert income_statement(conn, date(2023, 1, 1), date(2024, 12, 31)) == before
+    assert (
+        income_statement(conn, date(2023, 1, 1), date(2023, 12, 31))["net_profit"]
+        == 3800.0
+    )
+
+    ensure_calendar(conn, 2023, 2024)
+    matrix = income_statement_matrix(conn, date(2023, 1, 1), date(2024, 12, 31), "Y")
+    net = matrix[matrix["kind"] == "NET_PROFIT"].iloc[0]
+    assert (net["2023"], net["2024"]) == (3800.0, 5300.0)
+
+
+def test_closed_year_reads_stored_results(conn, ledger):
+    close_year(conn, 2023, ledger["retained"])
+    assert split_closed_range(conn, date(2022, 6, 1), date(2024, 3, 1)) == (
+        [1],
+        [("2022-06-01", "2022-12-31"), ("2024-01-01", "2024-03-01")],
+    )
+
+    conn.execute(
+        "UPDATE closing_balances SET raw_balance = -9999 WHERE account_id = ?",
+        (ledger["salary"],),
+    )
+    statement = income_statement(conn, date(2023, 1, 1), date(2023, 12, 31))
+    assert statement["total_income"] == 9999.0
+
+
+def test_postings_into_closed_year_are_rejected(conn, ledger):
+    close_year(conn, 2023, ledger["retained"])
+
+    with pytest.raises(ValueError, match="마감"):
+        _post(conn, ledger, date(2023, 12, 30), "food", "bank", 10.0)
+
+    result = create_journal_entries_bulk(
+        conn,
+        [
+            JournalEntryInput(
+                entry_date=day,
+                description="bulk",
+                lines=[
+                    JournalLine(account_id=ledger["food"], debit=10.0),
+                    JournalLine(account_id=ledger["bank"], credit=10.0),
+                ],
+            )
+            for day in (date(2023, 5, 5), date(2024, 5, 5))
+        ],
+    )
+    assert result["entry_ids"][0] is None
+    assert result["entry_ids"][1] is not None
+
+    with pytest.raises(sqlite3.IntegrityError):
+        conn.execute(
+            "INSERT INTO journal_entries (entry_date, description, source)"
+            " VALUES ('2023-07-01', 'direct', 'manual')"
+        )
+    with pytest.raises(sqlite3.IntegrityError):
+        conn.execute("DELETE FROM journal_lines WHERE entry_date = '2023-03-01'")
+    # Re-pointing an open line at a closed entry would move it into 2023.
+    closed_entry = conn.execute(
+        "SELECT id FROM journal_entries WHERE entry_date = '2023-06-01'"
+    ).fetchone()[0]
+    with pytest.raises(sqlite3.IntegrityError):
+        conn.execute(
+            "UPDATE journal_lines SET entry_id = ? WHERE entry_date = '2024-02-02'",
+            (closed_entry,),
+        )
+    with pytest.raises(ValueError, match="이미"):
+        close_year(conn, 2023, ledger["retained"])
+
+
+def test_close_year_closes_each_currency_separately(conn, ledger):
+    create_journal_entry(
+        conn,
+        JournalEntryInput(
+            entry_date=date(2023, 7, 1),
+            description="해외 결제",
+            lines=[
+                JournalLine(
+                    account_id=ledger["food"],
+                    debit=1300.0,
+                    native_amount=1.0,
+                    native_currency="USD",
+                    fx_rate=1300.0,
+                ),
+                JournalLine(account_id=ledger["bank"], credit=1300.0),
+            ],
+        ),
+    )
+
+    closed = close_year(conn, 2023, ledger["retained"])
+    assert closed["net_income"] == 2500.0
+
+    food_lines = conn.execute(
+        """
+        SELECT credit, native_amount, native_currency FROM journal_lines
+        WHERE entry_id = ? AND account_id = ?
+        ORDER BY credit
+        """,
+        (closed["closing_entry_id"], ledger["food"]),
+    ).fetchall()
+    assert [tuple(r) for r in food_lines] == [
+        (1200.0, None, None),
+        (1300.0, 1.0, "USD"),
+    ]
+    assert currency_balances(conn, as_of=date(2023, 12, 31))[ledger["food"]] == {
+        "KRW": {"base": 0.0, "native": 0.0},
+        "USD": {"base": 0.0, "native": 0.0},
+    }
+
+
+def test_reopen_reverses_closing_entry(conn, ledger):
+    closed = close_year(conn, 2023, ledger["retained"])
+    reversal_id = reopen_year(conn, 2023)
+    assert reversal_id != closed["closing_entry_id"]
+
+    balances = account_balances(conn, as_of=date(2023, 12, 31))
+    assert balances[ledger["salary"]] == -5000.0
+    assert balances[ledger["retained"]] == 0.0
+
+    _post(conn, ledger, date(2023, 12, 30), "food", "bank", 100.0)
+    assert (
+        income_statement(conn, date(2023, 1, 1), date(2023, 12, 31))["net_profit"]
+        == 3700.0
+    )
+
+    assert close_year(conn, 2023, ledger["retained"])["net_income"] == 3700.0
+    with pytest.raises(ValueError):
+        reopen_year(conn, 2022)
@@ -0,0 +1,116 @@
+from datetime import date
+
+import pytest
+
+from core.models import JournalEntryInput, JournalLine
+from core.services.account_service import create_user_account
+from core.services.checkpoint_service import verify_checkpoints
+from core.services.ledger_engine import LedgerEngine
+from core.services.ledger_service import account_balances, create_journal_entry
+from core.services.period_service import close_year
+from core.services.reclassification_service import (
+    list_reclassifications,
+    reclassify_lines,
+    undo_reclassification,
+)
+from core.services.totals_service import current_balances, verify_account_totals
+
+
+@pytest.fixture
+def ledger(conn, basic_accounts):
+    accounts = {
+        "bank": create_user_account(conn, "은행", "ASSET", basic_accounts["현금"]),
+        "food": create_user_account(conn, "식비", "EXPENSE", basic_accounts["비용"]),
+        "dining": create_user_account(conn, "외식", "EXPENSE", basic_accounts["비용"]),
+        "retained": basic_accounts["기초순자산(Opening Equity)"],
+    }
+    for day, description, memo, amount in [
+        (date(2023, 11, 3), "배달 치킨", "", 20000.0),
+        (date(2024, 1, 5), "마트 장보기", "", 50000.0),
+        (date(2024, 1, 9), "배달 피자", "", 25000.0),
+        (date(2024, 2, 14), "저녁", "레스토랑", 80000.0),
+        (date(2024, 3, 1), "마트 장보기", "", 40000.0),
+    ]:
+        create_journal_entry(
+            conn,
+            JournalEntryInput(
+                entry_date=day,
+                description=description,
+                lines=[
+                    JournalLine(account_id=accounts["food"], debit=amount, memo=memo),
+                    JournalLine(account_id=accounts["bank"], credit=amount),
+                ],
+            ),
+        )
+    return accounts
+
+
+def _consistent(conn):
+    assert verify_checkpoints(conn) == []
+    assert verify_account_totals(conn) == []
+
+
+def test_dry_run_counts_without_moving(conn, ledger):
+    result = reclassify_lines(
+        conn, ledger["food"], ledger["dining"], match="배달", dry_run=True
+    )
+    assert (result["line_count"], result["base_amount"]) == (2, 45000.0)
+    assert result["reclassification_id"] is None
+    assert account_balances(conn).get(ledger["dining"], 0.0) == 0.0
+    assert list_reclassifications(conn) == []
+
+
+def test_reclassify_and_undo_keep_balances_consistent(conn, ledger):
+    engine = LedgerEngine(conn)
+    result = reclassify_lines(
+        conn,
+        ledger["food"],
+        ledger["dining"],
+        start=date(2024, 1, 1),
+        description_like="배달%",
+    )
+    assert result["line_count"] == 1
+    more = reclassify_lines(
+        conn, ledger["food"], ledger["dining"], memo_like="%레스토랑%"
+    )
+    assert more["line_count"] == 1
+
+    balances = account_balances(conn)
+    assert balances[ledger["dining"]] == 105000.0
+    assert balances[ledger["food"]] == 110000.0
+    assert current_balances(conn)[ledger["dining"]]["base"] == 105000.0
+    engine.refresh()
+    assert engine.balances()[ledger["dining"]]["base"] == 105000.0
+    _consistent(conn)
+
+    assert undo_reclassification(conn, result["reclassification_id"]) == 1
+    assert account_balances(conn)[ledger["dining"]] == 80000.0
+    _consistent(conn)
+    assert list_reclassifications(conn)[1]["undone_at"] is not None
+    with pytest.raises(ValueError, match="이미"):
+        undo_reclassification(conn, result["reclassification_id"])
+    with pytest.raises(ValueError, match="찾을 수 없습니다"):
+        undo_reclassification(conn, 999)
+
+
+def test_reclassify_rejects_closed_periods_and_bad_targets(
+    conn, ledger, basic_accounts
+):
+    close_year(conn, 2023, ledger["retained"])
+    with pytest.raises(ValueError, match="마감"):
+        reclassify_lines(conn, ledger["food"], ledger["dining"], match="배달")
+    assert account_balances(conn).get(ledger["dining"], 0.0) == 0.0
+
+    with pytest.raises(ValueError, match="상위"):
+        reclassify_lines(conn, ledger["food"], basic_accounts["비용"])
+    usd = create_user_account(
+        conn, "해외 식비", "EXPENSE", basic_accounts["비용"], currency="USD"
+    )
+    with pytest.raises(ValueError, match="통화"):
+        reclassify_lines(conn, ledger["food"], usd)
+
+    result = reclassify_lines(
+        conn, ledger["food"], ledger["dining"], match="배달", start=date(2024, 1, 1)
+    )
+    assert result["line_count"] == 1
+    _consistent(conn)
@@ -0,0 +1,188 @@
+from datetime import date, datetime
+
+import pytest
+
+from core.models import JournalEntryInput, JournalLine
+from core.services.calendar_service import ensure_calendar
+from core.services.fx_service import save_rate
+from core.services.ledger_engine import LedgerEngine
+from core.services.ledger_service import (
+    balance_sheet,
+    create_journal_entry,
+    income_statement,
+)
+from core.services.report_service import (
+    income_statement_matrix,
+    net_worth_series,
+    period_ends,
+)
+from core.services.valuation_service import upsert_asset_valuation
+
+
+def _setup_accounts(conn) -> None:
+    for acc in [
+        (1101, "지갑", "ASSET", "KRW"),
+        (1102, "달러예금", "ASSET", "USD"),
+        (1201, "주식", "ASSET", "KRW"),
+        (2101, "카드", "LIABILITY", "KRW"),
+        (3101, "자본", "EQUITY", "KRW"),
+    ]:
+        conn.execute(
+            """INSERT INTO accounts (id, name, type, level, allow_posting, currency)
+               VALUES (?, ?, ?, 1, 1, ?)""",
+            acc,
+        )
+
+
+def _post(conn, entry_date, debit_id, credit_id, amount, **native) -> None:
+    create_journal_entry(
+        conn,
+        JournalEntryInput(
+            entry_date=entry_date,
+            description="test",
+            lines=[
+                JournalLine(account_id=debit_id, debit=amount, credit=0.0, **native),
+                JournalLine(account_id=credit_id, debit=0.0, credit=amount),
+            ],
+        ),
+    )
+
+
+def test_period_ends() -> None:
+    assert period_ends(date(2024, 1, 15), date(2024, 4, 10), "M") == [
+        date(2024, 1, 31),
+        date(2024, 2, 29),
+        date(2024, 3, 31),
+        date(2024, 4, 10),
+    ]
+    assert period_ends(date(2024, 2, 1), date(2024, 12, 31), "Q") == [
+        date(2024, 3, 31),
+        date(2024, 6, 30),
+        date(2024, 9, 30),
+        date(2024, 12, 31),
+    ]
+    assert period_ends(date(2024, 1, 1), date(2024, 1, 10), "W") == [
+        date(2024, 1, 7),
+        date(2024, 1, 10),
+    ]
+    assert len(period_ends(date(2024, 1, 1), date(2024, 12, 31), "D")) == 366
+    with pytest.raises(ValueError):
+        period_ends(date(2024, 1, 1), date(2024, 1, 2), "X")
+
+
+def test_series_matches_balance_sheet_per_period(conn) -> None:
+    _setup_accounts(conn)
+    save_rate(conn, "KRW", "USD", 1300.0, as_of=datetime(2024, 1, 1))
+    save_rate(conn, "KRW", "USD", 1400.0, as_of=datetime(2024, 2, 15))
+    _post(conn, date(2024, 1, 5), 1101, 3101, 1000.0)
+    _post(
+        conn,
+        date(2024, 1, 20),
+        1102,
+        3101,
+        1300.0,
+        native_amount=1.0,
+        native_currency="USD",
+        fx_rate=1300.0,
+    )
+    _post(conn, date(2024, 2, 10), 1101, 2101, 200.0)
+    _post(conn, date(2024, 3, 3), 1201, 1101, 500.0)
+
+    series = net_worth_series(
+        conn, date(2024, 1, 1), date(2024, 3, 31), "M", display_currency="USD"
+    )
+    assert [p["date"] for p in series["points"]] == [
+        date(2024, 1, 31),
+        date(2024, 2, 29),
+        date(2024, 3, 31),
+    ]
+    for point in series["points"]:
+        bs = balance_sheet(conn, as_of=point["date"], display_currency="USD")
+        assert point["assets_base"] == pytest.approx(bs["total_assets_base"])
+        assert point["liabilities_base"] == pytest.approx(bs["total_liabilities_base"])
+        assert point["net_worth_disp"] == pytest.approx(bs["net_worth_disp"])
+        # No valuations recorded yet.
+        assert point["valued_net_worth_base"] == pytest.approx(point["net_worth_base"])
+    assert series["missing_rates"] == []
+
+
+def test_series_overlays_latest_valuation_as_of_each_period(conn) -> None:
+    _setup_accounts(conn)
+    _post(conn, date(2024, 1, 5), 1201, 3101, 500.0)
+    conn.execute(
+        """INSERT INTO assets (id, name, asset_class, linked_account_id,
+                               acquisition_date, acquisition_cost, note)
+           VALUES (1, '주식A', 'STOCK', 1201, '2024-01-05', 500.0, '')"""
+    )
+    upsert_asset_valuation(conn, 1, "2024-02-10", 650.0, "KRW")
+    upsert_asset_valuation(conn, 1, "2024-03-31", 700.0, "KRW")
+
+    points = net_worth_series(conn, date(2024, 1, 1), date(2024, 3, 31), "M")["points"]
+    assert [p["assets_base"] for p in points] == [500.0, 500.0, 500.0]
+    assert [p["valued_assets_base"] for p in points] == [500.0, 650.0, 700.0]
+
+
+def test_series_with_shared_engine_follows_entry_date_edits(conn) -> None:
+    _setup_accounts(conn)
+    _post(conn, date(2024, 1, 5), 1101, 3101, 100.0)
+    entry_id = conn.execute("SELECT MAX(id) FROM journal_entries").fetchone()[0]
+    engine = LedgerEngine(conn)
+
+    def assets() -> list[float]:
+        points = net_worth_series(
+            conn, date(2024, 1, 1), date(2024, 3, 31), "M", engine=engine
+        )["points"]
+        return [p["assets_base"] for p in points]
+
+    assert assets() == [100.0, 100.0, 100.0]
+    conn.execute(
+        "UPDATE journal_entries SET entry_date = '2024-03-01' WHERE id = ?",
+        (entry_id,),
+    )
+    assert assets() == [0.0, 0.0, 100.0]
+
+
+def test_income_statement_matrix_pivots_periods(conn) -> None:
+    for acc in [
+        (1101, "지갑", "ASSET", "KRW"),
+        (4101, "급여", "INCOME", "KRW"),
+        (5101, "식비", "EXPENSE", "KRW"),
+        (5102, "교통비", "EXPENSE", "KRW"),
+    ]:
+        conn.execute(
+            """INSERT INTO accounts (id, name, type, level, allow_posting, currency)
+               VALUES (?, ?, ?, 1, 1, ?)""",
+            acc,
+        )
+    _post(conn, date(2024, 1, 25), 1101, 4101, 3000.0)
+    _post(conn, date(2024, 1, 28), 5101, 1101, 400.0)
+    _post(conn, date(2024, 3, 2), 5102, 1101, 100.0)
+    _post(conn, date(2024, 4, 25), 1101, 4101, 3000.0)
+    ensure_calendar(conn, 2024, 2024)
+
+    df = income_statement_matrix(conn, date(2024, 1, 1), date(2024, 4, 30), "M")
+    assert list(df.columns) == [
+        "kind",
+        "account_id",
+        "account",
+        "2024-01",
+        "2024-02",
+        "2024-03",
+        "2024-04",
+        "total",
+    ]
+    rows = df.set_index("account")
+    assert rows.loc["급여", "2024-01"] == 3000.0
+    assert rows.loc["Total expense", "total"] == 500.0
+    assert list(rows.loc["Net profit", ["2024-01", "2024-02", "2024-03"]]) == [
+        2600.0,
+        0.0,
+        -100.0,
+    ]
+
+    quarterly = income_statement_matrix(conn, date(2024, 1, 1), date(2024, 6, 30), "Q")
+    net = quarterly.set_index("kind").loc["NET_PROFIT"]
+    assert (net["2024-Q1"], net["2024-Q2"]) == (2500.0, 3000.0)
+
+    full = income_statement(conn, date(2024, 1, 1), date(2024, 4, 30))
+    assert rows.loc["Net profit", "total"] == full["net_profit"]
@@ -0,0 +1,119 @@
+from datetime import date
+
+from core.models import JournalEntryInput, JournalLine
+from core.services.account_service import create_user_account
+from core.services.checkpoint_service import NATIVE_SIGNED_SQL
+from core.services.ledger_service import (
+    create_journal_entries_bulk,
+    create_journal_entry,
+)
+
+
+def _insert_entry(conn, entry_date="2024-01-15"):
+    return conn.execute(
+        "INSERT INTO journal_entries (entry_date, description, source)"
+        " VALUES (?, 'x', 'manual')",
+        (entry_date,),
+    ).lastrowid
+
+
+def _signed(conn, line_id):
+    row = conn.execute(
+        "SELECT signed_base, signed_native FROM journal_lines WHERE id = ?",
+        (line_id,),
+    ).fetchone()
+    return tuple(row)
+
+
+def test_signed_columns_follow_inserts_and_updates(conn, basic_accounts):
+    cash = create_user_account(conn, "달러", "ASSET", basic_accounts["현금"])
+    expense = create_user_account(conn, "식비", "EXPENSE", basic_accounts["비용"])
+    entry_id = _insert_entry(conn)
+    fx_line = conn.execute(
+        """INSERT INTO journal_lines
+               (entry_id, account_id, debit, credit, memo, native_amount,
+                native_currency)
+           VALUES (?, ?, 0, 1300, '', 1, 'USD')""",
+        (entry_id, cash),
+    ).lastrowid
+    plain_line = conn.execute(
+        "INSERT INTO journal_lines (entry_id, account_id, debit, credit, memo)"
+        " VALUES (?, ?, 1300, 0, '')",
+        (entry_id, expense),
+    ).lastrowid
+
+    assert _signed(conn, fx_line) == (-1300.0, -1.0)
+    assert _signed(conn, plain_line) == (1300.0, 1300.0)
+
+    conn.execute(
+        "UPDATE journal_lines SET debit = 2600, credit = 0, native_amount = 2"
+        " WHERE id = ?",
+        (fx_line,),
+    )
+    assert _signed(conn, fx_line) == (2600.0, 2.0)
+
+    mismatches = conn.execute(
+        f"""
+        SELECT COUNT(*) FROM journal_lines jl
+        WHERE jl.signed_base != jl.debit - jl.credit
+           OR jl.signed_native != {NATIVE_SIGNED_SQL}
+        """
+    ).fetchone()[0]
+    assert mismatches == 0
+
+
+def test_services_write_signed_columns_without_the_fill_trigger(conn, basic_accounts):
+    cash = create_user_account(conn, "달러", "ASSET", basic_accounts["현금"])
+    expense = create_user_account(conn, "식비", "EXPENSE", basic_accounts["비용"])
+    conn.execute("DROP TRIGGER trg_journal_lines_signed_insert")
+
+    def entry(day: int) -> JournalEntryInput:
+        return JournalEntryInput(
+            entry_date=date(2024, 1, day),
+            description="x",
+            lines=[
+                JournalLine(account_id=expense, debit=1300.0),
+                JournalLine(
+                    account_id=cash,
+                    credit=1300.0,
+                    native_amount=1.0,
+                    native_currency="USD",
+                ),
+            ],
+        )
+
+    create_journal_entry(conn, entry(1))
+    create_journal_entries_bulk(conn, [entry(2)])
+    rows = conn.execute(
+        "SELECT signed_base, signed_native, entry_date FROM journal_lines ORDER BY id"
+    ).fetchall()
+    assert [tuple(r) for r in rows] == [
+        (1300.0, 1300.0, "2024-01-01"),
+        (-1300.0, -1.0, "2024-01-01"),
+        (1300.0, 1300.0, "2024-01-02"),
+        (-1300.0, -1.0, "2024-01-02"),
+    ]
+
+
+def test_balance_queries_use_covering_indexes(conn):
+    per_account = conn.execute(
+        """
+        EXPLAIN QUERY PLAN
+        SELECT account_id, SUM(signed_base), SUM(signed_native)
+        FROM journal_lines GROUP BY account_id
+        """
+    ).fetchall()
+    assert any("COVERING INDEX" in row["detail"] for row in per_account)
+
+    dated = conn.execute(
+        """
+        EXPLAIN QUERY PLAN
+        SELECT jl.account_id, SUM(jl.signed_base), SUM(jl.signed_native)
+        FROM journal_entries je
+        JOIN journal_lines jl ON jl.entry_id = je.id
+        WHERE je.entry_date >= '2024-01-01' AND je.entry_date <= '2024-01-31'
+        GROUP BY jl.account_id
+        """
+    ).fetchall()
+    details = [row["detail"] for row in dated]
+    assert any("SEARCH jl USING COVERING INDEX" in d for d in details)
@@ -0,0 +1,125 @@
+import sqlite3
+
+import pytest
+
+from core.services.account_service import create_user_account
+from core.services.checkpoint_service import verify_checkpoints
+from core.services.integrity_service import list_integrity_issues, scan_integrity
+from core.services.ledger_service import account_balances
+from core.services.staging_service import (
+    STAGE_ENTRY_SQL,
+    STAGE_LINE_SQL,
+    discard_batch,
+    load_staged,
+    new_batch_id,
+)
+from core.services.totals_service import verify_account_totals
+
+
+def _accounts(conn, basic_accounts):
+    bank = create_user_account(conn, "은행", "ASSET", basic_accounts["현금"])
+    food = create_user_account(conn, "식비", "EXPENSE", basic_accounts["비용"])
+    return bank, food
+
+
+def _stage(conn, batch, rows):
+    """rows: (entry_key, entry_date, [(account_id, debit, credit), ...])"""
+    conn.executemany(
+        STAGE_ENTRY_SQL,
+        [(batch, key, day, f"import {key}", "import") for key, day, _ in rows],
+    )
+    conn.executemany(
+        STAGE_LINE_SQL,
+        [
+            (batch, key, account_id, debit, credit, "", None, None, None)
+            for key, _, lines in rows
+            for account_id, debit, credit in lines
+        ],
+    )
+
+
+def test_load_staged_moves_valid_batch(conn, basic_accounts):
+    bank, food = _accounts(conn, basic_accounts)
+    batch = new_batch_id()
+    _stage(
+        conn,
+        batch,
+        [
+            (
+                key,
+                f"2024-0{key % 3 + 1}-10",
+                [(food, 100.0 + key, 0), (bank, 0, 100.0 + key)],
+            )
+            for key in range(30)
+        ],
+    )
+
+    result = load_staged(conn, batch)
+
+    assert result["errors"] == []
+    assert len(result["entry_ids"]) == 30
+    assert account_balances(conn)[food] == sum(100.0 + k for k in range(30))
+    assert verify_checkpoints(conn) == []
+    assert verify_account_totals(conn) == []
+    scan_integrity(conn)
+    assert list_integrity_issues(conn) == []
+    assert conn.execute("SELECT COUNT(*) FROM journal_lines_staging").fetchone()[0] == 0
+
+
+def test_rejected_batch_reports_each_entry(conn, basic_accounts):
+    bank, food = _accounts(conn, basic_accounts)
+    batch = new_batch_id()
+    _stage(
+        conn,
+        batch,
+        [
+            (0, "2024-01-01", [(food, 100.0, 0), (bank, 0, 100.0)]),
+            (1, "2024-01-01", [(food, 100.0, 0), (bank, 0, 99.0)]),
+            (2, "2024-01-01", [(basic_accounts["현금"], 50.0, 0), (bank, 0, 50.0)]),
+            (3, "2024-01-01", [(food, 10.0, 0)]),
+            (4, "2024-01-01", [(food, -5.0, 0), (bank, 0, -5.0)]),
+        ],
+    )
+    conn.execute(STAGE_LINE_SQL, (batch, 9, food, 1.0, 0, "", None, None, None))
+
+    result = load_staged(conn, batch)
+
+    errors = {e["entry_key"]: e["error"] for e in result["errors"]}
+    assert sorted(errors) == [1, 2, 3, 4, 9]
+    assert errors[1].startswith("Unbalanced entry")
+    assert "상위(집계)" in errors[2]
+    assert "at least 2 lines" in errors[3]
+    assert "negative" in errors[4]
+    assert errors[9] == "Missing entry header."
+    assert result["entry_ids"] == {}
+    assert conn.execute("SELECT COUNT(*) FROM journal_entries").fetchone()[0] == 0
+
+    partial = load_staged(conn, batch, partial=True)
+    assert list(partial["entry_ids"]) == [0]
+    assert account_balances(conn)[food] == 100.0
+    discard_batch(conn, batch)
+    assert conn.execute("SELECT COUNT(*) FROM journal_lines_staging").fetchone()[0] == 0
+
+
+def test_schema_rejects_lines_on_non_posting_accounts(conn, basic_accounts):
+    bank, _ = _accounts(conn, basic_accounts)
+    entry_id = conn.execute(
+        "INSERT INTO journal_entries (entry_date, description, source)"
+        " VALUES ('2024-01-01', 'raw', 'manual')"
+    ).lastrowid
+    with pytest.raises(sqlite3.IntegrityError, match="allow posting"):
+        conn.execute(
+            "INSERT INTO journal_lines (entry_id, account_id, debit, credit, memo)"
+            " VALUES (?, ?, 10, 0, '')",
+            (entry_id, basic_accounts["현금"]),
+        )
+    line_id = conn.execute(
+        "INSERT INTO journal_lines (entry_id, account_id, debit, credit, memo)"
+        " VALUES (?, ?, 10, 0, '')",
+        (entry_id, bank),
+    ).lastrowid
+    with pytest.raises(sqlite3.IntegrityError):
+        conn.execute(
+            "UPDATE journal_lines SET account_id = ? WHERE id = ?",
+            (basic_accounts["현금"], line_id),
+        )
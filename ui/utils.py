@@ -1,19 +1,6 @@
 from __future__ import annotations
 
-CURRENCY_CONFIG = {
-    "KRW": {"symbol": "₩", "format": "%d", "step": 1, "precision": 0},
-    "USD": {"symbol": "$", "format": "%.2f", "step": 0.01, "precision": 2},
-    "JPY": {"symbol": "¥", "format": "%d", "step": 1, "precision": 0},
-    "EUR": {"symbol": "€", "format": "%.2f", "step": 0.01, "precision": 2},
-}
-
-DEFAULT_CURRENCY = "KRW"
-
-
-def get_currency_config(currency: str | None) -> dict:
-    """Get formatting config for a given currency code."""
-    currency = currency.upper() if currency else DEFAULT_CURRENCY
-    return CURRENCY_CONFIG.get(currency, CURRENCY_CONFIG[DEFAULT_CURRENCY])
+from core.money import get_currency_config
 
 
 def get_pandas_style_fmt(currency: str | None) -> str: